@@ -6,10 +6,54 @@ Script documentation
 - Update derived parameter values using arcpy.SetParameter() or
                                         arcpy.SetParameterAsText()
 """
-import arcpy, os, csv
-
-arcpy.env.workspace = 'current'
-arcpy.env.overwriteOutput = True
+import argparse, os, re, sys, csv
+import codecs, cProfile, hashlib, json, mmap, shutil, sqlite3, struct, tempfile, tracemalloc
+import multiprocessing
+from abc import ABC, abstractmethod
+from operator import itemgetter
+from array import array
+from collections import namedtuple
+from contextlib import ExitStack, closing, contextmanager
+from datetime import datetime
+from itertools import chain, islice
+from time import perf_counter, perf_counter_ns
+
+# Acceso a los datos: arcpy o, con la variable de entorno CARGUE_ACCESO=memoria, el sustituto arcpy_memoria (junto a
+# este script), que guarda las capas en memoria por columnas e implementa las mismas funciones de arcpy que usa el
+# cargue (cursores, Editor, Describe, ListFields, Append y mensajes). Todo el cargue pasa por el nombre `arcpy`, asi
+# que script_tool corre igual con cualquiera de los dos
+accesos_datos = ('arcpy', 'memoria')
+acceso_datos = os.environ.get('CARGUE_ACCESO') or 'arcpy'
+if acceso_datos not in accesos_datos:
+    raise ValueError(f'Acceso a datos no soportado: {acceso_datos}')
+
+try:
+    if acceso_datos == 'memoria':
+        import arcpy_memoria as arcpy
+    else:
+        import arcpy
+    hay_arcpy = True
+except ImportError:
+    # Sin ArcGIS (por ejemplo en Linux sin licencia) solo se puede validar: los .shp se leen con el lector DBF y los
+    # mensajes van a la consola. Cualquier otra funcion de arcpy falla con AttributeError
+    hay_arcpy = False
+
+    class arcpy:
+        @staticmethod
+        def AddMessage(mensaje):
+            print(mensaje)
+
+        @staticmethod
+        def AddWarning(mensaje):
+            print(f'ADVERTENCIA: {mensaje}')
+
+        @staticmethod
+        def AddError(mensaje):
+            print(f'ERROR: {mensaje}', file=sys.stderr)
+
+if hay_arcpy:
+    arcpy.env.workspace = 'current'
+    arcpy.env.overwriteOutput = True
 
 #-----------------Campos y Dominios para las Lineas de acueducto-----------------
 # Atributos para las capas tipo linea acueducto
@@ -35,8 +79,6 @@ tipoInstalacion = ['1','2','3']
 costado = ['N','S','E','W','NE','NW','SE','SW','SP','NA']
 tipoSeccion = ['0','1','2','3','4','5','6','7','8','9']
 
-dominios_l = [subtipo, estadoEnRed, diametroNominal, material, calidadDato, estadoLegal, tipoInstalacion, costado, tipoSeccion]
-
 #-----------------Campos y Dominios para los puntos de acueducto-----------------
 # Atributos para la capa tipo punto acueducto
 atrib_p_acu_shp = ['Shape@','CLASE','SUBTIPO','IDENTIFIC','NORTE','ESTE','FECHAINST','ESTADOENRE','LOCALIZACI','CALIDADDAT','ROTACION',
@@ -104,12 +146,6 @@ vigil_p_acu = [0, 1]
 operTanq_p_acu = ['0', '1', '2']
 tipoAcces_p_acu = ['C', 'E', 'D']
 
-dominios_p_acu = [subtipo_p_acu, estadoEnRed_p_acu, calidadDato_p_acu, material_p_acu, tipoEspPubli_p_acu, MatEspPubli_p_acu,
-                  automat_p_acu, diametro_p_acu, sentOpe_p_acu, estOpe_p_acu, tipOpe_p_acu, estFisValv_p_acu, tipoVal_p_acu,
-                  clasAcces_p_acu, estFisH_p_acu, funPilaPubl_p_acu, ubiCajilla_p_acu, tipPuntMues_p_acu, fuentAbast_p_acu,
-                  ubiPuntMuest_p_acu, puntAnalBloq_p_acu, locaPto_p_acu, estado_p_acu, clasPto_p_acu, vigil_p_acu,
-                  operTanq_p_acu, tipoAcces_p_acu]
-
 #-----------------Campos y Dominios para Lineas Alcantarillado-----------------
 atrib_l_alc_shp = ['Shape@', 'CLASE', 'SUBTIPO', 'N_INICIAL', 'N_FINAL', 'SISTEMA', 'FECHAINST', 'MATERIAL', 'MATERIAL2',
                    'NDISENO', 'ESTADOENRE', 'DIAMETRO', 'T_SECCION', 'CALIDADDAT', 'ESTADOLEGA', 'OBSERVACIO', 'CONTRATO_I',
@@ -146,10 +182,6 @@ tipoInspec_l_alc = ['0','1','2', '99']
 gradoEstruc_l_alc = ['1','2','3','4','5','6','99']
 gradoOper_l_alc = ['1','2','3','4','5','6','99']
 
-dominios_l_alc = [subtipo_l_alc, sistema_l_alc, estadoRed_l_alc, material_l_alc, calidadDato_l_alc, estadoLegal_l_alc,
-                  diametro_l_alc, tipoSeccion_l_alc, camaraCaida_l_alc, metodInstal_l_alc, tipoMaterEspPbli_l_alc, tipoInspec_l_alc,
-                  gradoEstruc_l_alc, gradoOper_l_alc]
-
 #-----------------Campos y Dominios para Puntos Alcantarillado-----------------
 atrib_p_alc_shp = ['Shape@','CLASE','SUBTIPO','IDENTIFIC','NORTE','ESTE','FECHADATO','TIPO_ALIVI','TIPO_VALV_','ESTADOENRE',
                    'LOCALIZACI','C_RASANTE','C_TERRENO','C_FONDO','MATERIAL','CALIDADDAT','SISTEMA','NOMBRE','OBSERV',
@@ -201,1620 +233,2343 @@ estadoRejilla_p_alc = ['0','1','2','3','4','5','99']
 materialRejilla_p_alc = ['0','1','2','3','4','99']
 origSeccion_p_alc = ['1','2','3','4','5']
 
-dominios_p_alc = [subtipo_p_alc, tipoAlivio_p_alc, tipoValvAnt_p_alc, estadoRed_p_alc, material_p_alc, calidadDato_p_alc,
-                  tipoSist_p_alc, tieneConoReduc_p_alc, materConoReduc_p_alc, tipoConoReduc_p_alc, estadoConoReduc_p_alc,
-                  inicialCuencas_p_alc, camaraSifon_p_alc, estadoFisico_p_alc, tieneCabezal_p_alc, estadoTapa_p_alc,
-                  estadoPozo_p_alc, matEscalones_p_alc, estadoEscalon_p_alc, estadoCarge_p_alc, estadoCilindro_p_alc,
-                  estadoCanuela_p_alc, estadoOperac_p_alc, tipoInspec_p_alc, tipoAlmacen_p_alc, tipoBomb_p_alc,
-                  estadoRejilla_p_alc, materialRejilla_p_alc, origSeccion_p_alc]
-
-# ------------------------------------- VALIDACIONES LINEAS ACUEDUCTO -------------------------------------
-# clasifica los tipos de linea de acueducto que puedo encontrarme
-def clasif_l_ecu(l_acu, atrib_l_acu):
-    clase_l = {'redMatriz_1':[], 'aduccion_2':[], 'conduccion_3':[], 'redMenor_4':[], 'lineaLat_5':[]}
-    error_clase_l = []
-    with arcpy.da.SearchCursor(l_acu,atrib_l_acu) as cursor:
-        for linea in cursor:
-            if linea[1] == 1:
-                clase_l['redMatriz_1'].append(linea)
-            elif linea[1] == 2:
-                clase_l['aduccion_2'].append(linea)
-            elif linea[1] == 3:
-                clase_l['conduccion_3'].append(linea)
-            elif linea[1] == 4:
-                clase_l['redMenor_4'].append(linea)
-            elif linea[1] == 5:
-                clase_l['lineaLat_5'].append(linea)
-            else:
-                error_clase_l.append(linea[27])
-    return clase_l, error_clase_l
-
-# Valida los atributos que SI deberian estar en vacios pero que tienen algun valor (comisiones) - Linea Acueducto
-def valida_no_blan_l_ecu(clase_l, orig):
-    error_noBlan_l = {'ESTADOLEGAL':[], 'NOMBRE':[], 'COSTADO':[], 'T_SECCION':[], 'AREA_TR_M2':[], 'C_RASANTEI':[], 'C_RASANTEF':[],
-    'C_CLAVEI':[], 'C_CLAVEF':[], 'PROFUNDIDAD':[], 'RUGOSIDAD':[], 'CODACTIVO_FIJO':[]}
-    for red in clase_l:
-        for line in clase_l[red]:
-            if red in ('redMatriz_1', 'aduccion_2', 'conduccion_3'):
-                if line[10] is not None and not (isinstance(line[10], str) and line[10].strip() == ''):
-                    error_noBlan_l['ESTADOLEGAL'].append(line[27])
-            if red in ('redMenor_4', 'lineaLat_5'):
-                if line[15] is not None and not (isinstance(line[15], str) and line[15].strip() == ''):
-                    error_noBlan_l['NOMBRE'].append(line[27])
-            if red in ('aduccion_2', 'conduccion_3', 'lineaLat_5'):
-                if line[16] is not None and not (isinstance(line[16], str) and line[16].strip() == ''):
-                    error_noBlan_l['COSTADO'].append(line[27])
-            if red in ('redMatriz_1', 'redMenor_4', 'lineaLat_5'):
-                if line[17] is not None and not (isinstance(line[17], str) and line[17].strip() == ''):
-                    error_noBlan_l['T_SECCION'].append(line[27])
-                if (orig == 'shp' and (line[18] not in ('', None, 0))) or (orig == 'gdb' and (line[18] not in ('', None, 0))):
-                    error_noBlan_l['AREA_TR_M2'].append(line[27])
-                if (orig == 'shp' and (line[19] not in ('', None, 0))) or (orig == 'gdb' and (line[19] not in ('', None, 0))):
-                    error_noBlan_l['C_RASANTEI'].append(line[27])
-                if (orig == 'shp' and (line[20] not in ('', None, 0))) or (orig == 'gdb' and (line[20] not in ('', None, 0))):
-                    error_noBlan_l['C_RASANTEF'].append(line[27])
-                if (orig == 'shp' and (line[21] not in ('', None, 0))) or (orig == 'gdb' and (line[21] not in ('', None, 0))):
-                    error_noBlan_l['C_CLAVEI'].append(line[27])
-                if (orig == 'shp' and (line[22] not in ('', None, 0))) or (orig == 'gdb' and (line[22] not in ('', None, 0))):
-                    error_noBlan_l['C_CLAVEF'].append(line[27])
-            if red in ('aduccion_2', 'conduccion_3'):
-                if (orig == 'shp' and (line[23] not in ('', None, 0))) or (orig == 'gdb' and (line[23] not in ('', None, 0))):
-                    error_noBlan_l['PROFUNDIDAD'].append(line[27])
-                if (orig == 'shp' and (line[24] not in ('', None, 0))) or (orig == 'gdb' and (line[24] not in ('', None, 0))):
-                    error_noBlan_l['RUGOSIDAD'].append(line[27])
-                if line[26] is not None and not (isinstance(line[26], str) and line[26].strip() == ''):
-                    error_noBlan_l['CODACTIVO_FIJO'].append(line[27])
-    return error_noBlan_l
-
-# Valida los atributos que NO deberian estar en vacios pero estan si vacios (omisiones) - Linea Acueducto
-def valida_blan_l_ecu(clase_l):
-    error_blan_l = {'N_INICIAL':[],'N_FINAL':[],'FECHAINST':[], 'CONTRATO_ID':[],'NDISENO':[], 'AREA_TR_M2':[],'C_RASANTEI':[],
-    'C_RASANTEF':[],'C_CLAVEI':[],'C_CLAVEF':[], 'PROFUNDIDAD':[],'RUGOSIDAD':[]}
-    for red in clase_l:
-        for line in clase_l[red]:
-            if red in ('aduccion_2', 'conduccion_3'):
-                if line[18] in ('', None):
-                    error_blan_l['AREA_TR_M2'].append(line[27])
-                if line[19] in ('', None):
-                    error_blan_l['C_RASANTEI'].append(line[27])
-                if line[20] in ('', None):
-                    error_blan_l['C_RASANTEF'].append(line[27])
-                if line[21] in ('', None):
-                    error_blan_l['C_CLAVEI'].append(line[27])
-                if line[22] in ('', None):
-                    error_blan_l['C_CLAVEF'].append(line[27])
-            if red in ('redMatriz_1', 'redMenor_4', 'lineaLat_5'):
-                if line[23] in ('', None):
-                    error_blan_l['PROFUNDIDAD'].append(line[27])
-                if line[24] in ('', None):
-                    error_blan_l['RUGOSIDAD'].append(line[27])
-            if line[3] is None or (isinstance(line[3], str) and line[3].strip() == ''):
-                error_blan_l['N_INICIAL'].append(line[27])
-            if line[4] is None or (isinstance(line[4], str) and line[4].strip() == ''):
-                error_blan_l['N_FINAL'].append(line[27])
-            if line[5] in ('', None):
-                error_blan_l['FECHAINST'].append(line[27])
-            if line[13] is None or (isinstance(line[13], str) and line[13].strip() == ''):
-                error_blan_l['CONTRATO_ID'].append(line[27])
-            if line[14] is None or (isinstance(line[14], str) and line[14].strip() == ''):
-                error_blan_l['NDISENO'].append(line[27])
-    return error_blan_l
-
-# Valida que los atributos de la capa de lineas acueducto cumplan con los dominios
-def valida_dom_l_acu(clase_l):
-    error_dom_l = {'SUBTIPO':[], 'ESTADOENRED':[], 'DIAMETRO':[], 'MATERIAL':[], 'CALIDADDEDATO':[], 'ESTADOLEGAL':[],
-    'TIPOINSTALACION':[], 'COSTADO':[], 'T_SECCION':[]}
-    for red in clase_l:
-        for line in clase_l[red]:
-            if red in ('redMatriz_1', 'redMenor_4'):
-                if line[16] not in dominios_l[7]:
-                    error_dom_l['COSTADO'].append(line[27])
-            if red in ('redMenor_4', 'lineaLat_5'):
-                if line[10] not in dominios_l[5]:
-                    error_dom_l['ESTADOLEGAL'].append(line[27])
-            if red in ('aduccion_2', 'conduccion_3'):
-                if line[8] not in dominios_l[8]:
-                    error_dom_l['T_SECCION'].append(line[27])
-            if line[2] not in dominios_l[0][red]:
-                error_dom_l['SUBTIPO'].append(line[27])
-            if line[6] not in dominios_l[1]:
-                error_dom_l['ESTADOENRED'].append(line[27])
-            if line[7] not in dominios_l[2]:
-                error_dom_l['DIAMETRO'].append(line[27])
-            if line[8] not in dominios_l[3]:
-                error_dom_l['MATERIAL'].append(line[27])
-            if line[9] not in dominios_l[4]:
-                error_dom_l['CALIDADDEDATO'].append(line[27])
-            if line[12] not in dominios_l[6]:
-                error_dom_l['TIPOINSTALACION'].append(line[27])
-    return error_dom_l
-
-
-# ------------------------------------- VALIDACIONES PUNTO ACUEDUCTO -------------------------------------
-# clasifica los tipos de punto acueducto que puedo encontrarme
-def clasif_p_acu(p_acu, atrib_p_acu):
-    clase_p_acu = {'VALVULASISTEMA_1':[], 'VALVULACONTROL_2':[], 'ACCESORIO_CODO_3':[], 'ACCESORIO_REDUCCION_4':[], 'ACCESORIO_TAPON_5':[],
-                     'ACCESORIO_TEE_6':[], 'ACCESORIO_UNION_7':[], 'ACCESORIO_OTROS_8':[],'HIDRANTE_9':[], 'MACROMEDIDOR_10':[],
-                     'PUNTO_ACOMETIDA_11':[], 'PILA_MUESTREO_12':[], 'CAPTACION_13':[], 'DESARENADOR_14':[], 'PLANTA_TRATAMIENTO_15':[],
-                     'ESTACION_BOMBEO_16':[], 'TANQUE_17':[], 'PORTAL_18':[], 'CAMARA_ACCESO_19':[], 'ESTRUCTURA_CONTROL_20':[],
-                     'INSTRUMENTOS_MEDICION_21':[]}
-    error_clase_p_acu = []
-    with arcpy.da.SearchCursor(p_acu,atrib_p_acu) as cursor:
-        for punto in cursor:
-            if punto[1] == 1:
-                clase_p_acu['VALVULASISTEMA_1'].append(punto)
-            elif punto[1] == 2:
-                clase_p_acu['VALVULACONTROL_2'].append(punto)
-            elif punto[1] == 3:
-                clase_p_acu['ACCESORIO_CODO_3'].append(punto)
-            elif punto[1] == 4:
-                clase_p_acu['ACCESORIO_REDUCCION_4'].append(punto)
-            elif punto[1] == 5:
-                clase_p_acu['ACCESORIO_TAPON_5'].append(punto)
-            elif punto[1] == 6:
-                clase_p_acu['ACCESORIO_TEE_6'].append(punto)
-            elif punto[1] == 7:
-                clase_p_acu['ACCESORIO_UNION_7'].append(punto)
-            elif punto[1] == 8:
-                clase_p_acu['ACCESORIO_OTROS_8'].append(punto)
-            elif punto[1] == 9:
-                clase_p_acu['HIDRANTE_9'].append(punto)
-            elif punto[1] == 10:
-                clase_p_acu['MACROMEDIDOR_10'].append(punto)
-            elif punto[1] == 11:
-                clase_p_acu['PUNTO_ACOMETIDA_11'].append(punto)
-            elif punto[1] == 12:
-                clase_p_acu['PILA_MUESTREO_12'].append(punto)
-            elif punto[1] == 13:
-                clase_p_acu['CAPTACION_13'].append(punto)
-            elif punto[1] == 14:
-                clase_p_acu['DESARENADOR_14'].append(punto)
-            elif punto[1] == 15:
-                clase_p_acu['PLANTA_TRATAMIENTO_15'].append(punto)
-            elif punto[1] == 16:
-                clase_p_acu['ESTACION_BOMBEO_16'].append(punto)
-            elif punto[1] == 17:
-                clase_p_acu['TANQUE_17'].append(punto)
-            elif punto[1] == 18:
-                clase_p_acu['PORTAL_18'].append(punto)
-            elif punto[1] == 19:
-                clase_p_acu['CAMARA_ACCESO_19'].append(punto)
-            elif punto[1] == 20:
-                clase_p_acu['ESTRUCTURA_CONTROL_20'].append(punto)
-            elif punto[1] == 21:
-                clase_p_acu['INSTRUMENTOS_MEDICION_21'].append(punto)
+# ------------------------------------- CATALOGO DE DOMINIOS -------------------------------------
+# Normalizadores por tipo de valor: los numeros y los textos numericos quedan con la misma clave (24, 24.0 y '24'
+# -> '24'; 1.5, '1.5' y '1.50' -> '1.5'), asi el dominio no depende del tipo del campo en el shp o la gdb
+def normaliza_numero(valor):
+    if valor != valor or valor in (float('inf'), float('-inf')):
+        return str(valor)
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+def normaliza_texto(valor):
+    try:
+        return str(int(valor))
+    except ValueError:
+        pass
+    try:
+        return normaliza_numero(float(valor))
+    except ValueError:
+        return valor
+
+normalizadores = {str: normaliza_texto, int: normaliza_numero, float: normaliza_numero, bool: normaliza_numero}
+
+# Memoria de valores normalizados: cada valor distinto se normaliza una sola vez y despues es una consulta al
+# diccionario
+class ValoresNormalizados(dict):
+    def __missing__(self, valor):
+        normalizador = normalizadores.get(type(valor))
+        normalizado = normalizador(valor) if normalizador else valor
+        self[valor] = normalizado
+        return normalizado
+
+# Catalogo con cada dominio guardado como frozenset de valores normalizados (busquedas O(1))
+class CatalogoDominios:
+    def __init__(self):
+        self.normalizados = ValoresNormalizados()
+        self.conjuntos = {}
+
+    def normaliza(self, valor):
+        return self.normalizados[valor]
+
+    def conjunto(self, dominio):
+        clave = tuple(dominio)
+        if clave not in self.conjuntos:
+            self.conjuntos[clave] = frozenset(self.normalizados[valor] for valor in dominio)
+        return self.conjuntos[clave]
+
+catalogo_dominios = CatalogoDominios()
+
+# ------------------------------------- REGLAS DE VALIDACION -------------------------------------
+# Validaciones de comisiones, omisiones y dominios escritas como datos. Cada regla indica el tipo de error, el
+# atributo del reporte, la posicion del campo en la fila, la prueba que se aplica, las clases donde aplica
+# (None = todas), el dominio y una condicion opcional sobre otro campo (posicion, valores, si debe estar o no en
+# ellos). El orden de las reglas es el orden de los atributos en el reporte. Se compilan una sola vez por clase
+# para la validacion registro a registro y el motor numpy las evalua por columnas.
+# Pruebas: 'texto' -> vacio si es None o texto en blanco, 'valor' -> vacio si es '' o None,
+# 'numero' -> vacio si es '', None o 0, 'dominio' -> valor fuera del dominio. Para los dominios por clase (SUBTIPO,
+# CLASEACCES) el dominio es un diccionario por clase. Los dominios y los valores de las condiciones se comparan con
+# los valores normalizados del catalogo de dominios
+Regla = namedtuple('Regla', ['error', 'atributo', 'indice', 'prueba', 'clases', 'dominio', 'guarda'],
+                   defaults=(None, None, None))
+
+def excepto(clases, *omitidas):
+    return tuple(nombre for nombre in clases if nombre not in omitidas)
+
+lista_clase_l_acu = ['redMatriz_1', 'aduccion_2', 'conduccion_3', 'redMenor_4', 'lineaLat_5']
+lista_clase_l_alc = ['redLocal_1', 'redTroncal_2', 'linLat_3']
+lista_clase_p_alc = ['ESTRUCTURA_RED_1', 'POZO_2', 'SUMIDERO_3', 'CAJA_DOMICILIARIA_4', 'SECCION_TRANSVERSAL_5']
+
+# Reglas Lineas Acueducto
+reglas_l_acu = [
+    # comisiones
+    Regla('noBlan', 'ESTADOLEGAL', 10, 'texto', ('redMatriz_1', 'aduccion_2', 'conduccion_3')),
+    Regla('noBlan', 'NOMBRE', 15, 'texto', ('redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'COSTADO', 16, 'texto', ('aduccion_2', 'conduccion_3', 'lineaLat_5')),
+    Regla('noBlan', 'T_SECCION', 17, 'texto', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'AREA_TR_M2', 18, 'numero', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'C_RASANTEI', 19, 'numero', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'C_RASANTEF', 20, 'numero', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'C_CLAVEI', 21, 'numero', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'C_CLAVEF', 22, 'numero', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('noBlan', 'PROFUNDIDAD', 23, 'numero', ('aduccion_2', 'conduccion_3')),
+    Regla('noBlan', 'RUGOSIDAD', 24, 'numero', ('aduccion_2', 'conduccion_3')),
+    Regla('noBlan', 'CODACTIVO_FIJO', 26, 'texto', ('aduccion_2', 'conduccion_3')),
+    # omisiones
+    Regla('blan', 'N_INICIAL', 3, 'texto'),
+    Regla('blan', 'N_FINAL', 4, 'texto'),
+    Regla('blan', 'FECHAINST', 5, 'valor'),
+    Regla('blan', 'CONTRATO_ID', 13, 'texto'),
+    Regla('blan', 'NDISENO', 14, 'texto'),
+    Regla('blan', 'AREA_TR_M2', 18, 'valor', ('aduccion_2', 'conduccion_3')),
+    Regla('blan', 'C_RASANTEI', 19, 'valor', ('aduccion_2', 'conduccion_3')),
+    Regla('blan', 'C_RASANTEF', 20, 'valor', ('aduccion_2', 'conduccion_3')),
+    Regla('blan', 'C_CLAVEI', 21, 'valor', ('aduccion_2', 'conduccion_3')),
+    Regla('blan', 'C_CLAVEF', 22, 'valor', ('aduccion_2', 'conduccion_3')),
+    Regla('blan', 'PROFUNDIDAD', 23, 'valor', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    Regla('blan', 'RUGOSIDAD', 24, 'valor', ('redMatriz_1', 'redMenor_4', 'lineaLat_5')),
+    # dominios
+    Regla('dom', 'SUBTIPO', 2, 'dominio', None, subtipo),
+    Regla('dom', 'ESTADOENRED', 6, 'dominio', None, estadoEnRed),
+    Regla('dom', 'DIAMETRO', 7, 'dominio', None, diametroNominal),
+    Regla('dom', 'MATERIAL', 8, 'dominio', None, material),
+    Regla('dom', 'CALIDADDEDATO', 9, 'dominio', None, calidadDato),
+    Regla('dom', 'ESTADOLEGAL', 10, 'dominio', ('redMenor_4', 'lineaLat_5'), estadoLegal),
+    Regla('dom', 'TIPOINSTALACION', 12, 'dominio', None, tipoInstalacion),
+    Regla('dom', 'COSTADO', 16, 'dominio', ('redMatriz_1', 'redMenor_4'), costado),
+    Regla('dom', 'T_SECCION', 8, 'dominio', ('aduccion_2', 'conduccion_3'), tipoSeccion)]
+
+# Reglas Puntos Acueducto
+valv_p_acu = ('VALVULASISTEMA_1', 'VALVULACONTROL_2')
+acces_p_acu = ('ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4', 'ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6', 'ACCESORIO_UNION_7')
+obras_p_acu = ('CAPTACION_13', 'DESARENADOR_14', 'PLANTA_TRATAMIENTO_15', 'ESTACION_BOMBEO_16', 'TANQUE_17',
+               'PORTAL_18')
+
+reglas_p_acu = [
+    # comisiones
+    Regla('noBlan', 'ROTACION', 10, 'numero', ('INSTRUMENTOS_MEDICION_21',)),
+    Regla('noBlan', 'C_RASANTE', 11, 'numero', ('MACROMEDIDOR_10',)),
+    Regla('noBlan', 'PROFUN', 12, 'numero', ('HIDRANTE_9', 'MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11', 'PILA_MUESTREO_12')
+          + obras_p_acu + ('ESTRUCTURA_CONTROL_20', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('noBlan', 'MATERIAL', 13, 'texto', ('MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11') + obras_p_acu
+          + ('CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('noBlan', 'TIPOESPPUB', 18, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu, 'HIDRANTE_9', 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'MATESPPUBL', 19, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu, 'HIDRANTE_9', 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'AUTOMATIZA', 20, 'numero', excepto(lista_subtipo_p_acu, *valv_p_acu)),
+    Regla('noBlan', 'DIAMETRO1', 21, 'texto', ('MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11', 'PILA_MUESTREO_12')
+          + obras_p_acu + ('CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20')),
+    Regla('noBlan', 'DIAMETRO2', 22, 'texto', valv_p_acu + ('HIDRANTE_9', 'MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11',
+          'PILA_MUESTREO_12') + obras_p_acu + ('CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('noBlan', 'SENTIDOOPERAC', 23, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu)),
+    Regla('noBlan', 'ESTADOOPERAC', 24, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu)),
+    Regla('noBlan', 'TIPOOPERAC', 25, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu)),
+    Regla('noBlan', 'ESTADOFIS_VAL', 26, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu)),
+    Regla('noBlan', 'TIPOVALVUL', 27, 'texto', excepto(lista_subtipo_p_acu, 'VALVULASISTEMA_1')),
+    Regla('noBlan', 'VUELTASCIE', 28, 'numero', excepto(lista_subtipo_p_acu, 'VALVULASISTEMA_1')),
+    Regla('noBlan', 'CLASEACCES', 29, 'texto', excepto(lista_subtipo_p_acu, *acces_p_acu)),
+    Regla('noBlan', 'ESTADOFISICOH', 30, 'texto', excepto(lista_subtipo_p_acu, 'HIDRANTE_9')),
+    Regla('noBlan', 'MARCA', 31, 'texto', excepto(lista_subtipo_p_acu, 'HIDRANTE_9', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('noBlan', 'FUNCIONPIL', 32, 'numero', excepto(lista_subtipo_p_acu, 'HIDRANTE_9')),
+    Regla('noBlan', 'ESTADOMED', 33, 'texto', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10')),
+    Regla('noBlan', 'SECTORENTR', 34, 'texto', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10')),
+    Regla('noBlan', 'SECTORSALI', 35, 'texto', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10')),
+    Regla('noBlan', 'IDTUBERIAMEDIDA', 36, 'texto', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10')),
+    Regla('noBlan', 'CAUDAL_PROMEDIO', 37, 'numero',
+          excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('noBlan', 'TIPO_M', 38, 'texto', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10')),
+    Regla('noBlan', 'FECHA_TOMA_C', 39, 'valor', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10', 'HIDRANTE_9')),
+    Regla('noBlan', 'UBICACCAJI', 40, 'texto', excepto(lista_subtipo_p_acu, 'PUNTO_ACOMETIDA_11')),
+    Regla('noBlan', 'CENTRO', 41, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'L_ALM', 42, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'AREARESP', 43, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'TIPO_MUESTR', 44, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'FUENTEABAS', 45, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'UBICAC_MUES', 46, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'PTOANALISI', 47, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'LOCPUNTO', 48, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'ESTADO', 49, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'FECHAESTADO', 50, 'valor', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'CLASEPUNTO', 51, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12')),
+    Regla('noBlan', 'NROFILTROS', 52, 'numero', excepto(lista_subtipo_p_acu, 'PLANTA_TRATAMIENTO_15')),
+    Regla('noBlan', 'NROSEDIMEN', 53, 'numero', excepto(lista_subtipo_p_acu, 'PLANTA_TRATAMIENTO_15')),
+    Regla('noBlan', 'NROCOMPART', 54, 'numero', excepto(lista_subtipo_p_acu, 'PLANTA_TRATAMIENTO_15')),
+    Regla('noBlan', 'NROMEZCLAR', 55, 'numero', excepto(lista_subtipo_p_acu, 'PLANTA_TRATAMIENTO_15')),
+    Regla('noBlan', 'NROFLOCULA', 56, 'numero', excepto(lista_subtipo_p_acu, 'PLANTA_TRATAMIENTO_15')),
+    Regla('noBlan', 'CAPACINSTA', 57, 'numero', excepto(lista_subtipo_p_acu, 'PLANTA_TRATAMIENTO_15')),
+    Regla('noBlan', 'NROBOMBAS', 58, 'numero', excepto(lista_subtipo_p_acu, 'ESTACION_BOMBEO_16')),
+    Regla('noBlan', 'CAPABOMBEO', 59, 'numero', excepto(lista_subtipo_p_acu, 'ESTACION_BOMBEO_16')),
+    Regla('noBlan', 'COTABOMBEO', 60, 'numero', excepto(lista_subtipo_p_acu, 'ESTACION_BOMBEO_16')),
+    Regla('noBlan', 'ALTURADINA', 61, 'numero', excepto(lista_subtipo_p_acu, 'ESTACION_BOMBEO_16')),
+    Regla('noBlan', 'COTAFONDO', 62, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'COTAREBOSE', 63, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'CAPACIDAD', 64, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'NIVELMAXIM', 65, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'NIVELMINIM', 66, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'AREATRANSV', 67, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'TIENEVIGIL', 68, 'numero', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'OPERACTANQ', 69, 'texto', excepto(lista_subtipo_p_acu, 'TANQUE_17')),
+    Regla('noBlan', 'TIPOACCESO', 70, 'texto', excepto(lista_subtipo_p_acu, 'CAMARA_ACCESO_19')),
+    Regla('noBlan', 'DIAMETROAC', 71, 'numero', excepto(lista_subtipo_p_acu, 'CAMARA_ACCESO_19')),
+    Regla('noBlan', 'NOMBRE', 72, 'texto', excepto(lista_subtipo_p_acu, 'PILA_MUESTREO_12', *obras_p_acu,
+          'CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20')),
+    Regla('noBlan', 'DIRECCION', 73, 'texto', excepto(lista_subtipo_p_acu, *valv_p_acu, 'HIDRANTE_9', 'MACROMEDIDOR_10',
+          'PUNTO_ACOMETIDA_11', 'PILA_MUESTREO_12', *obras_p_acu, 'CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20')),
+    Regla('noBlan', 'PRESION', 74, 'numero', excepto(lista_subtipo_p_acu, 'HIDRANTE_9')),
+    # omisiones
+    Regla('blan', 'IDENTIFIC', 13, 'texto'),
+    Regla('blan', 'NORTE', 4, 'numero'),
+    Regla('blan', 'ESTE', 5, 'numero'),
+    Regla('blan', 'FECHAINST', 6, 'valor'),
+    Regla('blan', 'LOCALIZACIONRELATIVA', 8, 'texto'),
+    Regla('blan', 'ROTACION', 10, 'valor', excepto(lista_subtipo_p_acu, 'INSTRUMENTOS_MEDICION_21')),
+    Regla('blan', 'C_RASANTE', 11, 'valor', excepto(lista_subtipo_p_acu, 'MACROMEDIDOR_10')),
+    Regla('blan', 'PROFUN', 12, 'valor', valv_p_acu + acces_p_acu + ('ACCESORIO_OTROS_8',)),
+    Regla('blan', 'CONTRATO_ID', 16, 'texto'),
+    Regla('blan', 'VUELTASCIE', 28, 'valor', ('VALVULASISTEMA_1',)),
+    Regla('blan', 'MARCA', 31, 'texto', ('HIDRANTE_9', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('blan', 'ESTADOMED', 33, 'texto', ('MACROMEDIDOR_10',)),
+    Regla('blan', 'SECTORENTR', 34, 'texto', ('MACROMEDIDOR_10',)),
+    Regla('blan', 'SECTORSALI', 35, 'texto', ('MACROMEDIDOR_10',)),
+    Regla('blan', 'IDTUBERIAMEDIDA', 36, 'texto', ('MACROMEDIDOR_10',)),
+    Regla('blan', 'CAUDAL_PRO', 37, 'valor', ('MACROMEDIDOR_10', 'INSTRUMENTOS_MEDICION_21')),
+    Regla('blan', 'TIPO_M', 38, 'texto', ('MACROMEDIDOR_10',)),
+    Regla('blan', 'FECHA_TOMA', 39, 'valor', ('MACROMEDIDOR_10',)),
+    Regla('blan', 'CENTRO', 41, 'texto', ('PILA_MUESTREO_12',)),
+    Regla('blan', 'L_ALM', 42, 'texto', ('PILA_MUESTREO_12',)),
+    Regla('blan', 'AREARESP', 43, 'texto', ('PILA_MUESTREO_12',)),
+    Regla('blan', 'FECHAESTADO', 50, 'valor', ('PILA_MUESTREO_12',)),
+    Regla('blan', 'NROFILTROS', 52, 'valor', ('PLANTA_TRATAMIENTO_15',)),
+    Regla('blan', 'NROSEDIMEN', 53, 'valor', ('PLANTA_TRATAMIENTO_15',)),
+    Regla('blan', 'NROCOMPART', 54, 'valor', ('PLANTA_TRATAMIENTO_15',)),
+    Regla('blan', 'NROMEZCLAR', 55, 'valor', ('PLANTA_TRATAMIENTO_15',)),
+    Regla('blan', 'NROFLOCULA', 56, 'valor', ('PLANTA_TRATAMIENTO_15',)),
+    Regla('blan', 'CAPACINSTA', 57, 'valor', ('PLANTA_TRATAMIENTO_15',)),
+    Regla('blan', 'NROBOMBAS', 58, 'valor', ('ESTACION_BOMBEO_16',)),
+    Regla('blan', 'CAPABOMBEO', 59, 'valor', ('ESTACION_BOMBEO_16',)),
+    Regla('blan', 'COTABOMBEO', 60, 'valor', ('ESTACION_BOMBEO_16',)),
+    Regla('blan', 'ALTURADINA', 61, 'valor', ('ESTACION_BOMBEO_16',)),
+    Regla('blan', 'COTAFONDO', 62, 'valor', ('TANQUE_17',)),
+    Regla('blan', 'COTAREBOSE', 63, 'valor', ('TANQUE_17',)),
+    Regla('blan', 'CAPACIDAD', 64, 'valor', ('TANQUE_17',)),
+    Regla('blan', 'NIVELMAXIM', 65, 'valor', ('TANQUE_17',)),
+    Regla('blan', 'NIVELMINIM', 66, 'valor', ('TANQUE_17',)),
+    Regla('blan', 'AREATRANSV', 67, 'valor', ('TANQUE_17',)),
+    Regla('blan', 'DIAMETROAC', 71, 'valor', ('CAMARA_ACCESO_19',)),
+    Regla('blan', 'DIRECCION', 73, 'texto', excepto(lista_subtipo_p_acu, *acces_p_acu, 'ACCESORIO_OTROS_8',
+          'INSTRUMENTOS_MEDICION_21')),
+    Regla('blan', 'PRESION', 74, 'valor', ('HIDRANTE_9',)),
+    # dominios
+    Regla('dom', 'SUBTIPO', 2, 'dominio', None, subtipo_p_acu),
+    Regla('dom', 'ESTADOENRED', 7, 'dominio', None, estadoEnRed_p_acu),
+    Regla('dom', 'CALIDADDATO', 9, 'dominio', None, calidadDato_p_acu),
+    Regla('dom', 'MATERIAL', 13, 'dominio', valv_p_acu + acces_p_acu + ('ACCESORIO_OTROS_8', 'HIDRANTE_9',
+          'PILA_MUESTREO_12'), material_p_acu),
+    Regla('dom', 'TIPOESPPUB', 18, 'dominio', valv_p_acu + ('HIDRANTE_9', 'PILA_MUESTREO_12'), tipoEspPubli_p_acu),
+    Regla('dom', 'MATESPPUBL', 19, 'dominio', valv_p_acu + ('HIDRANTE_9', 'PILA_MUESTREO_12'), MatEspPubli_p_acu),
+    Regla('dom', 'AUTOMATIZA', 20, 'dominio', valv_p_acu, automat_p_acu),
+    Regla('dom', 'DIAMETRO1', 21, 'dominio', valv_p_acu + acces_p_acu + ('ACCESORIO_OTROS_8', 'HIDRANTE_9',
+          'PILA_MUESTREO_12', 'INSTRUMENTOS_MEDICION_21'), diametro_p_acu),
+    Regla('dom', 'DIAMETRO2', 22, 'dominio', acces_p_acu + ('ACCESORIO_OTROS_8',), diametro_p_acu),
+    Regla('dom', 'SENTIDOOPERAC', 23, 'dominio', valv_p_acu, sentOpe_p_acu),
+    Regla('dom', 'ESTADOOPERAC', 24, 'dominio', valv_p_acu, estOpe_p_acu),
+    Regla('dom', 'TIPOOPERAC', 25, 'dominio', valv_p_acu, tipOpe_p_acu),
+    Regla('dom', 'ESTADOFIS_VAL', 26, 'dominio', valv_p_acu, estFisValv_p_acu),
+    Regla('dom', 'TIPOVALVUL', 27, 'dominio', ('VALVULASISTEMA_1',), tipoVal_p_acu),
+    Regla('dom', 'CLASEACCES', 29, 'dominio', acces_p_acu, clasAcces_p_acu),
+    Regla('dom', 'ESTADOFISICOH', 30, 'dominio', ('HIDRANTE_9',), estFisH_p_acu),
+    Regla('dom', 'FUNCIONPIL', 32, 'dominio', ('HIDRANTE_9',), funPilaPubl_p_acu),
+    Regla('dom', 'UBICACCAJI', 40, 'dominio', ('PUNTO_ACOMETIDA_11',), ubiCajilla_p_acu),
+    Regla('dom', 'TIPO_MUESTR', 44, 'dominio', ('PILA_MUESTREO_12',), tipPuntMues_p_acu),
+    Regla('dom', 'FUENTEABAS', 45, 'dominio', ('PILA_MUESTREO_12',), fuentAbast_p_acu),
+    Regla('dom', 'UBICAC_MUES', 46, 'dominio', ('PILA_MUESTREO_12',), ubiPuntMuest_p_acu),
+    Regla('dom', 'PTOANALISI', 47, 'dominio', ('PILA_MUESTREO_12',), puntAnalBloq_p_acu),
+    Regla('dom', 'LOCPUNTO', 48, 'dominio', ('PILA_MUESTREO_12',), locaPto_p_acu),
+    Regla('dom', 'ESTADO', 49, 'dominio', ('PILA_MUESTREO_12',), estado_p_acu),
+    Regla('dom', 'CLASEPUNTO', 51, 'dominio', ('PILA_MUESTREO_12',), clasPto_p_acu),
+    Regla('dom', 'TIENEVIGIL', 68, 'dominio', ('TANQUE_17',), vigil_p_acu),
+    Regla('dom', 'OPERACTANQ', 69, 'dominio', ('TANQUE_17',), operTanq_p_acu),
+    Regla('dom', 'TIPOACCESO', 70, 'dominio', ('CAMARA_ACCESO_19',), tipoAcces_p_acu)]
+
+# Reglas Lineas Alcantarillado. En la red troncal algunas reglas dependen del SUBTIPO (guarda sobre la posicion 2)
+# Las guardas comparan valores normalizados como los dominios: ('24', '27') y (24, 27) son la misma condicion y un
+# SUBTIPO 24, 24.0 o '24' la cumple. Las validaciones originales comparaban el valor crudo, asi que en la red troncal
+# los resultados cambian para SUBTIPO entero en las guardas de texto y al reves (ver 'cambios' en entrega_base.json)
+reglas_l_alc = [
+    # comisiones
+    Regla('noBlan', 'MATERIAL2', 8, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'T_SECCION', 12, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'CAM_CAIDA', 17, 'texto', ('redTroncal_2',), guarda=(2, ('24', '27'), True)),
+    Regla('noBlan', 'CAM_CAIDA', 17, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'INSTALACI', 35, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'MATESPPUBL', 36, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'PENDIENTE', 24, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'NOMBRE', 25, 'texto', excepto(lista_clase_l_alc, 'redTroncal_2')),
+    Regla('noBlan', 'BASE', 26, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'PROFUNDIDAD', 27, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'NROCONDUCTOS', 30, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'ALTURA1', 28, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'ALTURA2', 29, 'numero', ('redTroncal_2',), guarda=(2, ('24', '27'), False)),
+    Regla('noBlan', 'ALTURA2', 29, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'ANCHOBERMA', 31, 'numero', ('redTroncal_2',), guarda=(2, ('24', '27'), False)),
+    Regla('noBlan', 'ANCHOBERMA', 31, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'TALUD1', 32, 'numero', ('redTroncal_2',), guarda=(2, ('24', '27'), False)),
+    Regla('noBlan', 'TALUD1', 32, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'TALUD2', 33, 'numero', ('redTroncal_2',), guarda=(2, ('24', '27'), False)),
+    Regla('noBlan', 'TALUD2', 33, 'numero', ('linLat_3',)),
+    Regla('noBlan', 'TIPOINSPEC', 38, 'texto', ('redTroncal_2',), guarda=(2, ('24', '27'), True)),
+    Regla('noBlan', 'TIPOINSPEC', 38, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'GRADOEST', 39, 'texto', ('redTroncal_2',), guarda=(2, ('24', '27'), True)),
+    Regla('noBlan', 'GRADOEST', 39, 'texto', ('linLat_3',)),
+    Regla('noBlan', 'GRADOOPER', 40, 'texto', ('redTroncal_2',), guarda=(2, ('24', '27'), True)),
+    Regla('noBlan', 'GRADOOPER', 40, 'texto', ('linLat_3',)),
+    # omisiones
+    Regla('blan', 'N_INICIAL', 3, 'texto'),
+    Regla('blan', 'N_FINAL', 4, 'texto'),
+    Regla('blan', 'FECHAINST', 6, 'valor'),
+    Regla('blan', 'CONTRATO_ID', 16, 'texto'),
+    Regla('blan', 'C_RASATEI', 18, 'valor'),
+    Regla('blan', 'C_RASANTEF', 19, 'valor'),
+    Regla('blan', 'C_CLAVEI', 20, 'valor'),
+    Regla('blan', 'C_CLAVEF', 21, 'valor'),
+    Regla('blan', 'C_BATEAI', 22, 'valor'),
+    Regla('blan', 'C_BATEAF', 23, 'valor'),
+    Regla('blan', 'PENDIENTE', 24, 'valor', excepto(lista_clase_l_alc, 'linLat_3')),
+    Regla('blan', 'PROFUNDIDAD', 27, 'valor', excepto(lista_clase_l_alc, 'linLat_3')),
+    Regla('blan', 'NROCONDUCTOS', 30, 'valor', excepto(lista_clase_l_alc, 'linLat_3')),
+    Regla('blan', 'BASE', 26, 'valor', excepto(lista_clase_l_alc, 'linLat_3')),
+    Regla('blan', 'ALTURA1', 28, 'valor', excepto(lista_clase_l_alc, 'linLat_3')),
+    Regla('blan', 'ALTURA2', 29, 'valor', excepto(lista_clase_l_alc, 'linLat_3'), guarda=(2, (24, 27), True)),
+    Regla('blan', 'ANCHOBERMA', 31, 'valor', excepto(lista_clase_l_alc, 'linLat_3'), guarda=(2, (24, 27), True)),
+    Regla('blan', 'TALUD1', 32, 'valor', excepto(lista_clase_l_alc, 'linLat_3'), guarda=(2, (24, 27), True)),
+    Regla('blan', 'TALUD2', 33, 'valor', excepto(lista_clase_l_alc, 'linLat_3'), guarda=(2, (24, 27), True)),
+    # dominios
+    Regla('dom', 'SUBTIPO', 2, 'dominio', None, subtipo_l_alc),
+    Regla('dom', 'SISTEMA', 5, 'dominio', None, sistema_l_alc),
+    Regla('dom', 'ESTADOENRED', 10, 'dominio', None, estadoRed_l_alc),
+    Regla('dom', 'MATERIAL', 7, 'dominio', None, material_l_alc),
+    Regla('dom', 'MATERIAL2', 8, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), material_l_alc),
+    Regla('dom', 'CALIDADDATO', 13, 'dominio', None, calidadDato_l_alc),
+    Regla('dom', 'ESTADOLEGAL', 14, 'dominio', None, estadoLegal_l_alc),
+    Regla('dom', 'DIAMETRO', 11, 'dominio', None, diametro_l_alc),
+    Regla('dom', 'T_SECCION', 12, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), tipoSeccion_l_alc),
+    Regla('dom', 'CAM_CAIDA', 17, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), camaraCaida_l_alc,
+          (2, ('24', '27'), False)),
+    Regla('dom', 'INSTALACI', 35, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), metodInstal_l_alc),
+    Regla('dom', 'MATESPPUBL', 36, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), tipoMaterEspPbli_l_alc),
+    Regla('dom', 'TIPOINSPEC', 17, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), tipoInspec_l_alc,
+          (38, ('24', '27'), False)),
+    Regla('dom', 'GRADOEST', 17, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), gradoEstruc_l_alc,
+          (39, ('24', '27'), False)),
+    Regla('dom', 'GRADOOPER', 17, 'dominio', excepto(lista_clase_l_alc, 'linLat_3'), gradoOper_l_alc,
+          (40, ('24', '27'), False))]
+
+# Reglas Puntos Alcantarillado
+reglas_p_alc = [
+    # comisiones
+    Regla('noBlan', 'SUBTIPO', 2, 'numero', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'FECHADATO', 6, 'valor', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'TIPO_ALIVIO', 7, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'TIPO_VALV_ANT', 8, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'ESTADOENRED', 9, 'numero', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'LOCALIZACIONRELATIVA', 10, 'texto', ('POZO_2', 'SECCION_TRANSVERSAL_5')),
+    Regla('noBlan', 'C_RASANTE', 11, 'numero', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'C_TERRENO', 12, 'numero', excepto(lista_clase_p_alc, 'POZO_2', 'CAJA_DOMICILIARIA_4')),
+    Regla('noBlan', 'C_FONDO', 13, 'numero', ('SUMIDERO_3', 'SECCION_TRANSVERSAL_5')),
+    Regla('noBlan', 'MATERIAL', 14, 'valor', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'SISTEMA', 16, 'valor', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'NOMBRE', 17, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1', 'SECCION_TRANSVERSAL_5')),
+    Regla('noBlan', 'OBSERV', 18, 'texto', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'CONTRATO_ID', 19, 'texto', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'PROFUNDIDA', 21, 'numero', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'CONOREDUCC', 22, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'MATERCONO', 23, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'TIPO_CONO', 24, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'EST_CONO', 25, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'INICIAL_CUENCAS', 26, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'ROTACION', 27, 'numero', ('POZO_2', 'SECCION_TRANSVERSAL_5')),
+    Regla('noBlan', 'CAMARASIF', 28, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'EST_FISICO', 29, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1', 'POZO_2')),
+    Regla('noBlan', 'CABEZAL', 30, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'EST_TAPA', 31, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'EST_POZO', 32, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'MATESCALO', 33, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'ESTESCALON', 34, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'ESTCARGUE', 35, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'ESTCILIND', 36, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'ESTCANUE', 37, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'ESTOPERA', 38, 'texto', excepto(lista_clase_p_alc, 'POZO_2', 'SUMIDERO_3')),
+    Regla('noBlan', 'CONTINSPE', 39, 'texto', excepto(lista_clase_p_alc, 'POZO_2', 'SUMIDERO_3')),
+    Regla('noBlan', 'FECHA_INSP', 40, 'valor', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'TIPOINSPEC', 41, 'texto', excepto(lista_clase_p_alc, 'POZO_2', 'SUMIDERO_3')),
+    Regla('noBlan', 'TIPOALMAC', 42, 'texto', excepto(lista_clase_p_alc, 'POZO_2')),
+    Regla('noBlan', 'COTACRESTA', 43, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'C_TECHO_VE', 44, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'LONGVERT', 45, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'LARGO', 46, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'ANCHO', 47, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'ALTO', 48, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'Q_BOMBEO', 49, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'TIPOBOMB', 50, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'UNIDBOMBEO', 51, 'texto', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'HBOMBEO', 52, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'COTABOMBE', 53, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'VOLBOMBEO', 54, 'numero', excepto(lista_clase_p_alc, 'ESTRUCTURA_RED_1')),
+    Regla('noBlan', 'DIRECCION', 55, 'valor', ('SECCION_TRANSVERSAL_5',)),
+    Regla('noBlan', 'ESTREJILLA', 56, 'texto', excepto(lista_clase_p_alc, 'SUMIDERO_3')),
+    Regla('noBlan', 'MATREJILLA', 57, 'texto', excepto(lista_clase_p_alc, 'SUMIDERO_3')),
+    Regla('noBlan', 'TAMREJILLA', 58, 'texto', excepto(lista_clase_p_alc, 'SUMIDERO_3')),
+    Regla('noBlan', 'ORIGENSEC', 59, 'texto', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('noBlan', 'DISTORIGEN', 60, 'numero', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('noBlan', 'ABSCISA', 61, 'texto', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    # omisiones
+    Regla('blan', 'IDENTIFIC', 3, 'valor'),
+    Regla('blan', 'NORTE', 4, 'numero'),
+    Regla('blan', 'ESTE', 5, 'numero'),
+    Regla('blan', 'FECHADATO', 6, 'valor', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'LOCALIZACIONRELATIVA', 10, 'texto', excepto(lista_clase_p_alc, 'POZO_2', 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'C_RASANTE', 11, 'valor', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'C_TERRENO', 12, 'valor', ('POZO_2', 'CAJA_DOMICILIARIA_4')),
+    Regla('blan', 'C_FONDO', 13, 'valor', excepto(lista_clase_p_alc, 'SUMIDERO_3', 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'NOMBRE', 17, 'texto', ('SECCION_TRANSVERSAL_5',)),
+    Regla('blan', 'CONTRATO_ID', 19, 'texto', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'PROFUNDIDA', 21, 'valor', ('POZO_2',)),
+    Regla('blan', 'ROTACION', 27, 'valor', ('ESTRUCTURA_RED_1', 'SUMIDERO_3')),
+    Regla('blan', 'CONTINSPE', 39, 'valor', ('POZO_2', 'SUMIDERO_3')),
+    Regla('blan', 'FECHA_INSP', 40, 'texto', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'COTACRESTA', 43, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'C_TECHO_VE', 44, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'LONGVERT', 45, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'LARGO', 46, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'ANCHO', 47, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'ALTO', 48, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'Q_BOMBEO', 49, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'UNIDBOMBEO', 51, 'texto', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'HBOMBEO', 52, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'COTABOMBE', 53, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'VOLBOMBEO', 54, 'valor', ('ESTRUCTURA_RED_1',)),
+    Regla('blan', 'DIRECCION', 55, 'texto', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5')),
+    Regla('blan', 'TAMREJILLA', 58, 'valor', ('SUMIDERO_3',)),
+    Regla('blan', 'DISTORIGEN', 60, 'valor', ('SECCION_TRANSVERSAL_5',)),
+    Regla('blan', 'ABSCISA', 61, 'texto', ('SECCION_TRANSVERSAL_5',)),
+    # dominios
+    Regla('dom', 'SUBTIPO', 2, 'dominio', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5'), subtipo_p_alc),
+    Regla('dom', 'TIPO_ALIVIO', 7, 'dominio', ('ESTRUCTURA_RED_1',), tipoAlivio_p_alc),
+    Regla('dom', 'TIPO_VALV_ANT', 8, 'dominio', ('ESTRUCTURA_RED_1',), tipoValvAnt_p_alc),
+    Regla('dom', 'ESTADOENRED', 9, 'dominio', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5'), estadoRed_p_alc),
+    Regla('dom', 'MATERIAL', 14, 'dominio', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5'), material_p_alc),
+    Regla('dom', 'CALIDADDATO', 15, 'dominio', None, calidadDato_p_alc),
+    Regla('dom', 'SISTEMA', 16, 'dominio', excepto(lista_clase_p_alc, 'SECCION_TRANSVERSAL_5'), tipoSist_p_alc),
+    Regla('dom', 'CONOREDUCC', 22, 'dominio', ('POZO_2',), tieneConoReduc_p_alc),
+    Regla('dom', 'MATERCONO', 23, 'dominio', ('POZO_2',), materConoReduc_p_alc),
+    Regla('dom', 'TIPO_CONO', 24, 'dominio', ('POZO_2',), tipoConoReduc_p_alc),
+    Regla('dom', 'EST_CONO', 25, 'dominio', ('POZO_2',), estadoConoReduc_p_alc),
+    Regla('dom', 'INICIAL_CUENCAS', 26, 'dominio', ('POZO_2',), inicialCuencas_p_alc),
+    Regla('dom', 'CAMARASIF', 28, 'dominio', ('POZO_2',), camaraSifon_p_alc),
+    Regla('dom', 'EST_FISICO', 29, 'dominio', ('ESTRUCTURA_RED_1', 'POZO_2'), estadoFisico_p_alc),
+    Regla('dom', 'CABEZAL', 30, 'dominio', ('ESTRUCTURA_RED_1',), tieneCabezal_p_alc),
+    Regla('dom', 'EST_TAPA', 31, 'dominio', ('POZO_2',), estadoTapa_p_alc),
+    Regla('dom', 'EST_POZO', 32, 'dominio', ('POZO_2',), estadoPozo_p_alc),
+    Regla('dom', 'MATESCALO', 33, 'dominio', ('POZO_2',), matEscalones_p_alc),
+    Regla('dom', 'ESTESCALON', 34, 'dominio', ('POZO_2',), estadoEscalon_p_alc),
+    Regla('dom', 'ESTCARGUE', 35, 'dominio', ('POZO_2',), estadoCarge_p_alc),
+    Regla('dom', 'ESTCILIND', 36, 'dominio', ('POZO_2',), estadoCilindro_p_alc),
+    Regla('dom', 'ESTCANUE', 37, 'dominio', ('POZO_2',), estadoCanuela_p_alc),
+    Regla('dom', 'ESTOPERA', 38, 'dominio', ('POZO_2', 'SUMIDERO_3'), estadoOperac_p_alc),
+    Regla('dom', 'TIPOINSPEC', 41, 'dominio', ('POZO_2', 'SUMIDERO_3'), tipoInspec_p_alc),
+    Regla('dom', 'TIPOALMAC', 42, 'dominio', ('POZO_2',), tipoAlmacen_p_alc),
+    Regla('dom', 'TIPOBOMB', 50, 'dominio', ('ESTRUCTURA_RED_1',), tipoBomb_p_alc),
+    Regla('dom', 'ESTREJILLA', 56, 'dominio', ('SUMIDERO_3',), estadoRejilla_p_alc),
+    Regla('dom', 'MATREJILLA', 57, 'dominio', ('SUMIDERO_3',), materialRejilla_p_alc),
+    Regla('dom', 'ORIGENSEC', 59, 'dominio', ('SECCION_TRANSVERSAL_5',), origSeccion_p_alc)]
+
+# Chequeos compilados de una clase, agrupados por tipo de prueba para recorrerlos sin llamar funciones:
+# presente_texto y vacio_texto: (posicion, error, atributo); presente y vacio: (posicion, valores vacios, error,
+# atributo); dominio: (posicion, frozenset del dominio, error, atributo); condicionados: (posicion, valores, dentro,
+# prueba, posicion, valores de la prueba, error, atributo) para los chequeos que solo aplican si el valor de otro
+# campo esta (o no esta) en los valores
+Chequeos = namedtuple('Chequeos', ['presente_texto', 'vacio_texto', 'presente', 'vacio', 'dominio', 'condicionados'])
+
+vacios_prueba = {'valor': ('', None), 'numero': ('', None, 0)}
+
+# posiciones de la fila original que leen las reglas (atributo validado y atributo de la condicion)
+def indices_reglas(reglas):
+    indices = set()
+    for regla in reglas:
+        indices.add(regla.indice)
+        if regla.guarda is not None:
+            indices.add(regla.guarda[0])
+    return indices
+
+# tipo de chequeo de una regla: dominio, vacio_texto, presente_texto, vacio o presente
+def tipo_chequeo(regla):
+    if regla.prueba == 'dominio':
+        return regla.prueba
+    if regla.prueba == 'texto':
+        return 'vacio_texto' if regla.error == 'blan' else 'presente_texto'
+    if regla.prueba in vacios_prueba:
+        return 'vacio' if regla.error == 'blan' else 'presente'
+    raise ValueError(f'Prueba no soportada en la regla {regla.atributo}: {regla.prueba}')
+
+# Compila las reglas de una capa en listas planas de chequeos por clase, para que cada registro solo ejecute los
+# chequeos de su clase. posiciones traduce la posicion de la fila original a la posicion en la fila leida
+def compila_reglas(reglas, clases, posiciones):
+    chequeos = {nombre: Chequeos([], [], [], [], [], []) for nombre in clases.values()}
+    for regla in reglas:
+        prueba = tipo_chequeo(regla)
+        for nombre in regla.clases or chequeos:
+            if nombre not in chequeos:
+                continue
+            if isinstance(regla.dominio, dict):
+                valores = catalogo_dominios.conjunto(regla.dominio[nombre])
+            elif regla.dominio is not None:
+                valores = catalogo_dominios.conjunto(regla.dominio)
             else:
-                error_clase_p_acu.append(punto[76])
-    return clase_p_acu, error_clase_p_acu
-
-# Valida los atributos que SI deberian estar en vacios pero que tienen algun valor (comisiones) - PUNTOS ACUEDUCTO
-def valida_no_blan_p_acu(clase_p_acu, orig):
-    error_noBlan_p_acu = {'ROTACION':[], 'C_RASANTE':[], 'PROFUN':[], 'MATERIAL':[], 'TIPOESPPUB':[], 'MATESPPUBL':[], 
-                          'AUTOMATIZA':[], 'DIAMETRO1':[], 'DIAMETRO2':[], 'SENTIDOOPERAC':[], 'ESTADOOPERAC':[],
-                          'TIPOOPERAC':[], 'ESTADOFIS_VAL':[], 'TIPOVALVUL':[], 'VUELTASCIE':[], 'CLASEACCES':[],
-                          'ESTADOFISICOH':[], 'MARCA':[] , 'FUNCIONPIL':[] , 'ESTADOMED':[], 'SECTORENTR':[],
-                          'SECTORSALI':[],'IDTUBERIAMEDIDA':[],'CAUDAL_PROMEDIO':[],'TIPO_M':[],'FECHA_TOMA_C':[],
-                          'UBICACCAJI':[],'CENTRO':[],'L_ALM':[],'AREARESP':[],'TIPO_MUESTR':[],'FUENTEABAS':[],
-                          'UBICAC_MUES':[], 'PTOANALISI':[] ,'LOCPUNTO':[] ,'ESTADO':[] ,'FECHAESTADO':[], 'CLASEPUNTO':[],
-                          'NROFILTROS':[],'NROSEDIMEN':[],'NROCOMPART':[],'NROMEZCLAR':[],'NROFLOCULA':[],'CAPACINSTA':[],
-                          'NROBOMBAS':[], 'CAPABOMBEO':[] ,'COTABOMBEO':[] ,'ALTURADINA':[] ,'COTAFONDO':[] ,
-                          'COTAREBOSE':[],'CAPACIDAD':[], 'NIVELMAXIM':[], 'NIVELMINIM':[],'AREATRANSV':[], 'TIENEVIGIL':[],
-                          'OPERACTANQ':[] ,'TIPOACCESO':[] ,'DIAMETROAC':[] ,'NOMBRE':[],'DIRECCION':[],'PRESION':[]}
-
-    for tip_p in clase_p_acu:
-        for punto in clase_p_acu[tip_p]:
-            if tip_p in ('INSTRUMENTOS_MEDICION_21'):
-                if punto[10] not in ('', None, 0):
-                    error_noBlan_p_acu['ROTACION'].append(punto[76])
-            if tip_p in ('MACROMEDIDOR_10'):
-                if punto[11] not in ('', None, 0):
-                    error_noBlan_p_acu['C_RASANTE'].append(punto[76])
-            if tip_p in ('HIDRANTE_9', 'MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11', 'PILA_MUESTREO_12', 'CAPTACION_13',
-                         'DESARENADOR_14', 'PLANTA_TRATAMIENTO_15', 'ESTACION_BOMBEO_16', 'TANQUE_17', 'PORTAL_18',
-                         'ESTRUCTURA_CONTROL_20', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[12] not in ('', None, 0):
-                    error_noBlan_p_acu['PROFUN'].append(punto[76])
-            if tip_p in ( 'MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11', 'CAPTACION_13', 'DESARENADOR_14', 'PLANTA_TRATAMIENTO_15',
-                     'ESTACION_BOMBEO_16', 'TANQUE_17', 'PORTAL_18', 'CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20',
-                     'INSTRUMENTOS_MEDICION_21'):
-                if punto[13] is not None and not (isinstance(punto[13], str) and punto[13].strip() == ''):
-                    error_noBlan_p_acu['MATERIAL'].append(punto[76])
-            if tip_p not in('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'HIDRANTE_9', 'PILA_MUESTREO_12'):
-                if punto[18] is not None and not (isinstance(punto[18], str) and punto[18].strip() == ''):
-                    error_noBlan_p_acu['TIPOESPPUB'].append(punto[76])
-                if punto[19] is not None and not (isinstance(punto[19], str) and punto[19].strip() == ''):
-                    error_noBlan_p_acu['MATESPPUBL'].append(punto[76])
-            if tip_p not in ('VALVULASISTEMA_1', 'VALVULACONTROL_2'):
-                if (orig == 'shp' and (punto[20] not in ('', None, 0))) or (orig == 'gdb' and (punto[20] not in ('', None, 0))):
-                    error_noBlan_p_acu['AUTOMATIZA'].append(punto[76])
-                if punto[23] is not None and not (isinstance(punto[23], str) and punto[23].strip() == ''):
-                    error_noBlan_p_acu['SENTIDOOPERAC'].append(punto[76])
-                if punto[24] is not None and not (isinstance(punto[24], str) and punto[24].strip() == ''):
-                    error_noBlan_p_acu['ESTADOOPERAC'].append(punto[76])
-                if punto[25] is not None and not (isinstance(punto[25], str) and punto[25].strip() == ''):
-                    error_noBlan_p_acu['TIPOOPERAC'].append(punto[76])
-                if punto[26] is not None and not (isinstance(punto[26], str) and punto[26].strip() == ''):
-                    error_noBlan_p_acu['ESTADOFIS_VAL'].append(punto[76])
-            
-            if tip_p in ('MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11', 'PILA_MUESTREO_12', 'CAPTACION_13', 'DESARENADOR_14',
-                         'PLANTA_TRATAMIENTO_15', 'ESTACION_BOMBEO_16', 'TANQUE_17', 'PORTAL_18', 'CAMARA_ACCESO_19',
-                         'ESTRUCTURA_CONTROL_20'):
-                if punto[21] is not None and not (isinstance(punto[21], str) and punto[21].strip() == ''):
-                    error_noBlan_p_acu['DIAMETRO1'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'HIDRANTE_9', 'MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11',
-                         'PILA_MUESTREO_12', 'CAPTACION_13', 'DESARENADOR_14', 'PLANTA_TRATAMIENTO_15',
-                         'ESTACION_BOMBEO_16', 'TANQUE_17', 'PORTAL_18', 'CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20',
-                         'INSTRUMENTOS_MEDICION_21'):
-                if punto[22] is not None and not (isinstance(punto[22], str) and punto[22].strip() == ''):
-                    error_noBlan_p_acu['DIAMETRO2'].append(punto[76])
-            if tip_p not in ('VALVULASISTEMA_1'):
-                if punto[27] is not None and not (isinstance(punto[27], str) and punto[27].strip() == ''):
-                    error_noBlan_p_acu['TIPOVALVUL'].append(punto[76])
-                if (orig == 'shp' and (punto[28] not in ('', None, 0))) or (orig == 'gdb' and (punto[28] not in ('', None, 0))):
-                    error_noBlan_p_acu['VUELTASCIE'].append(punto[76])
-            if tip_p not in ('ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4', 'ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6',
-                         'ACCESORIO_UNION_7'):
-                if punto[29] is not None and not (isinstance(punto[29], str) and punto[29].strip() == ''):
-                    error_noBlan_p_acu['CLASEACCES'].append(punto[76])
-            if tip_p not in ('HIDRANTE_9'):
-                if punto[30] is not None and not (isinstance(punto[30], str) and punto[30].strip() == ''):
-                    error_noBlan_p_acu['ESTADOFISICOH'].append(punto[76])
-                if punto[32] not in ('', None, 0):
-                    error_noBlan_p_acu['FUNCIONPIL'].append(punto[76])
-                if punto[74] not in ('', None, 0):
-                    error_noBlan_p_acu['PRESION'].append(punto[76])
-            if tip_p not in ('HIDRANTE_9', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[31] is not None and not (isinstance(punto[31], str) and punto[31].strip() == ''):
-                    error_noBlan_p_acu['MARCA'].append(punto[76])
-            if tip_p not in ('MACROMEDIDOR_10'):
-                if punto[33] is not None and not (isinstance(punto[33], str) and punto[33].strip() == ''):
-                    error_noBlan_p_acu['ESTADOMED'].append(punto[76])
-                if punto[34] is not None and not (isinstance(punto[34], str) and punto[34].strip() == ''):
-                    error_noBlan_p_acu['SECTORENTR'].append(punto[76])
-                if punto[35] is not None and not (isinstance(punto[35], str) and punto[35].strip() == ''):
-                    error_noBlan_p_acu['SECTORSALI'].append(punto[76])
-                if punto[36] is not None and not (isinstance(punto[36], str) and punto[36].strip() == ''):
-                    error_noBlan_p_acu['IDTUBERIAMEDIDA'].append(punto[76])
-                if punto[38] is not None and not (isinstance(punto[38], str) and punto[38].strip() == ''):
-                    error_noBlan_p_acu['TIPO_M'].append(punto[76])
-                if punto[39] not in ('', None) and tip_p != 'HIDRANTE_9':
-                    error_noBlan_p_acu['FECHA_TOMA_C'].append(punto[76])
-            if tip_p not in ('MACROMEDIDOR_10', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[37] not in ('', None, 0):
-                    error_noBlan_p_acu['CAUDAL_PROMEDIO'].append(punto[76])
-            if tip_p not in ('PUNTO_ACOMETIDA_11'):
-                if punto[40] is not None and not (isinstance(punto[40], str) and punto[40].strip() == ''):
-                    error_noBlan_p_acu['UBICACCAJI'].append(punto[76])
-            if tip_p not in ('PILA_MUESTREO_12'):
-                if punto[41] is not None and not (isinstance(punto[41], str) and punto[41].strip() == ''):
-                    error_noBlan_p_acu['CENTRO'].append(punto[76])
-                if punto[42] is not None and not (isinstance(punto[42], str) and punto[42].strip() == ''):
-                    error_noBlan_p_acu['L_ALM'].append(punto[76])
-                if punto[43] is not None and not (isinstance(punto[43], str) and punto[43].strip() == ''):
-                    error_noBlan_p_acu['AREARESP'].append(punto[76])
-                if punto[44] is not None and not (isinstance(punto[44], str) and punto[44].strip() == ''):
-                    error_noBlan_p_acu['TIPO_MUESTR'].append(punto[76])
-                if punto[45] is not None and not (isinstance(punto[45], str) and punto[45].strip() == ''):
-                    error_noBlan_p_acu['FUENTEABAS'].append(punto[76])
-                if punto[46] is not None and not (isinstance(punto[46], str) and punto[46].strip() == ''):
-                    error_noBlan_p_acu['UBICAC_MUES'].append(punto[76])
-                if punto[47] is not None and not (isinstance(punto[47], str) and punto[47].strip() == ''):
-                    error_noBlan_p_acu['PTOANALISI'].append(punto[76])
-                if punto[48] is not None and not (isinstance(punto[48], str) and punto[48].strip() == ''):
-                    error_noBlan_p_acu['LOCPUNTO'].append(punto[76])
-                if punto[49] is not None and not (isinstance(punto[49], str) and punto[49].strip() == ''):
-                    error_noBlan_p_acu['ESTADO'].append(punto[76])
-                if punto[50] not in ('', None):
-                    error_noBlan_p_acu['FECHAESTADO'].append(punto[76])
-                if punto[51] is not None and not (isinstance(punto[51], str) and punto[51].strip() == ''):
-                    error_noBlan_p_acu['CLASEPUNTO'].append(punto[76])
-            if tip_p not in ('PLANTA_TRATAMIENTO_15'):
-                if (orig == 'shp' and (punto[52] not in ('', None, 0))) or (orig == 'gdb' and (punto[52] not in ('', None, 0))):
-                    error_noBlan_p_acu['NROFILTROS'].append(punto[76])
-                if (orig == 'shp' and (punto[53] not in ('', None, 0))) or (orig == 'gdb' and (punto[53] not in ('', None, 0))):
-                    error_noBlan_p_acu['NROSEDIMEN'].append(punto[76])
-                if (orig == 'shp' and (punto[54] not in ('', None, 0))) or (orig == 'gdb' and (punto[54] not in ('', None, 0))):
-                    error_noBlan_p_acu['NROCOMPART'].append(punto[76])
-                if (orig == 'shp' and (punto[55] not in ('', None, 0))) or (orig == 'gdb' and (punto[55] not in ('', None, 0))):
-                    error_noBlan_p_acu['NROMEZCLAR'].append(punto[76])
-                if (orig == 'shp' and (punto[56] not in ('', None, 0))) or (orig == 'gdb' and (punto[56] not in ('', None, 0))):
-                    error_noBlan_p_acu['NROFLOCULA'].append(punto[76])
-                if punto[57] not in ('', None, 0):
-                    error_noBlan_p_acu['CAPACINSTA'].append(punto[76])
-            if tip_p not in ('ESTACION_BOMBEO_16'):
-                if (orig == 'shp' and (punto[58] not in ('', None, 0))) or (orig == 'gdb' and (punto[58] not in ('', None, 0))):
-                    error_noBlan_p_acu['NROBOMBAS'].append(punto[76])
-                if punto[59] not in ('', None, 0):
-                    error_noBlan_p_acu['CAPABOMBEO'].append(punto[76])
-                if punto[60] not in ('', None, 0):
-                    error_noBlan_p_acu['COTABOMBEO'].append(punto[76])
-                if punto[61] not in ('', None, 0):
-                    error_noBlan_p_acu['ALTURADINA'].append(punto[76])
-            if tip_p not in ('TANQUE_17'):
-                if punto[62] not in ('', None, 0):
-                    error_noBlan_p_acu['COTAFONDO'].append(punto[76])
-                if punto[63] not in ('', None, 0):
-                    error_noBlan_p_acu['COTAREBOSE'].append(punto[76])
-                if punto[64] not in ('', None, 0):
-                    error_noBlan_p_acu['CAPACIDAD'].append(punto[76])
-                if punto[65] not in ('', None, 0):
-                    error_noBlan_p_acu['NIVELMAXIM'].append(punto[76])
-                if punto[66] not in ('', None, 0):
-                    error_noBlan_p_acu['NIVELMINIM'].append(punto[76])
-                if punto[67] not in ('', None, 0):
-                    error_noBlan_p_acu['AREATRANSV'].append(punto[76])
-                if punto[68] not in ('', None, 0):
-                    error_noBlan_p_acu['TIENEVIGIL'].append(punto[76])
-                if punto[69] is not None and not (isinstance(punto[69], str) and punto[69].strip() == ''):
-
-                    error_noBlan_p_acu['OPERACTANQ'].append(punto[76])
-            if tip_p not in ('CAMARA_ACCESO_19'):
-                if punto[70] is not None and not (isinstance(punto[70], str) and punto[70].strip() == ''):
-                    error_noBlan_p_acu['TIPOACCESO'].append(punto[76])
-                if punto[71] not in ('', None, 0):
-                    error_noBlan_p_acu['DIAMETROAC'].append(punto[76])
-            if tip_p not in ('PILA_MUESTREO_12', 'CAPTACION_13', 'DESARENADOR_14', 'PLANTA_TRATAMIENTO_15',
-                     'ESTACION_BOMBEO_16', 'TANQUE_17', 'PORTAL_18', 'CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20'):
-                if punto[72] is not None and not (isinstance(punto[72], str) and punto[72].strip() == ''):
-                    error_noBlan_p_acu['NOMBRE'].append(punto[76])
-            if tip_p not in ('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'HIDRANTE_9', 'MACROMEDIDOR_10', 'PUNTO_ACOMETIDA_11',
-                         'PILA_MUESTREO_12', 'CAPTACION_13', 'DESARENADOR_14', 'PLANTA_TRATAMIENTO_15',
-                         'ESTACION_BOMBEO_16', 'TANQUE_17', 'PORTAL_18', 'CAMARA_ACCESO_19', 'ESTRUCTURA_CONTROL_20'):
-                if punto[73] is not None and not (isinstance(punto[73], str) and punto[73].strip() == ''):
-                    error_noBlan_p_acu['DIRECCION'].append(punto[76])
-    return error_noBlan_p_acu
-
-# Valida los atributos que NO deberian estar en vacios pero estan si vacios (omisiones) - PUNTOS ACUEDUCTO
-def valida_blan_p_acu(clase_p_acu):
-    error_blan_p_acu = {'IDENTIFIC':[], 'NORTE':[], 'ESTE':[], 'FECHAINST':[], 'LOCALIZACIONRELATIVA':[], 
-                        'ROTACION':[], 'C_RASANTE':[], 'PROFUN':[], 'CONTRATO_ID':[], 'VUELTASCIE':[],
-                        'MARCA':[], 'ESTADOMED':[], 'SECTORENTR':[], 'SECTORSALI':[], 'IDTUBERIAMEDIDA':[],
-                        'CAUDAL_PRO':[], 'TIPO_M':[], 'FECHA_TOMA':[], 'CENTRO':[], 'L_ALM':[], 'AREARESP':[],
-                        'FECHAESTADO':[], 'NROFILTROS':[], 'NROSEDIMEN':[], 'NROCOMPART':[],
-                        'NROMEZCLAR':[], 'NROFLOCULA':[], 'CAPACINSTA':[], 'NROBOMBAS':[], 'CAPABOMBEO':[],
-                        'COTABOMBEO':[], 'ALTURADINA':[], 'COTAFONDO':[], 'COTAREBOSE':[], 'CAPACIDAD':[],
-                        'NIVELMAXIM':[], 'NIVELMINIM':[], 'AREATRANSV':[], 'DIAMETROAC':[],'DIRECCION':[],
-                        'PRESION':[]}
-    for tip_p in clase_p_acu:
-        for punto in clase_p_acu[tip_p]:
-            if tip_p not in ('INSTRUMENTOS_MEDICION_21'):
-                if punto[10] in ('', None):
-                    error_blan_p_acu['ROTACION'].append(punto[76])
-            if tip_p not in ('MACROMEDIDOR_10'):
-                if punto[11] in ('', None):
-                    error_blan_p_acu['C_RASANTE'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4', 'ACCESORIO_TAPON_5',
-                     'ACCESORIO_TEE_6', 'ACCESORIO_UNION_7', 'ACCESORIO_OTROS_8'):
-                if punto[12] in ('', None):
-                    error_blan_p_acu['PROFUN'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1'):
-                if punto[28] in ('', None):
-                    error_blan_p_acu['VUELTASCIE'].append(punto[76])
-            if tip_p in ('HIDRANTE_9', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[31] is None or (isinstance(punto[31], str) and punto[31].strip() == ''):
-                    error_blan_p_acu['MARCA'].append(punto[76])
-            if tip_p in ('MACROMEDIDOR_10'):
-                if punto[33] is None or (isinstance(punto[33], str) and punto[33].strip() == ''):
-                    error_blan_p_acu['ESTADOMED'].append(punto[76])
-                if punto[34] is None or (isinstance(punto[34], str) and punto[34].strip() == ''):
-                    error_blan_p_acu['SECTORENTR'].append(punto[76])
-                if punto[35] is None or (isinstance(punto[35], str) and punto[35].strip() == ''):
-                    error_blan_p_acu['SECTORSALI'].append(punto[76])
-                if punto[36] is None or (isinstance(punto[36], str) and punto[36].strip() == ''):
-                    error_blan_p_acu['IDTUBERIAMEDIDA'].append(punto[76])
-                if punto[38] is None or (isinstance(punto[38], str) and punto[38].strip() == ''):
-                    error_blan_p_acu['TIPO_M'].append(punto[76])
-                if punto[39] in ('', None):
-                    error_blan_p_acu['FECHA_TOMA'].append(punto[76])
-            if tip_p in ('MACROMEDIDOR_10', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[37] in ('', None):
-                    error_blan_p_acu['CAUDAL_PRO'].append(punto[76])
-            if tip_p in ('PILA_MUESTREO_12'):
-                if punto[41] is None or (isinstance(punto[41], str) and punto[41].strip() == ''):
-                    error_blan_p_acu['CENTRO'].append(punto[76])
-                if punto[42] is None or (isinstance(punto[42], str) and punto[42].strip() == ''):
-                    error_blan_p_acu['L_ALM'].append(punto[76])
-                if punto[43] is None or (isinstance(punto[43], str) and punto[43].strip() == ''):
-                    error_blan_p_acu['AREARESP'].append(punto[76])
-                if punto[50] in ('', None):
-                    error_blan_p_acu['FECHAESTADO'].append(punto[76])
-            if tip_p in ('PLANTA_TRATAMIENTO_15'):
-                if punto[52] in ('', None):
-                    error_blan_p_acu['NROFILTROS'].append(punto[76])
-                if punto[53] in ('', None):
-                    error_blan_p_acu['NROSEDIMEN'].append(punto[76])
-                if punto[54] in ('', None):
-                    error_blan_p_acu['NROCOMPART'].append(punto[76])
-                if punto[55] in ('', None):
-                    error_blan_p_acu['NROMEZCLAR'].append(punto[76])
-                if punto[56] in ('', None):
-                    error_blan_p_acu['NROFLOCULA'].append(punto[76])
-                if punto[57] in ('', None):
-                    error_blan_p_acu['CAPACINSTA'].append(punto[76])
-            if tip_p in ('ESTACION_BOMBEO_16'):
-                if punto[58] in ('', None):
-                    error_blan_p_acu['NROBOMBAS'].append(punto[76])
-                if punto[59] in ('', None):
-                    error_blan_p_acu['CAPABOMBEO'].append(punto[76])
-                if punto[60] in ('', None):
-                    error_blan_p_acu['COTABOMBEO'].append(punto[76])
-                if punto[61] in ('', None):
-                    error_blan_p_acu['ALTURADINA'].append(punto[76])
-            if tip_p in ('TANQUE_17'):
-                if punto[62] in ('', None):
-                    error_blan_p_acu['COTAFONDO'].append(punto[76])
-                if punto[63] in ('', None):
-                    error_blan_p_acu['COTAREBOSE'].append(punto[76])
-                if punto[64] in ('', None):
-                    error_blan_p_acu['CAPACIDAD'].append(punto[76])
-                if punto[65] in ('', None):
-                    error_blan_p_acu['NIVELMAXIM'].append(punto[76])
-                if punto[66] in ('', None):
-                    error_blan_p_acu['NIVELMINIM'].append(punto[76])
-                if punto[67] in ('', None):
-                    error_blan_p_acu['AREATRANSV'].append(punto[76])
-            if tip_p in ('CAMARA_ACCESO_19'):
-                if punto[71] in ('', None):
-                    error_blan_p_acu['DIAMETROAC'].append(punto[76])
-            if tip_p not in ('ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4', 'ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6',
-                         'ACCESORIO_UNION_7', 'ACCESORIO_OTROS_8', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[73] is None or (isinstance(punto[73], str) and punto[73].strip() == ''):
-                    error_blan_p_acu['DIRECCION'].append(punto[76])
-            if tip_p in ('HIDRANTE_9'):
-                if punto[74] in ('', None):
-                    error_blan_p_acu['PRESION'].append(punto[76])
-           
-            if punto[13] is None or (isinstance(punto[13], str) and punto[13].strip() == ''):
-                error_blan_p_acu['IDENTIFIC'].append(punto[76])
-            if punto[4] in ('', None, 0):
-                error_blan_p_acu['NORTE'].append(punto[76])
-            if punto[5] in ('', None, 0):
-                error_blan_p_acu['ESTE'].append(punto[76])
-            if punto[6] in ('', None):
-                error_blan_p_acu['FECHAINST'].append(punto[76])
-            if punto[8] is None or (isinstance(punto[8], str) and punto[8].strip() == ''):
-                error_blan_p_acu['LOCALIZACIONRELATIVA'].append(punto[76])
-            if punto[16] is None or (isinstance(punto[16], str) and punto[16].strip() == ''):
-                error_blan_p_acu['CONTRATO_ID'].append(punto[76])
-
-    return error_blan_p_acu
-
-# Valida que los atributos de la capa de lineas acueducto cumplan con los dominios
-def valida_dom_p_acu(clase_p_acu):
-    error_dom_p_acu = {'SUBTIPO':[], 'ESTADOENRED':[], 'CALIDADDATO':[], 'MATERIAL':[], 'TIPOESPPUB':[], 
-                       'MATESPPUBL':[], 'AUTOMATIZA':[], 'DIAMETRO1':[], 'DIAMETRO2':[], 'SENTIDOOPERAC':[],
-                       'ESTADOOPERAC':[], 'TIPOOPERAC':[], 'ESTADOFIS_VAL':[], 'TIPOVALVUL':[], 'CLASEACCES':[],
-                       'ESTADOFISICOH':[], 'FUNCIONPIL':[], 'UBICACCAJI':[], 'TIPO_MUESTR':[], 'FUENTEABAS':[],
-                       'UBICAC_MUES':[], 'PTOANALISI':[], 'LOCPUNTO':[], 'ESTADO':[], 'CLASEPUNTO':[],
-                       'TIENEVIGIL':[], 'OPERACTANQ':[], 'TIPOACCESO':[]}
-    for tip_p in clase_p_acu:
-        for punto in clase_p_acu[tip_p]:
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4',
-                         'ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6', 'ACCESORIO_UNION_7', 'ACCESORIO_OTROS_8',
-                         'HIDRANTE_9', 'PILA_MUESTREO_12'):
-                if punto[13] not in dominios_p_acu[3]:
-                    error_dom_p_acu['MATERIAL'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'HIDRANTE_9', 'PILA_MUESTREO_12'):
-                if punto[18] not in dominios_p_acu[4]:
-                    error_dom_p_acu['TIPOESPPUB'].append(punto[76])
-                if punto[19] not in dominios_p_acu[5]:
-                    error_dom_p_acu['MATESPPUBL'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2'):
-                if punto[20] not in dominios_p_acu[6]:
-                    error_dom_p_acu['AUTOMATIZA'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2', 'ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4',
-                         'ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6', 'ACCESORIO_UNION_7', 'ACCESORIO_OTROS_8',
-                         'HIDRANTE_9', 'PILA_MUESTREO_12', 'INSTRUMENTOS_MEDICION_21'):
-                if punto[21] not in dominios_p_acu[7]:
-                    error_dom_p_acu['DIAMETRO1'].append(punto[76])
-            if tip_p in ('ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4','ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6',
-                         'ACCESORIO_UNION_7', 'ACCESORIO_OTROS_8'):
-                if punto[22] not in dominios_p_acu[7]:
-                    error_dom_p_acu['DIAMETRO2'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1', 'VALVULACONTROL_2'):
-                if str(punto[23]) not in dominios_p_acu[8]:
-                    error_dom_p_acu['SENTIDOOPERAC'].append(punto[76])
-                if punto[24] not in dominios_p_acu[9]:
-                    error_dom_p_acu['ESTADOOPERAC'].append(punto[76])
-                if punto[25] not in dominios_p_acu[10]:
-                    error_dom_p_acu['TIPOOPERAC'].append(punto[76])
-                if punto[26] not in dominios_p_acu[11]:
-                    error_dom_p_acu['ESTADOFIS_VAL'].append(punto[76])
-            if tip_p in ('VALVULASISTEMA_1'):
-                if punto[27] not in dominios_p_acu[12]:
-                    error_dom_p_acu['TIPOVALVUL'].append(punto[76])
-            if tip_p in ('ACCESORIO_CODO_3', 'ACCESORIO_REDUCCION_4','ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6',
-                         'ACCESORIO_UNION_7'):
-                if punto[29] not in dominios_p_acu[13][tip_p]:
-                    error_dom_p_acu['CLASEACCES'].append(punto[76])
-            if tip_p in ('HIDRANTE_9'):
-                if punto[30] not in dominios_p_acu[14]:
-                    error_dom_p_acu['ESTADOFISICOH'].append(punto[76])
-                if punto[32] not in dominios_p_acu[15]:
-                    error_dom_p_acu['FUNCIONPIL'].append(punto[76])
-            if tip_p in ('PUNTO_ACOMETIDA_11'):
-                if punto[40] not in dominios_p_acu[16]:
-                    error_dom_p_acu['UBICACCAJI'].append(punto[76])
-            if tip_p in ('PILA_MUESTREO_12'):
-                if punto[44] not in dominios_p_acu[17]:
-                    error_dom_p_acu['TIPO_MUESTR'].append(punto[76])
-                if punto[45] not in dominios_p_acu[18]:
-                    error_dom_p_acu['FUENTEABAS'].append(punto[76])
-                if punto[46] not in dominios_p_acu[19]:
-                    error_dom_p_acu['UBICAC_MUES'].append(punto[76])
-                if punto[47] not in dominios_p_acu[20]:
-                    error_dom_p_acu['PTOANALISI'].append(punto[76])
-                if punto[48] not in dominios_p_acu[21]:
-                    error_dom_p_acu['LOCPUNTO'].append(punto[76])
-                if punto[49] not in dominios_p_acu[22]:
-                    error_dom_p_acu['ESTADO'].append(punto[76])
-                if punto[51] not in dominios_p_acu[23]:
-                    error_dom_p_acu['CLASEPUNTO'].append(punto[76])
-            if tip_p in ('TANQUE_17'):
-                if punto[68] not in dominios_p_acu[24]:
-                    error_dom_p_acu['TIENEVIGIL'].append(punto[76])
-                if punto[69] not in dominios_p_acu[25]:
-                    error_dom_p_acu['OPERACTANQ'].append(punto[76])
-            if tip_p in ('CAMARA_ACCESO_19'):
-                if punto[70] not in dominios_p_acu[26]:
-                    error_dom_p_acu['TIPOACCESO'].append(punto[76])
-
-            # validando los dominios generales
-            if punto[2] not in dominios_p_acu[0][tip_p]:
-                error_dom_p_acu['SUBTIPO'].append(punto[76])
-            if punto[7] not in dominios_p_acu[1]:
-                error_dom_p_acu['ESTADOENRED'].append(punto[76])
-            if punto[9] not in dominios_p_acu[2]:
-                error_dom_p_acu['CALIDADDATO'].append(punto[76])
-                
-    return error_dom_p_acu
-
-
-# ------------------------------------- VALIDACIONES LINEAS ALCANTARILLADO -------------------------------------
-# clasifica los tipos de linea alcantarillado que puedo encontrarme
-def clasif_l_alc(l_alc, atrib_l_alc):
-    clase_l_alc = {'redLocal_1':[], 'redTroncal_2':[], 'linLat_3':[]}
-    error_clase_l_alc = []
-    with arcpy.da.SearchCursor(l_alc,atrib_l_alc) as cursor:
-        for line in cursor:
-            if line[1] == 1:
-                clase_l_alc['redLocal_1'].append(line)
-            elif line[1] == 2:
-                clase_l_alc['redTroncal_2'].append(line)
-            elif line[1] == 3:
-                clase_l_alc['linLat_3'].append(line)
-            else:
-                error_clase_l_alc.append(line[42])
-    return clase_l_alc, error_clase_l_alc
-
-# Valida los atributos que SI deberian estar en vacios pero que tienen algun valor (comisiones) - LINEAS ALCANTARILLADO
-def valida_noBlan_l_alc(clase_l_alc, orig):
-    error_noBlan_l_alc = {'MATERIAL2':[], 'T_SECCION':[], 'CAM_CAIDA':[], 'INSTALACI':[], 'MATESPPUBL':[], 'PENDIENTE':[],
-                          'NOMBRE':[], 'BASE':[], 'PROFUNDIDAD':[], 'NROCONDUCTOS':[], 'ALTURA1':[], 'ALTURA2':[],
-                          'ANCHOBERMA':[], 'TALUD1':[], 'TALUD2':[], 'TIPOINSPEC':[], 'GRADOEST':[], 'GRADOOPER':[]}
-    for red in clase_l_alc:
-        for line in clase_l_alc[red]:
-            if red in ('linLat_3'):
-                if line[8] is not None and not (isinstance(line[8], str) and line[8].strip() == ''):
-                    error_noBlan_l_alc['MATERIAL2'].append(line[42])
-                if line[12] is not None and not (isinstance(line[12], str) and line[12].strip() == ''):
-                    error_noBlan_l_alc['T_SECCION'].append(line[42])
-                if line[35] is not None and not (isinstance(line[35], str) and line[35].strip() == ''):
-                    error_noBlan_l_alc['INSTALACI'].append(line[42])
-                if line[36] is not None and not (isinstance(line[36], str) and line[36].strip() == ''):
-                    error_noBlan_l_alc['MATESPPUBL'].append(line[42])
-                if (orig == 'shp' and (line[27] not in ('', None, 0))) or (orig == 'gdb' and (line[27] not in ('', None, 0))):
-                    error_noBlan_l_alc['PROFUNDIDAD'].append(line[42])
-                if line[24] not in ('', None, 0):
-                    error_noBlan_l_alc['PENDIENTE'].append(line[42])
-                if (orig == 'shp' and (line[30] not in ('', None, 0))) or (orig == 'gdb' and (line[30] not in ('', None, 0))):
-                    error_noBlan_l_alc['NROCONDUCTOS'].append(line[42])
-                if (orig == 'shp' and (line[26] not in ('', None, 0))) or (orig == 'gdb' and (line[26] not in ('', None, 0))):
-                    error_noBlan_l_alc['BASE'].append(line[42])
-                if (orig == 'shp' and (line[28] not in ('', None, 0))) or (orig == 'gdb' and (line[28] not in ('', None, 0))):
-                    error_noBlan_l_alc['ALTURA1'].append(line[42])
-
-            if (red == 'redTroncal_2' and line[2] in ('24', '27')) or red == 'linLat_3':
-                if line[17] is not None and not (isinstance(line[17], str) and line[17].strip() == ''):
-                    error_noBlan_l_alc['CAM_CAIDA'].append(line[42])
-                if line[38] is not None and not (isinstance(line[38], str) and line[38].strip() == ''):
-                    error_noBlan_l_alc['TIPOINSPEC'].append(line[42])
-                if line[39] is not None and not (isinstance(line[39], str) and line[39].strip() == ''):
-                    error_noBlan_l_alc['GRADOEST'].append(line[42])
-                if line[40] is not None and not (isinstance(line[40], str) and line[40].strip() == ''):
-                    error_noBlan_l_alc['GRADOOPER'].append(line[42])
-
-            if (red == 'redTroncal_2' and line[2] not in ('24', '27')) or red == 'linLat_3':
-                if (orig == 'shp' and (line[29] not in ('', None, 0))) or (orig == 'gdb' and (line[29] not in ('', None, 0))):
-                    error_noBlan_l_alc['ALTURA2'].append(line[42])
-                if (orig == 'shp' and (line[31] not in ('', None, 0))) or (orig == 'gdb' and (line[31] not in ('', None, 0))):
-                    error_noBlan_l_alc['ANCHOBERMA'].append(line[42])
-                if (orig == 'shp' and (line[32] not in ('', None, 0))) or (orig == 'gdb' and (line[32] not in ('', None, 0))):
-                    error_noBlan_l_alc['TALUD1'].append(line[42])
-                if (orig == 'shp' and (line[33] not in ('', None, 0))) or (orig == 'gdb' and (line[33] not in ('', None, 0))):
-                    error_noBlan_l_alc['TALUD2'].append(line[42])
-
-            if red not in ('redTroncal_2'):
-                if line[25] is not None and not (isinstance(line[25], str) and line[25].strip() == ''):
-                    error_noBlan_l_alc['NOMBRE'].append(line[42])
-    return error_noBlan_l_alc
-
-# Valida los atributos que NO deberian estar en vacios pero estan si vacios (omisiones) - LINEAS ALCANTARILLADO
-def valida_blan_l_alc(clase_l_alc):
-    error_blan_l_alc = {'N_INICIAL':[], 'N_FINAL':[], 'FECHAINST':[], 'CONTRATO_ID':[], 'C_RASATEI':[],
-                        'C_RASANTEF':[], 'C_CLAVEI':[], 'C_CLAVEF':[], 'C_BATEAI':[], 'C_BATEAF':[], 'PENDIENTE':[],
-                        'PROFUNDIDAD':[],'NROCONDUCTOS':[], 'BASE':[], 'ALTURA1':[], 'ALTURA2':[],
-                        'ANCHOBERMA':[],'TALUD1':[], 'TALUD2':[]}
-    for red in clase_l_alc:
-        for line in clase_l_alc[red]:
-            if red not in ('linLat_3'):
-                if line[24] in ('', None):
-                    error_blan_l_alc['PENDIENTE'].append(line[42])
-                if line[27] in ('', None):
-                    error_blan_l_alc['PROFUNDIDAD'].append(line[42])
-                if line[30] in ('', None):
-                    error_blan_l_alc['NROCONDUCTOS'].append(line[42])
-                if line[26] in ('', None):
-                    error_blan_l_alc['BASE'].append(line[42])
-                if line[28] in ('', None):
-                    error_blan_l_alc['ALTURA1'].append(line[42])
-                if line[2] in (24, 27) and line[29] in ('', None):
-                    error_blan_l_alc['ALTURA2'].append(line[42])
-                if line[2] in (24, 27) and line[31] in ('', None):
-                    error_blan_l_alc['ANCHOBERMA'].append(line[42])
-                if line[2] in (24, 27) and line[32] in ('', None):
-                    error_blan_l_alc['TALUD1'].append(line[42])
-                if line[2] in (24, 27) and line[33] in ('', None):
-                    error_blan_l_alc['TALUD2'].append(line[42])
-            if line[3] is None or (isinstance(line[3], str) and line[3].strip() == ''):
-                error_blan_l_alc['N_INICIAL'].append(line[42])
-            if line[4] is None or (isinstance(line[4], str) and line[4].strip() == ''):
-                error_blan_l_alc['N_FINAL'].append(line[42])
-            if line[6] in ('', None):
-                error_blan_l_alc['FECHAINST'].append(line[42])
-            if line[16] is None or (isinstance(line[16], str) and line[16].strip() == ''):
-                error_blan_l_alc['CONTRATO_ID'].append(line[42])
-            if line[18] in ('', None):
-                error_blan_l_alc['C_RASATEI'].append(line[42])
-            if line[19] in ('', None):
-                error_blan_l_alc['C_RASANTEF'].append(line[42])
-            if line[20] in ('', None):
-                error_blan_l_alc['C_CLAVEI'].append(line[42])
-            if line[21] in ('', None):
-                error_blan_l_alc['C_CLAVEF'].append(line[42])
-            if line[22] in ('', None):
-                error_blan_l_alc['C_BATEAI'].append(line[42])
-            if line[23] in ('', None):
-                error_blan_l_alc['C_BATEAF'].append(line[42])
-
-    return error_blan_l_alc
-
-# Valida que los atributos de la capa de lineas Alcantarillado cumplan con los dominios
-def valida_dom_l_alc(clase_l_alc):
-    error_dom_l_alc = {'SUBTIPO':[], 'SISTEMA':[], 'ESTADOENRED':[], 'MATERIAL':[], 'MATERIAL2':[], 'CALIDADDATO':[],
-                       'ESTADOLEGAL':[], 'DIAMETRO':[], 'T_SECCION':[], 'CAM_CAIDA':[], 'INSTALACI':[], 'MATESPPUBL':[],
-                       'TIPOINSPEC':[], 'GRADOEST':[], 'GRADOOPER':[]}
-    for red in clase_l_alc:
-        for line in clase_l_alc[red]:
-            if red not in ('linLat_3'):
-                if line[8] not in dominios_l_alc[3]:
-                    error_dom_l_alc['MATERIAL2'].append(line[42])
-                if line [12] not in dominios_l_alc[7]:
-                    error_dom_l_alc['T_SECCION'].append(line[42])
-                if line[2] not in ('24', '27') and line[17] not in dominios_l_alc[8]:
-                    error_dom_l_alc['CAM_CAIDA'].append(line[42])
-                if line[35] not in dominios_l_alc[9]:
-                    error_dom_l_alc['INSTALACI'].append(line[42])
-                if line[36] not in dominios_l_alc[10]:
-                    error_dom_l_alc['MATESPPUBL'].append(line[42])
-                if line[38] not in ('24', '27') and line[17] not in dominios_l_alc[11]:
-                    error_dom_l_alc['TIPOINSPEC'].append(line[42])
-                if line[39] not in ('24', '27') and line[17] not in dominios_l_alc[12]:
-                    error_dom_l_alc['GRADOEST'].append(line[42])
-                if line[40] not in ('24', '27') and line[17] not in dominios_l_alc[13]:
-                    error_dom_l_alc['GRADOOPER'].append(line[42])
-            if line[2] not in dominios_l_alc[0][red]:
-                error_dom_l_alc['SUBTIPO'].append(line[42])
-            if line[5] not in dominios_l_alc[1]:
-                error_dom_l_alc['SISTEMA'].append(line[42])
-            if line[10] not in dominios_l_alc[2]:
-                error_dom_l_alc['ESTADOENRED'].append(line[42])
-            if line[7] not in dominios_l_alc[3]:
-                error_dom_l_alc['MATERIAL'].append(line[42])
-            if line[13] not in dominios_l_alc[4]:
-                error_dom_l_alc['CALIDADDATO'].append(line[42])
-            if line[14] not in dominios_l_alc[5]:
-                error_dom_l_alc['ESTADOLEGAL'].append(line[42])
-            if line [11] not in dominios_l_alc[6]:
-                error_dom_l_alc['DIAMETRO'].append(line[42])
-    return error_dom_l_alc
-
-
-# ------------------------------------- VALIDACIONES PUNTOS ALCANTARILLADO -------------------------------------
-# clasifica los tipos de punto alcantarillado que puedo encontrarme
-def clasif_p_alc(l_alc, atrib_p_alc):
-    clase_p_alc = {'ESTRUCTURA_RED_1':[], 'POZO_2':[], 'SUMIDERO_3':[], 'CAJA_DOMICILIARIA_4':[], 'SECCION_TRANSVERSAL_5':[]}
-    error_clase_p_alc = []
-    with arcpy.da.SearchCursor(l_alc,atrib_p_alc) as cursor:
-        for punto in cursor:
-            if punto[1] == 1:
-                clase_p_alc['ESTRUCTURA_RED_1'].append(punto)
-            elif punto[1] == 2:
-                clase_p_alc['POZO_2'].append(punto)
-            elif punto[1] == 3:
-                clase_p_alc['SUMIDERO_3'].append(punto)
-            elif punto[1] == 4:
-                clase_p_alc['CAJA_DOMICILIARIA_4'].append(punto)
-            elif punto[1] == 5:
-                clase_p_alc['SECCION_TRANSVERSAL_5'].append(punto)
+                valores = vacios_prueba.get(regla.prueba)
+            clave = (regla.error, regla.atributo)
+            if regla.guarda is not None:
+                posicion, valores_guarda, dentro = regla.guarda
+                guarda = (posiciones[posicion], catalogo_dominios.conjunto(valores_guarda), dentro)
+                chequeos[nombre].condicionados.append(guarda + (prueba, posiciones[regla.indice], valores) + clave)
+            elif valores is None:
+                getattr(chequeos[nombre], prueba).append((posiciones[regla.indice],) + clave)
             else:
-                error_clase_p_alc.append(punto[63])
-    return clase_p_alc, error_clase_p_alc
-
-# Valida los atributos que SI deberian estar en vacios pero que tienen algun valor (comisiones) - PUNTOS ALCANTARILLADO
-def valida_noBlan_p_alc(clase_p_alc, orig):
-    error_noBlan_p_alc = {'SUBTIPO':[], 'FECHADATO':[], 'TIPO_ALIVIO':[], 'TIPO_VALV_ANT':[], 'ESTADOENRED':[], 'LOCALIZACIONRELATIVA':[],
-                          'C_RASANTE':[], 'C_TERRENO':[], 'C_FONDO':[], 'MATERIAL':[], 'SISTEMA':[], 'NOMBRE':[], 'OBSERV':[],'CONTRATO_ID':[],
-                          'PROFUNDIDA':[],'CONOREDUCC':[],'MATERCONO':[],'TIPO_CONO':[],'EST_CONO':[],'INICIAL_CUENCAS':[],'ROTACION':[],
-                          'CAMARASIF':[],'EST_FISICO':[],'CABEZAL':[],'EST_TAPA':[],'EST_POZO':[],'MATESCALO':[],'ESTESCALON':[],'ESTCARGUE':[],
-                          'ESTCILIND':[],'ESTCANUE':[],'ESTOPERA':[],'CONTINSPE':[],'FECHA_INSP':[],'TIPOINSPEC':[],'TIPOALMAC':[],'COTACRESTA':[],
-                          'C_TECHO_VE':[],'LONGVERT':[],'LARGO':[],'ANCHO':[],'ALTO':[],'Q_BOMBEO':[],'TIPOBOMB':[],'UNIDBOMBEO':[],'HBOMBEO':[],
-                          'COTABOMBE':[],'VOLBOMBEO':[],'DIRECCION':[],'ESTREJILLA':[],'MATREJILLA':[],'TAMREJILLA':[],'ORIGENSEC':[],
-                          'DISTORIGEN':[],'ABSCISA':[]}
-
-    for tip_p in clase_p_alc:
-        for punto in clase_p_alc[tip_p]:
-            
-            if tip_p in ('SECCION_TRANSVERSAL_5'):
-                if punto[2] not in ('', None, 0):
-                    error_noBlan_p_alc['SUBTIPO'].append(punto[63])
-                if punto[6] not in ('', None):
-                    error_noBlan_p_alc['FECHADATO'].append(punto[63])
-                if punto[9] not in ('', None, 0):
-                    error_noBlan_p_alc['ESTADOENRED'].append(punto[63])
-                if punto[11] not in ('', None, 0):
-                    error_noBlan_p_alc['C_RASANTE'].append(punto[63])
-                if punto[14] not in ('', None):
-                    error_noBlan_p_alc['MATERIAL'].append(punto[63])
-                if punto[16] not in ('', None):
-                    error_noBlan_p_alc['SISTEMA'].append(punto[63])
-                if punto[18] is not None and not (isinstance(punto[18], str) and punto[18].strip() == ''):
-                    error_noBlan_p_alc['OBSERV'].append(punto[63])
-                if punto[19] is not None and not (isinstance(punto[19], str) and punto[19].strip() == ''):
-                    error_noBlan_p_alc['CONTRATO_ID'].append(punto[63])
-                if punto[40] not in ('', None):
-                    error_noBlan_p_alc['FECHA_INSP'].append(punto[63])
-                if punto[55] not in ('', None):
-                    error_noBlan_p_alc['DIRECCION'].append(punto[63])
-                
-            
-            if tip_p not in ('ESTRUCTURA_RED_1'):
-                if punto[7] is not None and not (isinstance(punto[7], str) and punto[7].strip() == ''):
-                    error_noBlan_p_alc['TIPO_ALIVIO'].append(punto[63])
-                if punto[8] is not None and not (isinstance(punto[8], str) and punto[8].strip() == ''):
-                    error_noBlan_p_alc['TIPO_VALV_ANT'].append(punto[63])
-                if punto[30] is not None and not (isinstance(punto[30], str) and punto[30].strip() == ''):
-                    error_noBlan_p_alc['CABEZAL'].append(punto[63])
-                if punto[43] not in ('', None, 0):
-                    error_noBlan_p_alc['COTACRESTA'].append(punto[63])
-                if punto[44] not in ('', None, 0):
-                    error_noBlan_p_alc['C_TECHO_VE'].append(punto[63])
-                if punto[45] not in ('', None, 0):
-                    error_noBlan_p_alc['LONGVERT'].append(punto[63])
-                if punto[46] not in ('', None, 0):
-                    error_noBlan_p_alc['LARGO'].append(punto[63])
-                if punto[47] not in ('', None, 0):
-                    error_noBlan_p_alc['ANCHO'].append(punto[63])
-                if punto[48] not in ('', None, 0):
-                    error_noBlan_p_alc['ALTO'].append(punto[63])
-                if punto[49] not in ('', None, 0):
-                    error_noBlan_p_alc['Q_BOMBEO'].append(punto[63])
-                if punto[50] is not None and not (isinstance(punto[50], str) and punto[50].strip() == ''):
-                    error_noBlan_p_alc['TIPOBOMB'].append(punto[63])
-                if punto[51] is not None and not (isinstance(punto[51], str) and punto[51].strip() == ''):
-                    error_noBlan_p_alc['UNIDBOMBEO'].append(punto[63])
-                if punto[52] not in ('', None, 0):
-                    error_noBlan_p_alc['HBOMBEO'].append(punto[63])
-                if punto[53] not in ('', None, 0):
-                    error_noBlan_p_alc['COTABOMBE'].append(punto[63])
-                if punto[54] not in ('', None, 0):
-                    error_noBlan_p_alc['VOLBOMBEO'].append(punto[63])
-
-                    
-            if tip_p in ('POZO_2', 'SECCION_TRANSVERSAL_5'):
-                if punto[10] is not None and not (isinstance(punto[10], str) and punto[10].strip() == ''):
-                    error_noBlan_p_alc['LOCALIZACIONRELATIVA'].append(punto[63])
-                if punto[27] not in ('', None, 0):
-                    error_noBlan_p_alc['ROTACION'].append(punto[63])
-            
-            if tip_p not in ('POZO_2', 'CAJA_DOMICILIARIA_4'):
-                if punto[12] not in ('', None, 0):
-                    error_noBlan_p_alc['C_TERRENO'].append(punto[63])
-                    
-            if tip_p in ('SUMIDERO_3', 'SECCION_TRANSVERSAL_5'):
-                if punto[13] not in ('', None, 0):
-                    error_noBlan_p_alc['C_FONDO'].append(punto[63])
-            
-            if tip_p not in ('ESTRUCTURA_RED_1', 'SECCION_TRANSVERSAL_5'):
-                if punto[17] is not None and not (isinstance(punto[17], str) and punto[17].strip() == ''):
-                    error_noBlan_p_alc['NOMBRE'].append(punto[63])
-            
-            if tip_p not in ('POZO_2'):
-                if punto[21] not in ('', None, 0):
-                    error_noBlan_p_alc['PROFUNDIDA'].append(punto[63])
-                if punto[22] is not None and not (isinstance(punto[22], str) and punto[22].strip() == ''):
-                    error_noBlan_p_alc['CONOREDUCC'].append(punto[63])
-                if punto[23] is not None and not (isinstance(punto[23], str) and punto[23].strip() == ''):
-                    error_noBlan_p_alc['MATERCONO'].append(punto[63])
-                if punto[24] is not None and not (isinstance(punto[24], str) and punto[24].strip() == ''):
-                    error_noBlan_p_alc['TIPO_CONO'].append(punto[63])
-                if punto[25] is not None and not (isinstance(punto[25], str) and punto[25].strip() == ''):
-                    error_noBlan_p_alc['EST_CONO'].append(punto[63])
-                if punto[26] is not None and not (isinstance(punto[26], str) and punto[26].strip() == ''):
-                    error_noBlan_p_alc['INICIAL_CUENCAS'].append(punto[63])
-                if punto[28] is not None and not (isinstance(punto[28], str) and punto[28].strip() == ''):
-                    error_noBlan_p_alc['CAMARASIF'].append(punto[63])
-                if punto[31] is not None and not (isinstance(punto[31], str) and punto[31].strip() == ''):
-                    error_noBlan_p_alc['EST_TAPA'].append(punto[63])
-                if punto[32] is not None and not (isinstance(punto[32], str) and punto[32].strip() == ''):
-                    error_noBlan_p_alc['EST_POZO'].append(punto[63])
-                if punto[33] is not None and not (isinstance(punto[33], str) and punto[33].strip() == ''):
-                    error_noBlan_p_alc['MATESCALO'].append(punto[63])
-                if punto[34] is not None and not (isinstance(punto[34], str) and punto[34].strip() == ''):
-                    error_noBlan_p_alc['ESTESCALON'].append(punto[63])
-                if punto[35] is not None and not (isinstance(punto[35], str) and punto[35].strip() == ''):
-                    error_noBlan_p_alc['ESTCARGUE'].append(punto[63])
-                if punto[36] is not None and not (isinstance(punto[36], str) and punto[36].strip() == ''):
-                    error_noBlan_p_alc['ESTCILIND'].append(punto[63])
-                if punto[37] is not None and not (isinstance(punto[37], str) and punto[37].strip() == ''):
-                    error_noBlan_p_alc['ESTCANUE'].append(punto[63])
-                if punto[42] is not None and not (isinstance(punto[42], str) and punto[42].strip() == ''):
-                    error_noBlan_p_alc['TIPOALMAC'].append(punto[63])
-            
-            if tip_p not in ('ESTRUCTURA_RED_1', 'POZO_2'):
-                if punto[29] is not None and not (isinstance(punto[29], str) and punto[29].strip() == ''):
-                    error_noBlan_p_alc['EST_FISICO'].append(punto[63])
-
-            if tip_p not in ('POZO_2', 'SUMIDERO_3'):
-                if punto[38] is not None and not (isinstance(punto[38], str) and punto[38].strip() == ''):
-                    error_noBlan_p_alc['ESTOPERA'].append(punto[63])
-                if punto[39] is not None and not (isinstance(punto[39], str) and punto[39].strip() == ''):
-                    error_noBlan_p_alc['CONTINSPE'].append(punto[63])
-                if punto[41] is not None and not (isinstance(punto[41], str) and punto[41].strip() == ''):
-                    error_noBlan_p_alc['TIPOINSPEC'].append(punto[63])
-
-            if tip_p not in ('SUMIDERO_3'):
-                if punto[56] is not None and not (isinstance(punto[56], str) and punto[56].strip() == ''):
-                    error_noBlan_p_alc['ESTREJILLA'].append(punto[63])
-                if punto[57] is not None and not (isinstance(punto[57], str) and punto[57].strip() == ''):
-                    error_noBlan_p_alc['MATREJILLA'].append(punto[63])
-                if punto[58] is not None and not (isinstance(punto[58], str) and punto[58].strip() == ''):
-                    error_noBlan_p_alc['TAMREJILLA'].append(punto[63])
-
-            if tip_p not in ('SECCION_TRANSVERSAL_5'):
-                if punto[59] is not None and not (isinstance(punto[59], str) and punto[59].strip() == ''):
-                    error_noBlan_p_alc['ORIGENSEC'].append(punto[63])
-                if punto[61] is not None and not (isinstance(punto[61], str) and punto[61].strip() == ''):
-                    error_noBlan_p_alc['ABSCISA'].append(punto[63])
-                if punto[60] not in ('', None, 0):
-                    error_noBlan_p_alc['DISTORIGEN'].append(punto[63])
-    return error_noBlan_p_alc
-
-# Valida los atributos que NO deberian estar en vacios pero estan si vacios (omisiones) - PUNTOS ALCANTARILLADO
-def valida_blan_p_alc(clase_p_alc):
-    error_blan_p_alc = {'IDENTIFIC':[],'NORTE':[],'ESTE':[], 'FECHADATO':[], 'LOCALIZACIONRELATIVA':[],'C_RASANTE':[],
-                        'C_TERRENO':[],'C_FONDO':[], 'NOMBRE':[], 'CONTRATO_ID':[], 'PROFUNDIDA':[], 'ROTACION':[],
-                        'CONTINSPE':[],'FECHA_INSP':[], 'COTACRESTA':[], 'C_TECHO_VE':[],'LONGVERT':[],'LARGO':[],
-                        'ANCHO':[],'ALTO':[],'Q_BOMBEO':[],'UNIDBOMBEO':[],'HBOMBEO':[],'COTABOMBE':[],'VOLBOMBEO':[],
-                        'DIRECCION':[],'TAMREJILLA':[],'DISTORIGEN':[],'ABSCISA':[]}
-    for tip_p in clase_p_alc:
-        for punto in clase_p_alc[tip_p]:
-            if tip_p not in ('SECCION_TRANSVERSAL_5'):
-                if punto[6] in ('', None):
-                    error_blan_p_alc['FECHADATO'].append(punto[63])
-                if punto[11] in ('', None):
-                    error_blan_p_alc['C_RASANTE'].append(punto[63])
-                if punto[19] is None or (isinstance(punto[19], str) and punto[19].strip() == ''):
-                    error_blan_p_alc['CONTRATO_ID'].append(punto[63])
-                if punto[40] is None or (isinstance(punto[40], str) and punto[40].strip() == ''):
-                    error_blan_p_alc['FECHA_INSP'].append(punto[63])
-                if punto[55] is None or (isinstance(punto[55], str) and punto[55].strip() == ''):
-                    error_blan_p_alc['DIRECCION'].append(punto[63])
-                    
-            if tip_p not in ('POZO_2','SECCION_TRANSVERSAL_5'):
-                if punto[10] is None or (isinstance(punto[10], str) and punto[10].strip() == ''):
-                    error_blan_p_alc['LOCALIZACIONRELATIVA'].append(punto[63])
-                
-            if tip_p in ('POZO_2','CAJA_DOMICILIARIA_4'):
-                if punto[12] in ('', None):
-                    error_blan_p_alc['C_TERRENO'].append(punto[63])
-                    
-            if tip_p not in ('SUMIDERO_3', 'SECCION_TRANSVERSAL_5'):
-                if punto[13] in ('', None):
-                    error_blan_p_alc['C_FONDO'].append(punto[63])
-                    
-            if tip_p in ('SECCION_TRANSVERSAL_5'):
-                if punto[17] is None or (isinstance(punto[17], str) and punto[17].strip() == ''):
-                    error_blan_p_alc['NOMBRE'].append(punto[63])
-                if punto[60] in ('', None):
-                    error_blan_p_alc['DISTORIGEN'].append(punto[63])
-                if punto[61] is None or (isinstance(punto[61], str) and punto[61].strip() == ''):
-                    error_blan_p_alc['ABSCISA'].append(punto[63])
-                    
-            if tip_p in ('POZO_2'):
-                if punto[21] in ('', None):
-                    error_blan_p_alc['PROFUNDIDA'].append(punto[63])
-                    
-            if tip_p in ('ESTRUCTURA_RED_1','SUMIDERO_3'):
-                if punto[27] in ('', None):
-                    error_blan_p_alc['ROTACION'].append(punto[63])
-                    
-            if tip_p in ('POZO_2','SUMIDERO_3'):
-                if punto[39] in ('', None):
-                    error_blan_p_alc['CONTINSPE'].append(punto[63])
-                    
-            if tip_p in ('ESTRUCTURA_RED_1'):
-                if punto[43] in ('', None):
-                    error_blan_p_alc['COTACRESTA'].append(punto[63])
-                if punto[44] in ('', None):
-                    error_blan_p_alc['C_TECHO_VE'].append(punto[63])
-                if punto[45] in ('', None):
-                    error_blan_p_alc['LONGVERT'].append(punto[63])
-                if punto[46] in ('', None):
-                    error_blan_p_alc['LARGO'].append(punto[63])
-                if punto[47] in ('', None):
-                    error_blan_p_alc['ANCHO'].append(punto[63])
-                if punto[48] in ('', None):
-                    error_blan_p_alc['ALTO'].append(punto[63])
-                if punto[49] in ('', None):
-                    error_blan_p_alc['Q_BOMBEO'].append(punto[63])
-                if punto[51] is None or (isinstance(punto[51], str) and punto[51].strip() == ''):
-                    error_blan_p_alc['UNIDBOMBEO'].append(punto[63])
-                if punto[52] in ('', None):
-                    error_blan_p_alc['HBOMBEO'].append(punto[63])
-                if punto[53] in ('', None):
-                    error_blan_p_alc['COTABOMBE'].append(punto[63])
-                if punto[54] in ('', None):
-                    error_blan_p_alc['VOLBOMBEO'].append(punto[63])
-            
-            if tip_p in ('SUMIDERO_3'):
-                if punto[58] in ('', None):
-                    error_blan_p_alc['TAMREJILLA'].append(punto[63])
-            
-            if punto[3] in ('', None):
-                error_blan_p_alc['IDENTIFIC'].append(punto[63])
-            if punto[4] in ('', None, 0):
-                error_blan_p_alc['NORTE'].append(punto[63])
-            if punto[5] in ('', None, 0):
-                error_blan_p_alc['ESTE'].append(punto[63])
-                
-    return error_blan_p_alc
-
-# Valida que los atributos de la capa de puntos Alcantarillado cumplan con los dominios
-def valida_dom_p_alc(clase_p_alc):
-    error_dom_p_alc = {'SUBTIPO':[], 'TIPO_ALIVIO':[], 'TIPO_VALV_ANT':[], 'ESTADOENRED':[], 'MATERIAL':[], 'CALIDADDATO':[],
-                       'SISTEMA':[], 'CONOREDUCC':[], 'MATERCONO':[], 'TIPO_CONO':[], 'EST_CONO':[], 'INICIAL_CUENCAS':[],
-                       'CAMARASIF':[], 'EST_FISICO':[], 'CABEZAL':[], 'EST_TAPA':[], 'EST_POZO':[], 'MATESCALO':[],
-                       'ESTESCALON':[], 'ESTCARGUE':[], 'ESTCILIND':[], 'ESTCANUE':[], 'ESTOPERA':[], 'TIPOINSPEC':[],
-                       'TIPOALMAC':[], 'TIPOBOMB':[], 'ESTREJILLA':[], 'MATREJILLA':[], 'ORIGENSEC':[]}
-    for tip_p in clase_p_alc:
-        for punto in clase_p_alc[tip_p]:
-            if tip_p in ('ESTRUCTURA_RED_1'):
-                if punto[7] not in dominios_p_alc[1]:
-                    error_dom_p_alc['TIPO_ALIVIO'].append(punto[63])
-                if punto[8] not in dominios_p_alc[2]:
-                    error_dom_p_alc['TIPO_VALV_ANT'].append(punto[63])
-                if punto[30] not in dominios_p_alc[14]:
-                    error_dom_p_alc['CABEZAL'].append(punto[63])
-                if punto[50] not in dominios_p_alc[25]:
-                    error_dom_p_alc['TIPOBOMB'].append(punto[63])
-            
-            if tip_p !='SECCION_TRANSVERSAL_5':
-                if punto[2] not in dominios_p_alc[0][tip_p]:
-                    error_dom_p_alc['SUBTIPO'].append(punto[63])
-                if punto[9] not in dominios_p_alc[3]:
-                    error_dom_p_alc['ESTADOENRED'].append(punto[63])
-                if punto[14] not in dominios_p_alc[4]:
-                    error_dom_p_alc['MATERIAL'].append(punto[63])
-                if punto[16] not in dominios_p_alc[6]:
-                    error_dom_p_alc['SISTEMA'].append(punto[63])
-                    
-            if tip_p in ('POZO_2'):
-                if punto[22] not in dominios_p_alc[7]:
-                    error_dom_p_alc['CONOREDUCC'].append(punto[63])
-                if punto[23] not in dominios_p_alc[8]:
-                    error_dom_p_alc['MATERCONO'].append(punto[63])
-                if punto[24] not in dominios_p_alc[9]:
-                    error_dom_p_alc['TIPO_CONO'].append(punto[63])
-                if punto[25] not in dominios_p_alc[10]:
-                    error_dom_p_alc['EST_CONO'].append(punto[63])
-                if punto[26] not in dominios_p_alc[11]:
-                    error_dom_p_alc['INICIAL_CUENCAS'].append(punto[63])
-                if punto[28] not in dominios_p_alc[12]:
-                    error_dom_p_alc['CAMARASIF'].append(punto[63])
-                if punto[31] not in dominios_p_alc[15]:
-                    error_dom_p_alc['EST_TAPA'].append(punto[63])
-                if punto[32] not in dominios_p_alc[16]:
-                    error_dom_p_alc['EST_POZO'].append(punto[63])
-                if punto[33] not in dominios_p_alc[17]:
-                    error_dom_p_alc['MATESCALO'].append(punto[63])
-                if punto[34] not in dominios_p_alc[18]:
-                    error_dom_p_alc['ESTESCALON'].append(punto[63])
-                if punto[35] not in dominios_p_alc[19]:
-                    error_dom_p_alc['ESTCARGUE'].append(punto[63])
-                if punto[36] not in dominios_p_alc[20]:
-                    error_dom_p_alc['ESTCILIND'].append(punto[63])
-                if punto[37] not in dominios_p_alc[21]:
-                    error_dom_p_alc['ESTCANUE'].append(punto[63])
-                if punto[42] not in dominios_p_alc[24]:
-                    error_dom_p_alc['TIPOALMAC'].append(punto[63])
-                
-            if tip_p in ('ESTRUCTURA_RED_1', 'POZO_2'):
-                if punto[29] not in dominios_p_alc[13]:
-                    error_dom_p_alc['EST_FISICO'].append(punto[63])
-                    
-            if tip_p in ('POZO_2', 'SUMIDERO_3'):
-                if punto[38] not in dominios_p_alc[22]:
-                    error_dom_p_alc['ESTOPERA'].append(punto[63])
-                if punto[41] not in dominios_p_alc[23]:
-                    error_dom_p_alc['TIPOINSPEC'].append(punto[63])
-
-            if tip_p in ('SUMIDERO_3'):
-                if punto[56] not in dominios_p_alc[26]:
-                    error_dom_p_alc['ESTREJILLA'].append(punto[63])
-                if punto[57] not in dominios_p_alc[27]:
-                    error_dom_p_alc['MATREJILLA'].append(punto[63])
-            
-            if tip_p in ('SECCION_TRANSVERSAL_5'):
-                if punto[59] not in dominios_p_alc[28]:
-                    error_dom_p_alc['ORIGENSEC'].append(punto[63])
-                    
-            if punto[15] not in dominios_p_alc[5]:
-                error_dom_p_alc['CALIDADDATO'].append(punto[63])
-                
-    return error_dom_p_alc
-    
+                getattr(chequeos[nombre], prueba).append((posiciones[regla.indice], valores) + clave)
+    return chequeos
+
+# Une cada chequeo compilado a la lista de errores de su atributo para una ejecucion
+def enlaza_chequeos(chequeos, errores):
+    return Chequeos(*([c[:-2] + (errores[c[-2]][c[-1]],) for c in lista] for lista in chequeos))
+
+# Aplica a un registro los chequeos enlazados de su clase
+def aplica_chequeos(fila, chequeos, id_fila):
+    presente_texto, vacio_texto, presente, vacio, dominio, condicionados = chequeos
+    normalizados = catalogo_dominios.normalizados
+    for i, lista in presente_texto:
+        if fila[i] is not None and not (isinstance(fila[i], str) and fila[i].strip() == ''):
+            lista.append(id_fila)
+    for i, lista in vacio_texto:
+        if fila[i] is None or (isinstance(fila[i], str) and fila[i].strip() == ''):
+            lista.append(id_fila)
+    for i, vacios, lista in presente:
+        if fila[i] not in vacios:
+            lista.append(id_fila)
+    for i, vacios, lista in vacio:
+        if fila[i] in vacios:
+            lista.append(id_fila)
+    for i, valores, lista in dominio:
+        if normalizados[fila[i]] not in valores:
+            lista.append(id_fila)
+    for posicion, valores_guarda, dentro, prueba, i, valores, lista in condicionados:
+        if (normalizados[fila[posicion]] in valores_guarda) != dentro:
+            continue
+        valor = fila[i]
+        if prueba == 'presente_texto':
+            falla = valor is not None and not (isinstance(valor, str) and valor.strip() == '')
+        elif prueba == 'vacio_texto':
+            falla = valor is None or (isinstance(valor, str) and valor.strip() == '')
+        elif prueba == 'presente':
+            falla = valor not in valores
+        elif prueba == 'vacio':
+            falla = valor in valores
+        else:
+            falla = normalizados[valor] not in valores
+        if falla:
+            lista.append(id_fila)
+
+# ------------------------------------- ALMACEN DE ERRORES -------------------------------------
+# Los OIDs con error de una capa: los de CLASE y los de cada regla (error y atributo) de comisiones ('noBlan'),
+# omisiones ('blan') y dominios ('dom'), cada uno en un array('q') (8 bytes por OID en lugar de un entero de Python
+# en una lista). almacen[error][atributo] es el arreglo de la regla, al que los chequeos enlazados agregan con append,
+# y su largo es el contador de la regla. compacta() pasa a mapa de bits (un bit por OID entre el menor y el mayor)
+# las reglas con errores densos, donde el mapa ocupa menos que el arreglo; asi viajan al proceso principal los errores
+# de las capas validadas en otros procesos. Cada OID aparece una sola vez por regla. vacia() entrega los OIDs
+# pendientes a una salida de errores y solo conserva las cuentas
+tipos_error = ('noBlan', 'blan', 'dom')
+
+class MapaBits:
+    def __init__(self, base, bits, cantidad):
+        self.base = base
+        self.bits = bits
+        self.cantidad = cantidad
+
+    @classmethod
+    def desde(cls, oids):
+        base = min(oids)
+        bits = bytearray((max(oids) - base) // 8 + 1)
+        for oid in oids:
+            bits[(oid - base) >> 3] |= 1 << ((oid - base) & 7)
+        return cls(base, bits, len(oids))
+
+    def __len__(self):
+        return self.cantidad
+
+    def __iter__(self):
+        base = self.base
+        for posicion, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + posicion * 8 + bit
+
+class AlmacenErrores:
+    def __init__(self, reglas):
+        self.clase = array('q')
+        self.grupos = {error: {regla.atributo: array('q') for regla in reglas if regla.error == error}
+                       for error in tipos_error}
+        self.mapas = {}
+        # registros ya entregados a la salida: 'clase' y (error, atributo)
+        self.vaciados = {}
+
+    def __getitem__(self, error):
+        return self.grupos[error]
+
+    # registros con error de la regla (los del arreglo y, si la regla esta compactada, los del mapa)
+    def ids(self, error, atributo):
+        mapa = self.mapas.get((error, atributo))
+        return self.grupos[error][atributo] if mapa is None else chain(self.grupos[error][atributo], mapa)
+
+    # registros con error de la regla o, con error 'clase', de CLASE (los pendientes y los ya vaciados)
+    def cuenta(self, error, atributo=None):
+        if error == 'clase':
+            return len(self.clase) + self.vaciados.get('clase', 0)
+        mapa = self.mapas.get((error, atributo))
+        return (len(self.grupos[error][atributo]) + (len(mapa) if mapa is not None else 0)
+                + self.vaciados.get((error, atributo), 0))
+
+    # registros con error de un tipo ('noBlan', 'blan' o 'dom') o, sin tipo, de todos incluida CLASE
+    def total(self, error=None):
+        if error is None:
+            return self.cuenta('clase') + sum(self.total(error) for error in tipos_error)
+        return sum(self.cuenta(error, atributo) for atributo in self.grupos[error])
+
+    def hay_errores(self):
+        return (len(self.clase) > 0 or any(any(grupo.values()) for grupo in self.grupos.values()) or bool(self.mapas)
+                or bool(self.vaciados))
+
+    # entrega a la salida los OIDs pendientes (CLASE y cada regla) y vacia los arreglos sin cambiarlos, porque los
+    # chequeos enlazados siguen agregando en ellos
+    def vacia(self, salida, capa):
+        if self.clase:
+            salida.escribe(capa, 'clase', 'CLASE', self.clase)
+            self.vaciados['clase'] = self.vaciados.get('clase', 0) + len(self.clase)
+            del self.clase[:]
+        for error in tipos_error:
+            for atributo, oids in self.grupos[error].items():
+                mapa = self.mapas.pop((error, atributo), None)
+                pendientes = len(oids) + (len(mapa) if mapa is not None else 0)
+                if pendientes:
+                    salida.escribe(capa, error, atributo, oids if mapa is None else array('q', chain(oids, mapa)))
+                    self.vaciados[(error, atributo)] = self.vaciados.get((error, atributo), 0) + pendientes
+                    del oids[:]
+
+    # fallas de cada regla ('error atributo': registros con error)
+    def fallas(self):
+        return {f'{error} {atributo}': self.cuenta(error, atributo)
+                for error in tipos_error for atributo in self.grupos[error]}
+
+    def compacta(self):
+        for error, grupo in self.grupos.items():
+            for atributo, oids in grupo.items():
+                # el mapa ocupa un bit por OID del rango, el arreglo 64 bits por OID con error
+                if oids and (error, atributo) not in self.mapas and max(oids) - min(oids) + 1 < len(oids) * 64:
+                    self.mapas[(error, atributo)] = MapaBits.desde(oids)
+                    grupo[atributo] = array('q')
+        return self
+
+# Almacen de errores vacio de una capa, con los atributos de sus reglas
+def errores_capa(reglas):
+    return AlmacenErrores(reglas)
+
+# ------------------------------------- SALIDAS DE ERRORES -------------------------------------
+# Los errores se escriben a medida que se encuentran: el motor python vacia el almacen en la salida cada
+# filas_revision registros (los demas motores al terminar cada capa), asi la memoria no crece con los errores. Las
+# salidas son 'csv' (por defecto, un Inconsistencias_{capa}.csv por capa con errores, escrito con buffer), 'sqlite'
+# (todas las capas en Inconsistencias.sqlite, con indices por capa, tipo y atributo y por registro, para filtrar
+# entregas con millones de errores) y 'nula' (solo cuenta, para las pruebas de rendimiento). En el CSV los errores
+# quedan en el orden en que se vacian, no agrupados por tipo
+salidas_errores = ('csv', 'sqlite', 'nula')
+
+descripciones_error = {'clase': 'Inconsistencia en el Dominio Clase', 'noBlan': 'Comision informacion',
+                       'blan': 'Omision de informacion', 'dom': 'Inconsistencia de Dominio'}
+cabecera_errores = ['Tipo de Error', 'Nombre del atributo', 'ID del Registro']
+
+class SalidaErrores(ABC):
+    def __init__(self, workspace):
+        self.workspace = workspace
+        self.registros = 0
+
+    # escribe los registros `ids` (un array('q')) con error ('clase', 'noBlan', 'blan' o 'dom') en el atributo
+    @abstractmethod
+    def escribe(self, capa, error, atributo, ids):
+        pass
+
+    def cierra(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cierra()
+        return False
+
+class SalidaNula(SalidaErrores):
+    def escribe(self, capa, error, atributo, ids):
+        self.registros += len(ids)
+
+# el archivo de cada capa se abre con la primera escritura y queda abierto hasta cerrar la salida
+class SalidaCSV(SalidaErrores):
+    def __init__(self, workspace):
+        super().__init__(workspace)
+        self.archivos = {}
+        self.escritores = {}
+
+    def escribe(self, capa, error, atributo, ids):
+        escritor = self.escritores.get(capa)
+        if escritor is None:
+            archivo = open(os.path.join(self.workspace, f'Inconsistencias_{capa}.csv'), 'w', newline='',
+                           encoding='utf-8', buffering=2 ** 20)
+            self.archivos[capa] = archivo
+            escritor = self.escritores[capa] = csv.writer(archivo)
+            escritor.writerow(cabecera_errores)
+        descripcion = descripciones_error[error]
+        escritor.writerows((descripcion, atributo, id_registro) for id_registro in ids)
+        self.registros += len(ids)
+
+    def cierra(self):
+        for archivo in self.archivos.values():
+            archivo.close()
+        self.archivos.clear()
+        self.escritores.clear()
+
+# la base se crea al abrir la salida, reemplazando la anterior: una ejecucion sin errores deja la tabla vacia y no los
+# errores de la ejecucion pasada. Los indices se arman al cerrar, despues de la carga
+class SalidaSQLite(SalidaErrores):
+    def __init__(self, workspace):
+        super().__init__(workspace)
+        self.ruta = os.path.join(workspace, 'Inconsistencias.sqlite')
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
+        self.conexion = sqlite3.connect(self.ruta)
+        self.conexion.execute('PRAGMA journal_mode = OFF')
+        self.conexion.execute('PRAGMA synchronous = OFF')
+        self.conexion.execute('CREATE TABLE inconsistencias (capa TEXT, tipo_error TEXT, atributo TEXT, '
+                              'id_registro INTEGER)')
+
+    def escribe(self, capa, error, atributo, ids):
+        descripcion = descripciones_error[error]
+        self.conexion.executemany('INSERT INTO inconsistencias VALUES (?, ?, ?, ?)',
+                                  ((capa, descripcion, atributo, id_registro) for id_registro in ids))
+        self.registros += len(ids)
+
+    def cierra(self):
+        if self.conexion is None:
+            return
+        with closing(self.conexion) as conexion:
+            conexion.execute('CREATE INDEX inconsistencias_tipo ON inconsistencias (capa, tipo_error, atributo)')
+            conexion.execute('CREATE INDEX inconsistencias_registro ON inconsistencias (capa, id_registro)')
+            conexion.commit()
+        self.conexion = None
+
+def abre_salida(salida, workspace):
+    if salida not in salidas_errores:
+        raise ValueError(f'Salida de errores no soportada: {salida}')
+    return {'csv': SalidaCSV, 'sqlite': SalidaSQLite, 'nula': SalidaNula}[salida](workspace)
+
+
+# ------------------------------------- PERFIL DE LA EJECUCION -------------------------------------
+# Cada etapa (esquemas, validacion, reporte y clasificacion por capa, estructura, carga masiva y migracion por capa,
+# indices) registra su tiempo, sus registros y los registros por segundo, y muestra una linea con arcpy.AddMessage.
+# Al terminar, el perfil se escribe como Perfil_Ejecucion.json junto a los Inconsistencias_*.csv. Las validaciones
+# agregan las fallas de cada regla (error y atributo). Con la variable de entorno CARGUE_PERFIL_REGLAS=1 el motor
+# python ademas mide el tiempo de cada regla: cada chequeo se aplica por separado, por eso solo se activa a pedido.
+# El perfilado (parametro de la herramienta o variable de entorno CARGUE_PERFILADO) agrega, a pedido, cProfile de
+# toda la ejecucion en Perfil_Cargue.pstats ('cprofile') y el pico de memoria y los sitios que mas memoria asignaron
+# en cada etapa con tracemalloc ('memoria'); 'completo' activa los dos. Con 'ninguno' (por defecto) no se toca nada.
+# Solo se perfila el proceso principal
+modos_perfilado = ('ninguno', 'cprofile', 'memoria', 'completo')
+sitios_memoria = 5
+
+class PerfilEjecucion:
+    def __init__(self):
+        self.reinicia()
+
+    def reinicia(self, perfilado='ninguno'):
+        if perfilado not in modos_perfilado:
+            raise ValueError(f'Modo de perfilado no soportado: {perfilado}')
+        self.por_regla = os.environ.get('CARGUE_PERFIL_REGLAS', '').lower() in ('1', 'true')
+        self.fecha = datetime.now().isoformat(timespec='seconds')
+        self.inicio = perf_counter()
+        self.etapas = []
+        self.abiertas = []
+        self.perfilador = None
+        self.memoria = perfilado in ('memoria', 'completo') and not tracemalloc.is_tracing()
+        if self.memoria:
+            tracemalloc.start()
+        if perfilado in ('cprofile', 'completo'):
+            self.perfilador = cProfile.Profile()
+            self.perfilador.enable()
+
+    # lleva el pico de memoria desde la ultima lectura a todas las etapas abiertas y empieza a medir otro pico
+    def acumula_pico(self):
+        _, pico = tracemalloc.get_traced_memory()
+        for registro in self.abiertas:
+            registro['memoria_pico_mb'] = max(registro['memoria_pico_mb'], round(pico / 2 ** 20, 2))
+        tracemalloc.reset_peak()
+
+    @staticmethod
+    def foto_memoria():
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    @contextmanager
+    def etapa(self, nombre, capa=None, registros=None):
+        registro = {'etapa': nombre, 'capa': capa, 'inicio': round(perf_counter() - self.inicio, 4),
+                    'registros': registros}
+        if self.memoria:
+            self.acumula_pico()
+            registro['memoria_pico_mb'] = 0
+            foto = self.foto_memoria()
+        self.abiertas.append(registro)
+        inicio = perf_counter()
+        try:
+            yield registro
+        finally:
+            segundos = perf_counter() - inicio
+            if self.memoria:
+                self.acumula_pico()
+                registro['sitios_memoria'] = [
+                    {'sitio': str(diferencia.traceback), 'kb': round(diferencia.size_diff / 1024, 1),
+                     'bloques': diferencia.count_diff}
+                    for diferencia in self.foto_memoria().compare_to(foto, 'lineno')[:sitios_memoria]]
+            self.abiertas.remove(registro)
+            registro['segundos'] = round(segundos, 4)
+            linea = f"Perfil {nombre}{f' {capa}' if capa else ''}: {segundos:.2f} s"
+            # si el trabajo lo hizo otro proceso, la velocidad se mide con el tiempo que reporta ese proceso
+            medidos = registro.get('segundos_proceso', segundos)
+            if 'segundos_proceso' in registro:
+                linea += f" (en el proceso {medidos:.2f} s)"
+            if registro['registros'] is not None:
+                registro['registros_s'] = round(registro['registros'] / max(medidos, 1e-9), 1)
+                linea += f", {registro['registros']} registros, {registro['registros_s']:.0f} registros/s"
+            if self.memoria:
+                linea += f", pico de memoria {registro['memoria_pico_mb']:.1f} MB"
+            self.etapas.append(registro)
+            arcpy.AddMessage(f"{linea}..")
+
+    # agrega a la etapa abierta mas reciente (la de la validacion) un dato de cada regla
+    def reglas(self, valores, dato):
+        if not self.abiertas:
+            return
+        reglas = self.abiertas[-1].setdefault('reglas', {})
+        for clave, valor in valores.items():
+            reglas.setdefault(clave, {})[dato] = valor
+
+    def escribe(self, carpeta):
+        salida = os.path.join(carpeta, 'Perfil_Ejecucion.json')
+        with open(salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'fecha': self.fecha, 'segundos': round(perf_counter() - self.inicio, 4),
+                       'etapas': self.etapas}, archivo, indent=2)
+        return salida
+
+    # detiene el perfilado y escribe el perfil (y el .pstats de cProfile) en la carpeta
+    def termina(self, carpeta):
+        if self.perfilador is not None:
+            self.perfilador.disable()
+            pstats = os.path.join(carpeta, 'Perfil_Cargue.pstats')
+            self.perfilador.dump_stats(pstats)
+            self.perfilador = None
+            arcpy.AddMessage(f"Perfil de cProfile en:{pstats}")
+        if self.memoria:
+            tracemalloc.stop()
+            self.memoria = False
+        arcpy.AddMessage(f"Perfil de la ejecucion en:{self.escribe(carpeta)}")
+
+perfil = PerfilEjecucion()
+
+# ------------------------------------- PROGRESO -------------------------------------
+# Barra de progreso por pasos de ArcGIS (arcpy.SetProgressor) en la lectura, la validacion y la migracion. El total
+# sale de GetCount (o de los OIDs clasificados) antes de leer; en cada ciclo solo se compara el contador de filas con
+# `siguiente` (los ciclos mas livianos leen por bloques de filas_progreso filas y avanzan entre bloques), y la barra
+# se mueve como mucho cada filas_progreso registros y cada milisegundos_progreso ms
+filas_progreso = 5000
+milisegundos_progreso = 500
+
+class Progreso:
+    def __init__(self):
+        self.siguiente = float('inf')
+        self.etiqueta = ''
+        self.total = 0
+        self.ultimo = 0
+
+    def inicia(self, etiqueta, total):
+        # sin arcpy no hay barra: siguiente queda en infinito y los ciclos nunca llaman a avanza
+        if not hay_arcpy:
+            return
+        self.etiqueta = etiqueta
+        self.total = max(int(total or 0), 1)
+        self.ultimo = perf_counter()
+        self.siguiente = filas_progreso
+        arcpy.SetProgressor('step', f'{etiqueta}..', 0, self.total, 1)
+
+    # devuelve el proximo contador en el que el ciclo debe volver a llamar
+    def avanza(self, filas):
+        self.siguiente = filas + filas_progreso
+        ahora = perf_counter()
+        if (ahora - self.ultimo) * 1000 >= milisegundos_progreso:
+            self.ultimo = ahora
+            arcpy.SetProgressorLabel(f'{self.etiqueta} ({filas} de {self.total} registros)..')
+            arcpy.SetProgressorPosition(min(filas, self.total))
+        return self.siguiente
+
+    # entrega las filas en listas de filas_progreso filas y avanza la barra despues de cada lista
+    def bloques(self, filas):
+        filas = iter(filas)
+        leidas = 0
+        while True:
+            bloque = list(islice(filas, filas_progreso))
+            if not bloque:
+                return
+            yield bloque
+            leidas += len(bloque)
+            if leidas >= self.siguiente:
+                self.avanza(leidas)
+
+    def termina(self):
+        if self.siguiente != float('inf'):
+            self.siguiente = float('inf')
+            arcpy.ResetProgressor()
+
+progreso = Progreso()
+
+# Medicion del tiempo de cada regla con el motor python: los chequeos de cada clase se separan en chequeos de uno
+# solo, identificados por la lista de errores a la que estan enlazados
+class MedicionReglas:
+    def __init__(self, chequeos, errores):
+        claves = {id(lista): f'{error} {atributo}' for error, grupo in errores.grupos.items()
+                  for atributo, lista in grupo.items()}
+        self.chequeos = {}
+        for nombre, enlazados in chequeos.items():
+            self.chequeos[nombre] = [(claves[id(chequeo[-1])], Chequeos(*([chequeo] if otra == posicion else []
+                                                                          for otra in range(len(enlazados)))))
+                                     for posicion, lista in enumerate(enlazados) for chequeo in lista]
+        self.tiempos = dict.fromkeys(claves.values(), 0)
+
+    def aplica(self, fila, chequeos, id_fila):
+        tiempos = self.tiempos
+        for clave, unico in chequeos:
+            inicio = perf_counter_ns()
+            aplica_chequeos(fila, unico, id_fila)
+            tiempos[clave] += perf_counter_ns() - inicio
+
+    def segundos(self):
+        return {clave: round(tiempo / 1e9, 6) for clave, tiempo in self.tiempos.items()}
+
 
 # ------------------------------------- VALIDACIONES GENERALES -------------------------------------
 
-# crea el reporte con las inconsistencias encontradas
-def reporte(error_clase, error_noBlan, error_blan, error_dom, capa, workspace):
-
-    salida = os.path.join(workspace, f'Inconsistencias_{capa}.csv')
-    
-    with open(salida, 'w', newline='', encoding='utf-8') as archivo:
-        escritor = csv.writer(archivo)
-        
-        # Escribimos la cabecera
-        escritor.writerow(['Tipo de Error', 'Nombre del atributo', 'ID del Registro'])
-        
-        if not error_clase:
-            pass
-        else:
-            for id_registro in error_clase:
-                escritor.writerow(['Inconsistencia en el Dominio Clase', 'CLASE', id_registro])
-        for atributo, ids in error_noBlan.items():
-            if not ids:
-                pass
-            else:
-                for id_registro in ids:
-                    escritor.writerow(['Comision informacion', atributo, id_registro])
-        for atributo, ids in error_blan.items():
-            if not ids:
-                pass
-            else:
-                for id_registro in ids:
-                    escritor.writerow(['Omision de informacion', atributo, id_registro])
-        for atributo, ids in error_dom.items():
-            if not ids:
-                pass
-            else:
-                for id_registro in ids:
-                    escritor.writerow(['Inconsistencia de Dominio', atributo, id_registro])
-        
 # Muestra los mensajes de advertencia cuando se encuentran errores en la estructura de los datos
-def msg_error_estrc(error_clase, error_noBlan, error_blan, error_dom, nombre):
+def msg_error_estrc(errores, nombre):
     er = 0
 
-    if len(error_clase) > 0 or any(len(error_dom[key])>0 for key in error_dom) or any(len(error_blan[key])>0 for key in error_blan) or any(len(error_noBlan[key])>0 for key in error_noBlan):
+    if errores.hay_errores():
         arcpy.AddWarning(f'---- Se identificaron Errores en la estructura de la capa {nombre} ----')
-        if len(error_clase) > 0:
-            arcpy.AddWarning(f'Se identificaron {len(error_clase)} registros con errores de Dominio en el atributo "CLASE"')
-        if any(len(error_dom[key])>0 for key in error_dom):
-            c = 0
-            for e in error_dom:
-                c = c + len(error_dom[e])
+        if errores.cuenta('clase') > 0:
+            arcpy.AddWarning(f'Se identificaron {errores.cuenta("clase")} registros con errores de Dominio en el atributo "CLASE"')
+        if errores.total('dom') > 0:
+            c = errores.total('dom')
             arcpy.AddWarning(f'Se identificaron {c} registros con errores de Dominio')
-        if any(len(error_blan[key])>0 for key in error_blan):
-            c = 0
-            for e in error_blan:
-                c = c + len(error_blan[e])
+        if errores.total('blan') > 0:
+            c = errores.total('blan')
             arcpy.AddWarning(f'Se identificaron {c} (Omisiones) registros con valores que No deben estar vacios')
-        if any(len(error_noBlan[key])>0 for key in error_noBlan):
-            c = 0
-            for e in error_noBlan:
-                c = c + len(error_noBlan[e])
-        arcpy.AddWarning(f'Se identificaron {c} (Comisiones) registros con valores que Si deben estar vacios')
+        if errores.total('noBlan') > 0:
+            c = errores.total('noBlan')
+            arcpy.AddWarning(f'Se identificaron {c} (Comisiones) registros con valores que Si deben estar vacios')
         er = 1
     else:
         arcpy.AddMessage(f'La Estructura de la capa {nombre} esta Correcta..')
     return er
 
-# Funcion que recoje las validaciones de estructura de los datos
-def validacion_estruct(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace):
-    arcpy.AddMessage("Validando la estructura de los datos..")
-    clase_l = []
-    er_l_acu = 0
-    if l_acu_orig != '':
-        desc_l_acu = arcpy.Describe(l_acu_orig)
-        if desc_l_acu.name.split('.')[-1] != 'shp':
-            arcpy.AddMessage(f'Tipo Origen de datos: GDB')
-            clase_l,error_clase_l = clasif_l_ecu(l_acu_orig, atrib_l_ecu_gdb)
-            orig = 'gdb'
-        else:
-            arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
-            clase_l,error_clase_l = clasif_l_ecu(l_acu_orig, atrib_l_ecu_shp)
-            orig = 'shp'
-        error_noBlan_l = valida_no_blan_l_ecu(clase_l, orig)
-        error_blan_l = valida_blan_l_ecu(clase_l)
-        error_dom_l = valida_dom_l_acu(clase_l)
-        
-        er_l_acu = msg_error_estrc(error_clase_l, error_noBlan_l, error_blan_l, error_dom_l, 'Lineas Acueducto')
-        if er_l_acu == 1:
-            reporte(error_clase_l, error_noBlan_l, error_blan_l, error_dom_l, 'lineasAcueducto', workspace)
-        
-    clase_p_acu = []
-    er_p_acu = 0
-    if p_acu_orig != '':
-        desc_p_acu = arcpy.Describe(p_acu_orig)
-        if desc_p_acu.name.split('.')[-1] != 'shp':
-            arcpy.AddMessage(f'Tipo Origen de datos: GDB')
-            clase_p_acu, error_clase_p_acu = clasif_p_acu(p_acu_orig, atrib_p_acu_gdb)
-            orig = 'gdb'
+# Tipos de capa: nombre de cada clase segun el valor de CLASE, posicion del OID en la fila, campos segun el
+# origen y reglas de validacion. Los chequeos por clase se compilan una sola vez al cargar el modulo
+tipo_l_acu = {'clases': dict(enumerate(lista_clase_l_acu, start=1)),
+              'oid': 27, 'atrib': {'shp': atrib_l_ecu_shp, 'gdb': atrib_l_ecu_gdb},
+              'reglas': reglas_l_acu}
+
+tipo_p_acu = {'clases': dict(enumerate(lista_subtipo_p_acu, start=1)),
+              'oid': 76, 'atrib': {'shp': atrib_p_acu_shp, 'gdb': atrib_p_acu_gdb},
+              'reglas': reglas_p_acu}
+
+tipo_l_alc = {'clases': dict(enumerate(lista_clase_l_alc, start=1)),
+              'oid': 42, 'atrib': {'shp': atrib_l_alc_shp, 'gdb': atrib_l_alc_gdb},
+              'reglas': reglas_l_alc}
+
+tipo_p_alc = {'clases': dict(enumerate(lista_clase_p_alc, start=1)),
+              'oid': 63, 'atrib': {'shp': atrib_p_alc_shp, 'gdb': atrib_p_alc_gdb},
+              'reglas': reglas_p_alc}
+
+tipos_capa = {'l_acu': tipo_l_acu, 'p_acu': tipo_p_acu, 'l_alc': tipo_l_alc, 'p_alc': tipo_p_alc}
+
+# La validacion no lee la geometria: la posicion 0 ('Shape@') se reemplaza por 'OID@' para no construir un objeto
+# Geometry por registro. Solo se leen los campos que usan las reglas, CLASE y el OID; los chequeos se compilan con
+# las posiciones de esos campos en la fila leida. La migracion lee sus propios campos con un segundo cursor
+for tipo in tipos_capa.values():
+    tipo['indices'] = sorted({0, 1, tipo['oid']} | indices_reglas(tipo['reglas']))
+    tipo['posiciones'] = {indice: posicion for posicion, indice in enumerate(tipo['indices'])}
+    tipo['chequeos'] = compila_reglas(tipo['reglas'], tipo['clases'], tipo['posiciones'])
+    tipo['campos'] = {orig: ['OID@' if indice == 0 else atrib[indice] for indice in tipo['indices']]
+                      for orig, atrib in tipo['atrib'].items()}
+
+# Lectura por particiones: cada clase se lee con su propio cursor (CLASE = n) y solo con los campos de sus reglas
+Particion = namedtuple('Particion', ['campos', 'posiciones', 'chequeos'])
+
+def particiona_tipo(tipo):
+    particiones = {}
+    for valor, nombre in tipo['clases'].items():
+        reglas = [regla for regla in tipo['reglas'] if regla.clases is None or nombre in regla.clases]
+        indices = sorted({0, tipo['oid']} | indices_reglas(reglas))
+        posiciones = {indice: posicion for posicion, indice in enumerate(indices)}
+        campos = {orig: ['OID@' if indice == 0 else atrib[indice] for indice in indices]
+                  for orig, atrib in tipo['atrib'].items()}
+        particiones[nombre] = Particion(campos, posiciones, compila_reglas(reglas, {valor: nombre}, posiciones)[nombre])
+    return particiones
+
+for tipo in tipos_capa.values():
+    tipo['particiones'] = particiona_tipo(tipo)
+
+# ----------------------------- Lectura de shapefiles sin arcpy (DBF) -----------------------------
+# La validacion solo lee atributos, y en un .shp los atributos estan en el .dbf. El lector DBF recorre el archivo
+# mapeado en memoria registro a registro y devuelve tuplas con los campos pedidos en el mismo orden que un
+# SearchCursor ('OID@' y 'FID' son el numero de registro). Los valores se convierten como en arcpy: texto sin los
+# espacios finales, numeros sin decimales de hasta 9 digitos a int y el resto a float, fechas a datetime; un numero o
+# una fecha en blanco es None
+lectores = ('arcpy', 'dbf')
+lector_predeterminado = 'arcpy' if hay_arcpy else 'dbf'
+
+CampoDBF = namedtuple('CampoDBF', ['nombre', 'tipo', 'inicio', 'largo', 'decimales'])
+
+# codigos ISO 8859 como los escribe ArcGIS en el .cpg: '88591', 'ISO 88591', '8859_1'
+patron_iso8859 = re.compile(r'^(?:ISO)?[ _-]*8859[ _-]*(\d+)$')
+
+# codificacion del .dbf segun su .cpg; sin .cpg, o con un valor que Python no conoce ('SYSTEM', 'OEM'), latin-1
+def codificacion_dbf(ruta):
+    cpg = os.path.splitext(ruta)[0] + '.cpg'
+    if not os.path.exists(cpg):
+        return 'latin-1'
+    with open(cpg, encoding='ascii', errors='ignore') as archivo:
+        nombre = archivo.read().strip().upper()
+    iso8859 = patron_iso8859.match(nombre)
+    if nombre in ('UTF-8', 'UTF8', '65001'):
+        nombre = 'utf-8'
+    elif iso8859:
+        nombre = f'iso8859_{iso8859.group(1)}'
+    elif nombre.split()[-1:] and nombre.split()[-1].isdigit():
+        nombre = f'cp{nombre.split()[-1]}'
+    try:
+        return codecs.lookup(nombre).name
+    except LookupError:
+        return 'latin-1'
+
+def texto_dbf(codificacion):
+    return lambda crudo: crudo.rstrip(b' \x00').decode(codificacion, 'replace')
+
+def numero_dbf(entero):
+    def convierte(crudo):
+        texto = crudo.strip(b' \x00')
+        if not texto or texto.startswith(b'*'):
+            return None
+        if entero:
+            try:
+                return int(texto)
+            except ValueError:
+                pass
+        return float(texto)
+    return convierte
+
+# las fechas vacias o mal formadas ('20201340', '2020  01') se leen como nulas, igual que arcpy
+def fecha_dbf(crudo):
+    texto = crudo.strip()
+    if not texto.strip(b'0'):
+        return None
+    try:
+        return datetime.strptime(texto.decode('ascii'), '%Y%m%d')
+    except ValueError:
+        return None
+
+def logico_dbf(crudo):
+    if crudo in (b'T', b't', b'Y', b'y'):
+        return True
+    if crudo in (b'F', b'f', b'N', b'n'):
+        return False
+    return None
+
+class LectorDBF:
+    def __init__(self, ruta):
+        self.ruta = os.path.splitext(ruta)[0] + '.dbf'
+        self.codificacion = codificacion_dbf(ruta)
+        with open(self.ruta, 'rb') as archivo:
+            encabezado = archivo.read(32)
+            self.registros, largo_encabezado, self.largo_registro = struct.unpack('<IHH', encabezado[4:12])
+            descriptores = archivo.read(largo_encabezado - 32)
+        self.campos = {}
+        inicio = 1
+        for k in range(0, len(descriptores) - 31, 32):
+            if descriptores[k] == 0x0D:
+                break
+            descriptor = descriptores[k:k + 32]
+            nombre = descriptor[:11].split(b'\x00')[0].decode('latin-1').strip()
+            campo = CampoDBF(nombre, chr(descriptor[11]), inicio, descriptor[16], descriptor[17])
+            self.campos[nombre.upper()] = campo
+            inicio += campo.largo
+        self.inicio_datos = largo_encabezado
+
+    def nombres(self):
+        return [campo.nombre for campo in self.campos.values()]
+
+    def convertidor(self, campo):
+        if campo.tipo in ('N', 'F'):
+            return numero_dbf(campo.tipo == 'N' and campo.decimales == 0 and campo.largo < 10)
+        if campo.tipo == 'D':
+            return fecha_dbf
+        if campo.tipo == 'L':
+            return logico_dbf
+        return texto_dbf(self.codificacion)
+
+    # generador de tuplas con los campos pedidos; los registros borrados ('*') se saltan
+    def filas(self, campos):
+        extractores = []
+        for nombre in campos:
+            campo = self.campos.get(nombre.upper())
+            if campo is None:
+                if nombre.upper() not in ('OID@', 'FID'):
+                    raise ValueError(f'El campo {nombre} no existe en {self.ruta}')
+                extractores.append(None)
+            else:
+                extractores.append((campo.inicio, campo.inicio + campo.largo, self.convertidor(campo)))
+        if self.registros == 0:
+            return
+        with open(self.ruta, 'rb') as archivo, mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            largo = self.largo_registro
+            inicio = self.inicio_datos
+            for numero in range(self.registros):
+                registro = datos[inicio:inicio + largo]
+                inicio += largo
+                if registro[:1] == b'*':
+                    continue
+                yield tuple(numero if extractor is None else extractor[2](registro[extractor[0]:extractor[1]])
+                            for extractor in extractores)
+
+# ----------------------------- Lectura de GeoPackages (sqlite3) -----------------------------
+# Una capa de un GeoPackage se indica como <archivo>.gpkg/<tabla> (o <archivo>.gpkg\main.<tabla>, como en ArcGIS;
+# sin tabla se usa la unica tabla de entidades del archivo) y se lee con sqlite3, sin arcpy. Los campos se buscan
+# sin distinguir mayusculas con los nombres de atrib_*_gdb; 'OID@' (y OBJECTID o FID si no existen como columnas)
+# es la llave primaria de la tabla y 'Shape@' la geometria, que solo se decodifica para la migracion
+patron_gpkg = re.compile(r'^(.*?\.gpkg)(?:[\\/](?:main\.)?(.+))?$', re.IGNORECASE)
+
+def es_geopackage(fuente):
+    return patron_gpkg.match(fuente) is not None
+
+def identificador_sql(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+# Geometria de un blob GPKG: encabezado ('GP', version, banderas, srs_id y envolvente) seguido del WKB
+def geometria_gpkg(blob):
+    if blob is None or blob[:2] != b'GP':
+        return None
+    banderas = blob[3]
+    if banderas & 0x10:
+        return None
+    srs_id = struct.unpack('<i' if banderas & 0x01 else '>i', blob[4:8])[0]
+    envolvente = (0, 32, 48, 48, 64)[(banderas >> 1) & 0x07]
+    wkb = bytearray(blob[8 + envolvente:])
+    if srs_id > 0:
+        return arcpy.FromWKB(wkb, arcpy.SpatialReference(srs_id))
+    return arcpy.FromWKB(wkb)
+
+def fecha_gpkg(valor):
+    if isinstance(valor, str):
+        try:
+            return datetime.fromisoformat(valor.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+    return valor
+
+class LectorGPKG:
+    def __init__(self, fuente):
+        self.archivo, tabla = patron_gpkg.match(fuente).groups()
+        self.conexion = sqlite3.connect(f'file:{self.archivo}?mode=ro', uri=True)
+        if tabla is None:
+            tablas = [nombre for nombre, in self.conexion.execute(
+                "SELECT table_name FROM gpkg_contents WHERE data_type = 'features'")]
+            if len(tablas) != 1:
+                self.conexion.close()
+                raise ValueError(f'Indique la tabla del GeoPackage {self.archivo}: {", ".join(tablas)}')
+            tabla = tablas[0]
+        self.tabla = tabla
+        info = self.conexion.execute(f'PRAGMA table_info({identificador_sql(tabla)})').fetchall()
+        if not info:
+            self.conexion.close()
+            raise ValueError(f'La tabla {tabla} no existe en {self.archivo}')
+        self.columnas = {nombre.upper(): (nombre, (tipo or '').upper()) for _, nombre, tipo, _, _, _ in info}
+        self.llave = next((nombre for _, nombre, _, _, _, pk in info if pk), 'rowid')
+        fila = self.conexion.execute('SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?',
+                                     (tabla,)).fetchone()
+        self.geometria = fila[0] if fila else None
+
+    # columna de la tabla que corresponde a un campo (None si no existe)
+    def columna(self, campo):
+        nombre = campo.upper()
+        if nombre in ('SHAPE@', 'SHAPE'):
+            return self.geometria
+        if nombre in self.columnas:
+            return self.columnas[nombre][0]
+        if nombre in ('OID@', 'OBJECTID', 'FID'):
+            return self.llave
+        return None
+
+    def sql(self, campo):
+        columna = self.columna(campo)
+        if columna is None:
+            raise ValueError(f'El campo {campo} no existe en {self.archivo}/{self.tabla}')
+        return identificador_sql(columna)
+
+    def nombres(self):
+        return [nombre for nombre, _ in self.columnas.values()] + ['OBJECTID', 'Shape']
+
+    # generador de tuplas con los campos pedidos; las fechas (guardadas como texto) se convierten a datetime
+    def filas(self, campos):
+        conversiones = []
+        for campo in campos:
+            if campo.upper() == 'SHAPE@':
+                conversiones.append(geometria_gpkg)
+            elif self.columnas.get(campo.upper(), ('', ''))[1] in ('DATE', 'DATETIME'):
+                conversiones.append(fecha_gpkg)
+            else:
+                conversiones.append(None)
+        consulta = f'SELECT {", ".join(self.sql(campo) for campo in campos)} FROM {identificador_sql(self.tabla)}'
+        try:
+            if not any(conversiones):
+                yield from self.conexion.execute(consulta)
+                return
+            for fila in self.conexion.execute(consulta):
+                yield tuple(valor if conversion is None else conversion(valor)
+                            for conversion, valor in zip(conversiones, fila))
+        finally:
+            self.conexion.close()
+
+def es_shapefile(fuente):
+    return os.path.splitext(fuente)[1].lower() == '.shp'
+
+# Cursor de lectura: las capas de GeoPackage siempre se leen con sqlite3; con el lector 'dbf' los .shp se leen sin
+# arcpy; el resto con SearchCursor
+def abre_lectura(fuente, campos, lector='arcpy'):
+    if es_geopackage(fuente):
+        return closing(LectorGPKG(fuente).filas(campos))
+    if lector == 'dbf' and es_shapefile(fuente):
+        return closing(LectorDBF(fuente).filas(campos))
+    return arcpy.da.SearchCursor(fuente, campos)
+
+def nombres_campos(fuente, lector='arcpy'):
+    if es_geopackage(fuente):
+        lector_gpkg = LectorGPKG(fuente)
+        lector_gpkg.conexion.close()
+        return lector_gpkg.nombres()
+    if lector == 'dbf' and es_shapefile(fuente):
+        return LectorDBF(fuente).nombres() + ['FID', 'Shape']
+    return [campo.name for campo in arcpy.ListFields(fuente)]
+
+# cantidad de registros de una capa (para el perfil de la ejecucion) sin leer sus filas
+def cuenta_registros(fuente, lector='arcpy'):
+    if es_geopackage(fuente):
+        lector_gpkg = LectorGPKG(fuente)
+        with closing(lector_gpkg.conexion) as conexion:
+            return conexion.execute(f'SELECT count(*) FROM {identificador_sql(lector_gpkg.tabla)}').fetchone()[0]
+    if (lector == 'dbf' or not hay_arcpy) and es_shapefile(fuente):
+        return LectorDBF(fuente).registros
+    return int(arcpy.management.GetCount(fuente)[0])
+
+# cada cuantos registros se revisa si ya hay errores para dejar de conservar las filas y se vacian los errores en la
+# salida
+filas_revision = 5000
+
+# Lee la capa como un generador y en una sola pasada clasifica cada registro, valida comisiones, omisiones y
+# dominios y registra los errores. Los OIDs de cada clase solo se conservan si despues habra migracion: con
+# solo_sin_errores se descartan en cuanto aparece el primer error, porque en ese caso la migracion no se realiza.
+# Con una salida de errores, los errores se le entregan cada filas_revision registros
+def valida_capa(fuente, tipo, orig, conservar, solo_sin_errores, lector='arcpy', salida=None, capa=None):
+    clases = tipo['clases']
+    pos_clase = tipo['posiciones'][1]
+    oid = tipo['posiciones'][tipo['oid']]
+    clase = {nombre: [] for nombre in clases.values()}
+    errores = errores_capa(tipo['reglas'])
+    error_clase = errores.clase
+    chequeos = {nombre: enlaza_chequeos(compilados, errores) for nombre, compilados in tipo['chequeos'].items()}
+    aplica = aplica_chequeos
+    medicion = None
+    if perfil.por_regla:
+        medicion = MedicionReglas(chequeos, errores)
+        aplica, chequeos = medicion.aplica, medicion.chequeos
+
+    siguiente = progreso.siguiente
+    revision = filas_revision
+    with abre_lectura(fuente, tipo['campos'][orig], lector) as cursor:
+        for n, fila in enumerate(cursor, start=1):
+            nombre = clases.get(fila[pos_clase])
+            if nombre is None:
+                error_clase.append(fila[oid])
+            else:
+                aplica(fila, chequeos[nombre], fila[oid])
+                if conservar:
+                    clase[nombre].append(fila[0])
+            if n == revision:
+                revision += filas_revision
+                if conservar and solo_sin_errores and errores.hay_errores():
+                    conservar = False
+                    clase = {nombre: [] for nombre in clases.values()}
+                if salida is not None:
+                    errores.vacia(salida, capa)
+            if n >= siguiente:
+                siguiente = progreso.avanza(n)
+
+    if conservar and solo_sin_errores and errores.hay_errores():
+        clase = {nombre: [] for nombre in clases.values()}
+    if medicion is not None:
+        perfil.reglas(medicion.segundos(), 'segundos')
+    return clase, errores
+
+# consulta que selecciona los registros de una clase
+def consulta_clase(fuente, campo_clase, valor):
+    return f'{arcpy.AddFieldDelimiters(fuente, campo_clase)} = {valor}'
+
+# consulta que selecciona los registros con CLASE nula o fuera del dominio
+def consulta_fuera_clases(fuente, campo_clase, clases):
+    campo = arcpy.AddFieldDelimiters(fuente, campo_clase)
+    return f'{campo} IS NULL OR {campo} NOT IN ({", ".join(str(valor) for valor in clases)})'
+
+# consulta que selecciona los registros de varias clases
+def consulta_en_clases(fuente, campo_clase, clases):
+    return f'{arcpy.AddFieldDelimiters(fuente, campo_clase)} IN ({", ".join(str(valor) for valor in clases)})'
+
+# Igual que valida_capa, pero la base de datos filtra los registros: un cursor por valor de CLASE, con solo los
+# campos de las reglas de esa clase, y un cursor para los registros con errores en CLASE. Con una salida de errores,
+# los errores se le entregan al terminar cada clase
+def valida_capa_particiones(fuente, tipo, orig, conservar, solo_sin_errores, salida=None, capa=None):
+    clases = tipo['clases']
+    campo_clase = tipo['atrib'][orig][1]
+    clase = {nombre: [] for nombre in clases.values()}
+    errores = errores_capa(tipo['reglas'])
+
+    consulta = consulta_fuera_clases(fuente, campo_clase, clases)
+    with arcpy.da.SearchCursor(fuente, [tipo['atrib'][orig][tipo['oid']]], consulta) as cursor:
+        errores.clase.extend(fila[0] for fila in cursor)
+
+    for valor, nombre in clases.items():
+        if conservar and solo_sin_errores and errores.hay_errores():
+            conservar = False
+            clase = {nombre: [] for nombre in clases.values()}
+        particion = tipo['particiones'][nombre]
+        chequeos = enlaza_chequeos(particion.chequeos, errores)
+        oid = particion.posiciones[tipo['oid']]
+        oids_clase = clase[nombre]
+        consulta = consulta_clase(fuente, campo_clase, valor)
+        with arcpy.da.SearchCursor(fuente, particion.campos[orig], consulta) as cursor:
+            for fila in cursor:
+                aplica_chequeos(fila, chequeos, fila[oid])
+                if conservar:
+                    oids_clase.append(fila[0])
+        if salida is not None:
+            errores.vacia(salida, capa)
+
+    if conservar and solo_sin_errores and errores.hay_errores():
+        clase = {nombre: [] for nombre in clases.values()}
+    return clase, errores
+
+# ----------------------------- Motor de validacion vectorizado (NumPy) -----------------------------
+# Valor con el que TableToNumPyArray reemplaza los nulos segun el tipo de campo. En los campos de texto el nulo y el
+# texto vacio dan el mismo resultado en todas las pruebas, por eso alli basta con ''
+nulos_numpy = {'String': '', 'GUID': '', 'GlobalID': '', 'SmallInteger': -32768, 'Integer': -2147483648,
+               'BigInteger': -9223372036854775808, 'Single': float('nan'), 'Double': float('nan'),
+               'Date': datetime(1, 1, 1)}
+
+# True donde el registro esta vacio segun la prueba: 'texto' (None o texto en blanco), 'valor' ('' o None) y
+# 'numero' ('', None o 0)
+def mascara_vacio(np, columna, nulo, prueba):
+    if columna.dtype.kind == 'U':
+        if prueba == 'texto':
+            return np.char.strip(columna) == ''
+        return columna == ''
+    if prueba == 'numero' and columna.dtype.kind in 'iuf':
+        return nulo | (columna == 0)
+    return nulo
+
+# True donde el valor normalizado del registro esta en los valores (dominio o condicion). La normalizacion se hace
+# una sola vez por cada valor distinto de la columna
+def mascara_en(np, columna, nulo, valores):
+    distintos, inverso = np.unique(columna, return_inverse=True)
+    conjunto = catalogo_dominios.conjunto(valores)
+    normalizados = catalogo_dominios.normalizados
+    dentro = np.array([normalizados[valor] in conjunto for valor in distintos.tolist()], dtype=bool)
+    return dentro[inverso.reshape(-1)] & ~nulo
+
+# Lee las columnas que usan las reglas con TableToNumPyArray y evalua cada regla como una mascara booleana sobre
+# toda la capa. Devuelve los mismos errores que valida_capa, en el orden de los registros
+def valida_capa_numpy(fuente, tipo, orig):
+    import numpy as np  # solo se necesita con este motor
+
+    clases = tipo['clases']
+    atrib = tipo['atrib'][orig]
+    reglas = tipo['reglas']
+    indices = {1, tipo['oid']}
+    for regla in reglas:
+        indices.add(regla.indice)
+        if regla.guarda:
+            indices.add(regla.guarda[0])
+    campos = [atrib[i] for i in sorted(indices)]
+
+    tipos_campo = {campo.name.upper(): campo.type for campo in arcpy.ListFields(fuente)}
+    nulos = {campo: nulos_numpy[tipos_campo[campo.upper()]] for campo in campos
+             if tipos_campo.get(campo.upper()) in nulos_numpy}
+    tabla = arcpy.da.TableToNumPyArray(fuente, campos, null_value=nulos)
+
+    columnas = {}
+    for i in indices:
+        columna = tabla[atrib[i]]
+        if columna.dtype.kind == 'f':
+            nulo = np.isnan(columna)
+        elif columna.dtype.kind == 'M':
+            nulo = np.isnat(columna) | (columna == np.datetime64(nulos_numpy['Date']))
+        elif columna.dtype.kind in 'iu' and atrib[i] in nulos:
+            nulo = columna == nulos[atrib[i]]
         else:
-            arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
-            clase_p_acu, error_clase_p_acu = clasif_p_acu(p_acu_orig, atrib_p_acu_shp)
-            orig = 'shp'
-        error_noBlan_p_acu = valida_no_blan_p_acu(clase_p_acu, orig)
-        error_blan_p_acu = valida_blan_p_acu(clase_p_acu)
-        error_dom_p_acu = valida_dom_p_acu(clase_p_acu)
-
-        er_p_acu = msg_error_estrc(error_clase_p_acu, error_noBlan_p_acu, error_blan_p_acu, error_dom_p_acu, 'Nodos Acueducto')
-        if er_p_acu == 1:
-            reporte(error_clase_p_acu, error_noBlan_p_acu, error_blan_p_acu, error_dom_p_acu, 'nodosAcueducto', workspace)
-        
-        
-    clase_l_alc = []
-    er_l_alc = 0
-    if l_alc_orig != '':
-        desc_l_alc = arcpy.Describe(l_alc_orig)
-        if desc_l_alc.name.split('.')[-1] != 'shp':
-            arcpy.AddMessage(f'Tipo Origen de datos: GDB')
-            clase_l_alc, error_clase_l_alc = clasif_l_alc(l_alc_orig, atrib_l_alc_gdb)
-            orig = 'gdb'
+            nulo = np.zeros(len(tabla), dtype=bool)
+        columnas[i] = (columna, nulo)
+
+    oids = tabla[atrib[tipo['oid']]]
+    columna_clase, nulo_clase = columnas[1]
+    mascaras_clase = {}
+    for valor, nombre in clases.items():
+        if columna_clase.dtype.kind in 'iuf':
+            mascaras_clase[nombre] = (columna_clase == valor) & ~nulo_clase
         else:
-            arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
-            clase_l_alc, error_clase_l_alc = clasif_l_alc(l_alc_orig, atrib_l_alc_shp)
-            orig = 'shp'
-        error_noBlan_l_alc = valida_noBlan_l_alc(clase_l_alc, orig)
-        error_blan_l_alc = valida_blan_l_alc(clase_l_alc)
-        error_dom_l_alc = valida_dom_l_alc(clase_l_alc)
-        
-        er_l_alc = msg_error_estrc(error_clase_l_alc, error_noBlan_l_alc, error_blan_l_alc, error_dom_l_alc, 'Lineas Alcantarillado')
-        if er_l_alc == 1:
-            reporte(error_clase_l_alc, error_noBlan_l_alc, error_blan_l_alc, error_dom_l_alc, 'lineasAlcantarillado', workspace)
-    
-    clase_p_alc = []
-    er_p_alc = 0
-    if p_alc_orig != '':
-        desc_p_acu = arcpy.Describe(p_alc_orig)
-        if desc_p_acu.name.split('.')[-1] != 'shp':
-            arcpy.AddMessage(f'Tipo Origen de datos: GDB')
-            clase_p_alc, error_clase_p_alc = clasif_p_alc(p_alc_orig, atrib_p_alc_gdb)
-            orig = 'gdb'
+            mascaras_clase[nombre] = np.zeros(len(tabla), dtype=bool)
+    sin_clase = ~np.logical_or.reduce(list(mascaras_clase.values()))
+    errores = errores_capa(reglas)
+    errores.clase.frombytes(oids[sin_clase].astype('q').tobytes())
+    fallas = {}
+    for regla in reglas:
+        columna, nulo = columnas[regla.indice]
+        nombres = regla.clases or tuple(clases.values())
+        if isinstance(regla.dominio, dict):
+            falla = np.zeros(len(tabla), dtype=bool)
+            for nombre in nombres:
+                falla |= mascaras_clase[nombre] & ~mascara_en(np, columna, nulo, regla.dominio[nombre])
         else:
-            arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
-            clase_p_alc, error_clase_p_alc = clasif_p_alc(p_alc_orig, atrib_p_alc_shp)
-            orig = 'shp'
-        error_noBlan_p_alc = valida_noBlan_p_alc(clase_p_alc, orig)
-        error_blan_p_alc = valida_blan_p_alc(clase_p_alc)
-        error_dom_p_alc = valida_dom_p_alc(clase_p_alc)
-
-        er_p_alc = msg_error_estrc(error_clase_p_alc, error_noBlan_p_alc, error_blan_p_alc, error_dom_p_alc, 'Nodos Alcantarillado')
-        if er_p_alc == 1:
-            reporte(error_clase_p_alc, error_noBlan_p_alc, error_blan_p_alc, error_dom_p_alc, 'nodosAlcantarillado', workspace)
-            
-    clase_l_alc_pluv = []
-    er_l_alc_pluv = 0
-    if l_alc_pluv_orig != '':
-        desc_l_alc_pluv = arcpy.Describe(l_alc_pluv_orig)
-        if desc_l_alc_pluv.name.split('.')[-1] != 'shp':
-            arcpy.AddMessage(f'Tipo Origen de datos: GDB')
-            clase_l_alc_pluv, error_clase_l_alc_pluv = clasif_l_alc(l_alc_pluv_orig, atrib_l_alc_gdb)  
-            orig = 'gdb'
+            aplica = np.logical_or.reduce([mascaras_clase[nombre] for nombre in nombres])
+            if regla.error == 'dom':
+                falla = aplica & ~mascara_en(np, columna, nulo, regla.dominio)
+            elif regla.error == 'blan':
+                falla = aplica & mascara_vacio(np, columna, nulo, regla.prueba)
+            else:
+                falla = aplica & ~mascara_vacio(np, columna, nulo, regla.prueba)
+        if regla.guarda:
+            posicion, valores, dentro = regla.guarda
+            columna_guarda, nulo_guarda = columnas[posicion]
+            en_valores = mascara_en(np, columna_guarda, nulo_guarda, valores)
+            falla &= en_valores if dentro else ~en_valores
+        clave = (regla.error, regla.atributo)
+        fallas[clave] = fallas[clave] | falla if clave in fallas else falla
+
+    for (error, atributo), falla in fallas.items():
+        errores[error][atributo].frombytes(oids[falla].astype('q').tobytes())
+    return {nombre: [] for nombre in clases.values()}, errores
+
+# Lee los OIDs de la capa agrupados por clase para la migracion (el motor numpy no los conserva al validar)
+def clasifica_capa(fuente, tipo, orig, lector='arcpy'):
+    clases = tipo['clases']
+    clase = {nombre: [] for nombre in clases.values()}
+    with abre_lectura(fuente, ['OID@', tipo['atrib'][orig][1]], lector) as cursor:
+        for bloque in progreso.bloques(cursor):
+            for oid, valor_clase in bloque:
+                nombre = clases.get(valor_clase)
+                if nombre is not None:
+                    clase[nombre].append(oid)
+    return clase
+
+# ----------------------------- Validacion con consultas SQL -----------------------------
+# Cada regla se traduce a una consulta (clases de la regla AND condicion de error) y se lee con un cursor que solo
+# trae el OID, el campo y el de la condicion. La consulta puede traer de mas (los dominios se comparan normalizados
+# en Python), por eso cada registro devuelto se confirma con la misma prueba del motor python. Las reglas que no se
+# pueden escribir en SQL (texto en blanco en campos de texto, campos de otros tipos) se validan en una sola lectura
+tipos_numericos = ('SmallInteger', 'Integer', 'BigInteger', 'Single', 'Double', 'OID')
+
+def texto_sql(valor):
+    return "'" + valor.replace("'", "''") + "'"
+
+# literales SQL que, comparados exactamente, siempre caen dentro del dominio normalizado
+def literales_dominio(dominio, numerico):
+    literales = set()
+    for valor in dominio:
+        normalizado = catalogo_dominios.normaliza(valor)
+        if numerico:
+            try:
+                numero = float(normalizado)
+            except (TypeError, ValueError):
+                continue
+            if numero == numero and numero not in (float('inf'), float('-inf')):
+                literales.add(normalizado)
         else:
-            arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
-            clase_l_alc_pluv, error_clase_l_alc_pluv = clasif_l_alc(l_alc_pluv_orig, atrib_l_alc_shp)
-            orig = 'shp'
-        error_noBlan_l_alc_pluv = valida_noBlan_l_alc(clase_l_alc_pluv, orig)
-        error_blan_l_alc_pluv = valida_blan_l_alc(clase_l_alc_pluv)
-        error_dom_l_alc_pluv = valida_dom_l_alc(clase_l_alc_pluv)
-        
-        er_l_alc_pluv = msg_error_estrc(error_clase_l_alc_pluv, error_noBlan_l_alc_pluv, error_blan_l_alc_pluv, error_dom_l_alc_pluv, 'Lineas Alcantarillado Pluvial')
-        if er_l_alc_pluv == 1:
-            reporte(error_clase_l_alc_pluv, error_noBlan_l_alc_pluv, error_blan_l_alc_pluv, error_dom_l_alc_pluv, 'lineasAlcantarilladoPluvial', workspace)
-    
-    clase_p_alc_pluv = []
-    er_p_alc_pluv = 0
-    if p_alc_pluv_orig != '':
-        desc_p_alc_pluv = arcpy.Describe(p_alc_pluv_orig)
-        if desc_p_alc_pluv.name.split('.')[-1] != 'shp':
-            arcpy.AddMessage(f'Tipo Origen de datos: GDB')
-            clase_p_alc_pluv, error_clase_p_alc_pluv = clasif_p_alc(p_alc_pluv_orig, atrib_p_alc_gdb)
-            orig = 'gdb'
+            literales.update(texto_sql(candidato) for candidato in (valor, normalizado) if isinstance(candidato, str))
+    return sorted(literales)
+
+# condicion SQL que selecciona (al menos) los registros que fallan el chequeo, o None si no se puede escribir
+def predicado_sql(chequeo, campo, tipo_campo, valores):
+    numerico = tipo_campo in tipos_numericos
+    if not numerico and tipo_campo != 'String':
+        return None
+    if chequeo == 'dominio':
+        literales = literales_dominio(valores, numerico)
+        if not literales:
+            return f'{campo} IS NULL OR {campo} IS NOT NULL'
+        return f'{campo} IS NULL OR {campo} NOT IN ({", ".join(literales)})'
+    if chequeo == 'vacio_texto':
+        return f'{campo} IS NULL' if numerico else None
+    if chequeo == 'presente_texto':
+        return f'{campo} IS NOT NULL' if numerico else f"{campo} IS NOT NULL AND {campo} <> ''"
+    if chequeo == 'vacio':
+        if not numerico:
+            return f"{campo} IS NULL OR {campo} = ''"
+        return f'{campo} IS NULL OR {campo} = 0' if 0 in valores else f'{campo} IS NULL'
+    # presente
+    if not numerico:
+        return f"{campo} IS NOT NULL AND {campo} <> ''"
+    return f'{campo} IS NOT NULL AND {campo} <> 0' if 0 in valores else f'{campo} IS NOT NULL'
+
+# misma prueba que aplica_chequeos para un solo valor
+def falla_chequeo(chequeo, valor, valores):
+    if chequeo == 'dominio':
+        return catalogo_dominios.normaliza(valor) not in valores
+    if chequeo == 'vacio':
+        return valor in valores
+    if chequeo == 'presente':
+        return valor not in valores
+    vacio = valor is None or (isinstance(valor, str) and valor.strip() == '')
+    return vacio if chequeo == 'vacio_texto' else not vacio
+
+def valida_capa_sql(fuente, tipo, orig):
+    clases = tipo['clases']
+    atrib = tipo['atrib'][orig]
+    campo_oid = atrib[tipo['oid']]
+    tipos_campo = {campo.name: campo.type for campo in arcpy.ListFields(fuente)}
+    valor_clase = {nombre: valor for valor, nombre in clases.items()}
+    errores = errores_capa(tipo['reglas'])
+
+    with arcpy.da.SearchCursor(fuente, [campo_oid], consulta_fuera_clases(fuente, atrib[1], clases)) as cursor:
+        errores.clase.extend(fila[0] for fila in cursor)
+
+    residuales = []
+    for regla in tipo['reglas']:
+        chequeo = tipo_chequeo(regla)
+        campo = atrib[regla.indice]
+        delimitado = arcpy.AddFieldDelimiters(fuente, campo)
+        nombres = regla.clases or tuple(clases.values())
+        if isinstance(regla.dominio, dict):
+            grupos = [((nombre,), catalogo_dominios.conjunto(regla.dominio[nombre])) for nombre in nombres]
+        elif regla.dominio is not None:
+            grupos = [(nombres, catalogo_dominios.conjunto(regla.dominio))]
         else:
-            arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
-            clase_p_alc_pluv, error_clase_p_alc_pluv = clasif_p_alc(p_alc_pluv_orig, atrib_p_alc_shp)
-            orig = 'shp'
-        error_noBlan_p_alc_pluv = valida_noBlan_p_alc(clase_p_alc_pluv, orig)
-        error_blan_p_alc_pluv = valida_blan_p_alc(clase_p_alc_pluv)
-        error_dom_p_alc_pluv = valida_dom_p_alc(clase_p_alc_pluv)
-        
-        er_p_alc_pluv = msg_error_estrc(error_clase_p_alc_pluv, error_noBlan_p_alc_pluv, error_blan_p_alc_pluv, error_dom_p_alc_pluv, 'Nodos Alcantarillado Pluvial')
-        if er_p_alc_pluv == 1:
-            reporte(error_clase_p_alc_pluv, error_noBlan_p_alc_pluv, error_blan_p_alc_pluv, error_dom_p_alc_pluv, 'nodosAlcantarilladoPluvial', workspace)
-        
-        
+            grupos = [(nombres, vacios_prueba.get(regla.prueba))]
+        if predicado_sql(chequeo, delimitado, tipos_campo.get(campo), grupos[0][1]) is None:
+            residuales.append(regla)
+            continue
+
+        campos = [campo_oid, campo]
+        if regla.guarda is not None:
+            posicion, valores_guarda, dentro = regla.guarda
+            valores_guarda = catalogo_dominios.conjunto(valores_guarda)
+            campos.append(atrib[posicion])
+        lista = errores[regla.error][regla.atributo]
+        for nombres_grupo, valores in grupos:
+            predicado = predicado_sql(chequeo, delimitado, tipos_campo.get(campo), valores)
+            consulta_clases = consulta_en_clases(fuente, atrib[1], [valor_clase[nombre] for nombre in nombres_grupo])
+            with arcpy.da.SearchCursor(fuente, campos, f'{consulta_clases} AND ({predicado})') as cursor:
+                for fila in cursor:
+                    if regla.guarda is not None and (catalogo_dominios.normaliza(fila[2]) in valores_guarda) != dentro:
+                        continue
+                    if falla_chequeo(chequeo, fila[1], valores):
+                        lista.append(fila[0])
+
+    if residuales:
+        indices = sorted({1, tipo['oid']} | indices_reglas(residuales))
+        posiciones = {indice: posicion for posicion, indice in enumerate(indices)}
+        chequeos = {nombre: enlaza_chequeos(compilados, errores)
+                    for nombre, compilados in compila_reglas(residuales, clases, posiciones).items()}
+        pos_clase, oid = posiciones[1], posiciones[tipo['oid']]
+        with arcpy.da.SearchCursor(fuente, [atrib[indice] for indice in indices]) as cursor:
+            for fila in cursor:
+                nombre = clases.get(fila[pos_clase])
+                if nombre is not None:
+                    aplica_chequeos(fila, chequeos[nombre], fila[oid])
+
+    return {nombre: [] for nombre in clases.values()}, errores
+
+# ----------------------------- Validacion de GeoPackages dentro de SQLite -----------------------------
+# Las capas de GeoPackage se validan con SQL dentro de SQLite. En SQLite una columna puede guardar valores de
+# cualquier tipo, por eso las condiciones no dependen del tipo declarado: cubren a la vez textos y numeros y, como en
+# el motor sql, cada registro que traen se confirma en Python. Una sola lectura de la tabla cuenta con SUM los
+# registros de cada regla; solo se consultan los OIDs de las reglas con algun registro
+# los mismos caracteres que quita str.strip()
+blancos_sql = f"char({', '.join(str(ord(caracter)) for caracter in map(chr, range(0x3001)) if caracter.isspace())})"
+
+def predicado_sqlite(chequeo, campo, valores):
+    if chequeo == 'dominio':
+        literales = literales_dominio(valores, True) + literales_dominio(valores, False)
+        if not literales:
+            return f'{campo} IS NULL OR {campo} IS NOT NULL'
+        return f'{campo} IS NULL OR {campo} NOT IN ({", ".join(literales)})'
+    if chequeo == 'vacio_texto':
+        return f"{campo} IS NULL OR trim({campo}, {blancos_sql}) = ''"
+    if chequeo == 'presente_texto':
+        return f"{campo} IS NOT NULL AND trim({campo}, {blancos_sql}) <> ''"
+    cero = 0 in valores
+    if chequeo == 'vacio':
+        return f"{campo} IS NULL OR {campo} = ''" + (f' OR {campo} = 0' if cero else '')
+    # presente: el texto '0' no es el numero 0
+    if cero:
+        return f"{campo} IS NOT NULL AND {campo} <> '' AND ({campo} <> 0 OR typeof({campo}) = 'text')"
+    return f"{campo} IS NOT NULL AND {campo} <> ''"
+
+# CLASE dentro de las clases: solo numeros, igual que la busqueda en el diccionario de clases
+def en_clases_sqlite(campo, valores):
+    return f"typeof({campo}) IN ('integer', 'real') AND {campo} IN ({', '.join(str(valor) for valor in valores)})"
+
+def valida_capa_gpkg(fuente, tipo):
+    clases = tipo['clases']
+    atrib = tipo['atrib']['gdb']
+    valor_clase = {nombre: valor for valor, nombre in clases.items()}
+    errores = errores_capa(tipo['reglas'])
+    lector = LectorGPKG(fuente)
+    try:
+        tabla = identificador_sql(lector.tabla)
+        campo_clase = lector.sql(atrib[1])
+        campo_oid = lector.sql(atrib[tipo['oid']])
+        errores.clase.extend(oid for oid, in lector.conexion.execute(
+            f'SELECT {campo_oid} FROM {tabla} WHERE NOT ({en_clases_sqlite(campo_clase, clases)})'))
+
+        consultas = []
+        for regla in tipo['reglas']:
+            chequeo = tipo_chequeo(regla)
+            campo = lector.sql(atrib[regla.indice])
+            nombres = regla.clases or tuple(clases.values())
+            if isinstance(regla.dominio, dict):
+                grupos = [((nombre,), catalogo_dominios.conjunto(regla.dominio[nombre])) for nombre in nombres]
+            elif regla.dominio is not None:
+                grupos = [(nombres, catalogo_dominios.conjunto(regla.dominio))]
+            else:
+                grupos = [(nombres, vacios_prueba.get(regla.prueba))]
+            for nombres_grupo, valores in grupos:
+                en_clases = en_clases_sqlite(campo_clase, [valor_clase[nombre] for nombre in nombres_grupo])
+                consultas.append((regla, chequeo, campo, valores,
+                                  f'{en_clases} AND ({predicado_sqlite(chequeo, campo, valores)})'))
+        if not consultas:
+            return {nombre: [] for nombre in clases.values()}, errores
+
+        # una sola lectura cuenta los registros que trae cada consulta
+        cuentas = lector.conexion.execute(
+            f'SELECT {", ".join(f"SUM(({condicion}) IS 1)" for *_, condicion in consultas)} FROM {tabla}').fetchone()
+        for (regla, chequeo, campo, valores, condicion), cuenta in zip(consultas, cuentas):
+            if not cuenta:
+                continue
+            campos = [campo_oid, campo]
+            if regla.guarda is not None:
+                posicion, valores_guarda, dentro = regla.guarda
+                valores_guarda = catalogo_dominios.conjunto(valores_guarda)
+                campos.append(lector.sql(atrib[posicion]))
+            lista = errores[regla.error][regla.atributo]
+            for fila in lector.conexion.execute(f'SELECT {", ".join(campos)} FROM {tabla} WHERE {condicion}'):
+                if regla.guarda is not None and (catalogo_dominios.normaliza(fila[2]) in valores_guarda) != dentro:
+                    continue
+                if falla_chequeo(chequeo, fila[1], valores):
+                    lista.append(fila[0])
+    finally:
+        lector.conexion.close()
+
+    return {nombre: [] for nombre in clases.values()}, errores
+
+# motores de validacion disponibles: 'python' valida registro a registro, 'numpy' valida por columnas,
+# 'particiones' valida registro a registro con un cursor por clase (la migracion tambien lee por clase) y 'sql'
+# valida cada regla con una consulta
+motores_validacion = ('python', 'numpy', 'particiones', 'sql')
+
+# ----------------------------- Validacion en paralelo de las capas -----------------------------
+# Cada proceso abre su propio cursor, valida una capa y devuelve solo su almacen de errores compactado. Los reportes
+# CSV y los mensajes quedan a cargo del proceso principal
+# devuelve los errores compactados y los segundos que tomo la validacion dentro del proceso
+def valida_capa_proceso(fuente, clave_tipo, orig, motor, lector='arcpy'):
+    inicio = perf_counter()
+    tipo = tipos_capa[clave_tipo]
+    if es_geopackage(fuente):
+        _, errores = valida_capa_gpkg(fuente, tipo)
+    elif motor == 'numpy':
+        _, errores = valida_capa_numpy(fuente, tipo, orig)
+    elif motor == 'particiones':
+        _, errores = valida_capa_particiones(fuente, tipo, orig, False, False)
+    elif motor == 'sql':
+        _, errores = valida_capa_sql(fuente, tipo, orig)
+    else:
+        _, errores = valida_capa(fuente, tipo, orig, False, False, lector)
+    return errores.compacta(), perf_counter() - inicio
+
+def pool_procesos(procesos):
+    # dentro de ArcGIS Pro sys.executable es ArcGISPro.exe: los procesos deben lanzarse con el python del entorno
+    if sys.platform == 'win32':
+        multiprocessing.set_executable(os.path.join(sys.exec_prefix, 'python.exe'))
+    return multiprocessing.Pool(procesos)
+
+def origen_datos(fuente):
+    # los GeoPackages usan los nombres de campo de la gdb
+    if es_geopackage(fuente):
+        return 'gdb'
+    if not hay_arcpy:
+        return 'shp' if es_shapefile(fuente) else 'gdb'
+    desc = arcpy.Describe(fuente)
+    return 'gdb' if desc.name.split('.')[-1] != 'shp' else 'shp'
+
+# Funcion que recoje las validaciones de estructura de los datos
+def validacion_estruct(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace,
+                       migr_adver='true', motor='python', procesos=0, lector=lector_predeterminado, salida='csv'):
+    if motor not in motores_validacion:
+        raise ValueError(f'Motor de validacion no soportado: {motor}')
+    if lector not in lectores:
+        raise ValueError(f'Lector de datos no soportado: {lector}')
+    if lector == 'dbf' and motor != 'python':
+        # los otros motores filtran con consultas SQL o leen con TableToNumPyArray
+        raise ValueError('El lector dbf solo funciona con el motor python')
+    arcpy.AddMessage("Validando la estructura de los datos..")
+    capas = [(l_acu_orig, 'l_acu', 'Lineas Acueducto', 'lineasAcueducto'),
+             (p_acu_orig, 'p_acu', 'Nodos Acueducto', 'nodosAcueducto'),
+             (l_alc_orig, 'l_alc', 'Lineas Alcantarillado', 'lineasAlcantarillado'),
+             (p_alc_orig, 'p_alc', 'Nodos Alcantarillado', 'nodosAlcantarillado'),
+             (l_alc_pluv_orig, 'l_alc', 'Lineas Alcantarillado Pluvial', 'lineasAlcantarilladoPluvial'),
+             (p_alc_pluv_orig, 'p_alc', 'Nodos Alcantarillado Pluvial', 'nodosAlcantarilladoPluvial')]
+    origenes = [origen_datos(fuente) if fuente != '' else None for fuente, _, _, _ in capas]
+
+    salida_errores = abre_salida(salida, workspace)
+    # con procesos > 1 las capas se validan en paralelo; aqui solo se recogen los errores en el orden de las capas
+    tareas = {}
+    pool = None
+    con_datos = [posicion for posicion, (fuente, _, _, _) in enumerate(capas) if fuente != '']
+    if procesos > 1 and len(con_datos) > 1:
+        pool = pool_procesos(min(procesos, len(con_datos)))
+        for posicion in con_datos:
+            fuente, clave_tipo, _, _ = capas[posicion]
+            tareas[posicion] = pool.apply_async(valida_capa_proceso,
+                                                (fuente, clave_tipo, origenes[posicion], motor, lector))
+        pool.close()
+
+    # si la migracion no es forzada solo se realiza cuando ninguna capa tiene errores
+    solo_sin_errores = migr_adver != 'true'
+    conservar = True
+    resultado = []
+    por_clasificar = []
+    registros = {}
+    try:
+        for posicion, (fuente, clave_tipo, nombre, capa) in enumerate(capas):
+            tipo = tipos_capa[clave_tipo]
+            orig = origenes[posicion]
+            clase = []
+            er = 0
+            if fuente != '':
+                if orig == 'gdb':
+                    arcpy.AddMessage(f'Tipo Origen de datos: GDB')
+                else:
+                    arcpy.AddMessage(f'Tipo Origen de datos: .SHP')
+                registros[posicion] = cuenta_registros(fuente, lector)
+                progreso.inicia(f'Validando {nombre}', registros[posicion])
+                with perfil.etapa('validacion', capa, registros[posicion]) as etapa:
+                    if posicion in tareas:
+                        errores, etapa['segundos_proceso'] = tareas[posicion].get()
+                        por_clasificar.append((posicion, fuente, tipo, orig))
+                    elif es_geopackage(fuente):
+                        # las capas de GeoPackage se validan dentro de SQLite con cualquier motor
+                        clase, errores = valida_capa_gpkg(fuente, tipo)
+                        por_clasificar.append((posicion, fuente, tipo, orig))
+                    elif motor == 'numpy':
+                        clase, errores = valida_capa_numpy(fuente, tipo, orig)
+                        por_clasificar.append((posicion, fuente, tipo, orig))
+                    elif motor == 'particiones':
+                        clase, errores = valida_capa_particiones(fuente, tipo, orig, conservar, solo_sin_errores,
+                                                                 salida_errores, capa)
+                    elif motor == 'sql':
+                        clase, errores = valida_capa_sql(fuente, tipo, orig)
+                        por_clasificar.append((posicion, fuente, tipo, orig))
+                    else:
+                        clase, errores = valida_capa(fuente, tipo, orig, conservar, solo_sin_errores, lector,
+                                                     salida_errores, capa)
+                    etapa['errores_clase'] = errores.cuenta('clase')
+                    perfil.reglas(errores.fallas(), 'fallas')
+
+                er = msg_error_estrc(errores, nombre)
+                if er == 1:
+                    # los errores que quedan en el almacen
+                    with perfil.etapa('reporte', capa, errores.total()):
+                        errores.vacia(salida_errores, capa)
+                    if solo_sin_errores and conservar:
+                        # ya no habra migracion: se liberan las filas conservadas de las capas anteriores
+                        conservar = False
+                        resultado = [([], er_capa) for clase_capa, er_capa in resultado]
+            resultado.append((clase, er))
+    finally:
+        progreso.termina()
+        salida_errores.cierra()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    # con los motores numpy y sql o en paralelo las filas para la migracion se leen al final, solo si la migracion se
+    # va a realizar
+    if conservar:
+        try:
+            for posicion, fuente, tipo, orig in por_clasificar:
+                progreso.inicia(f'Clasificando {capas[posicion][2]}', registros[posicion])
+                with perfil.etapa('clasificacion', capas[posicion][3], registros[posicion]):
+                    resultado[posicion] = (clasifica_capa(fuente, tipo, orig, lector), resultado[posicion][1])
+        finally:
+            progreso.termina()
+
     # OJO AGREGAR CLASE y ERROR
-    return clase_l, er_l_acu, clase_p_acu, er_p_acu, clase_l_alc, er_l_alc, clase_p_alc, er_p_alc, clase_l_alc_pluv, er_l_alc_pluv, clase_p_alc_pluv, er_p_alc_pluv
+    return tuple(valor for clase_er in resultado for valor in clase_er)
 
 
 # ------------------------------- CREANDO LA ESTRUCTURA DE LA BASE DE DATOS -------------------------------
+# La GDB vacia se construye desde el XML una sola vez por cada version del XML (hash de su contenido) y se guarda
+# como plantilla en un directorio de cache local; en las siguientes ejecuciones se copia la carpeta de la plantilla.
+# Si el XML cambia, su hash cambia y la plantilla se vuelve a construir
+def directorio_cache():
+    base = os.environ.get('CARGUE_CACHE')
+    if not base:
+        base = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache'),
+                            'Cargue_Acueducto')
+    return base
+
+def hash_archivo(ruta):
+    resumen = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+def crea_gdb_xml(carpeta, xml_path):
+    arcpy.management.CreateFileGDB(carpeta, 'GDB_Cargue.gdb', '10.0')
+    arcpy.management.ImportXMLWorkspaceDocument(os.path.join(carpeta, 'GDB_Cargue.gdb'), xml_path, 'SCHEMA_ONLY')
+
+# ruta de la plantilla para el XML; si no existe, se construye en una carpeta temporal y se mueve a su lugar al final
+# para que otra ejecucion nunca copie una plantilla a medio construir
+def plantilla_gdb(xml_path):
+    carpeta = os.path.join(directorio_cache(), hash_archivo(xml_path)[:16])
+    plantilla = os.path.join(carpeta, 'GDB_Cargue.gdb')
+    if not os.path.isdir(plantilla):
+        os.makedirs(directorio_cache(), exist_ok=True)
+        temporal = tempfile.mkdtemp(prefix='plantilla_', dir=directorio_cache())
+        try:
+            crea_gdb_xml(temporal, xml_path)
+            os.replace(temporal, carpeta)
+            arcpy.AddMessage(f"Plantilla de la GDB guardada en:{carpeta}")
+        except OSError:
+            # otra ejecucion ya dejo la plantilla
+            if not os.path.isdir(plantilla):
+                raise
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+    return plantilla
+
 def estruc_vacia_bd(workspace):
     salida_estr = os.path.join(workspace, 'GDB_Cargue.gdb')
     script_dir = os.path.dirname(os.path.abspath(__file__))
     xml_path = os.path.join(script_dir, 'Obra_Vacias_Planas.xml')
     arcpy.AddMessage(f"La ruta del xml es:{xml_path}")
-    arcpy.management.CreateFileGDB(workspace, 'GDB_Cargue.gdb', '10.0')
-    arcpy.management.ImportXMLWorkspaceDocument(salida_estr, xml_path, 'SCHEMA_ONLY')
+    with perfil.etapa('estructura'):
+        # la GDB anterior se borra con Delete, que revisa los bloqueos: si esta abierta (por ejemplo en ArcGIS Pro)
+        # falla sin borrar nada, en lugar de dejarla a medio borrar
+        if arcpy.Exists(salida_estr):
+            arcpy.management.Delete(salida_estr)
+        try:
+            plantilla = plantilla_gdb(xml_path)
+            shutil.copytree(plantilla, salida_estr, ignore=shutil.ignore_patterns('*.lock'))
+        except (OSError, arcpy.ExecuteError) as error:
+            arcpy.AddWarning(f"No se pudo usar la plantilla de la GDB ({error}), se construye desde el xml..")
+            # solo queda lo que alcanzo a copiar esta ejecucion
+            shutil.rmtree(salida_estr, ignore_errors=True)
+            crea_gdb_xml(workspace, xml_path)
 
     return salida_estr
 
 
 # ------------------------------------- MIGRACIONES DE INFORMACION -------------------------------------
-# Migra la informacion de las LINEAS ACUEDUCTO
-def migra_l_acu(clase_l, workspace):
-    for red in clase_l:
-        for line in clase_l[red]:
-            if red == 'redMatriz_1':
-                redmatriz = os.path.join(workspace, 'acd_RedMatriz')
-                campos = ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
-                          'DOMCALIDADDATO', 'OBSERVACIONES','DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'LONGITUD_M',
-                          'DOMCOSTADO', 'PROFUNDIDAD']
-                with arcpy.da.InsertCursor(redmatriz, campos) as Incursor:
-                    reg = [line[0], line[2], line[7], line[8], line[6], line[5], line[9], line[11], line[12], line[13],
-                           line[25], line[16], line[23]]
-                    Incursor.insertRow(reg)
-            elif red == 'aduccion_2':
-                conduccion = os.path.join(workspace, 'acd_Conduccion')
-                campos = ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
-                          'DOMCALIDADDATO', 'OBSERVACIONES','DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'LONGITUD_M',
-                          'T_SECCION', 'AREA_TR_M2', 'C_RASANTEI', 'C_RASANTEF', 'C_CLAVEI', 'C_CLAVEF']
-                with arcpy.da.InsertCursor(conduccion, campos) as Incursor:
-                    reg = [line[0], line[2], line[7], line[8], line[6], line[5], line[9], line[11], line[12], line[13],
-                           line[25], line[17], line[18], line[19], line[20], line[21], line[22]]
-                    Incursor.insertRow(reg)
-            elif red == 'conduccion_3':
-                conduccion = os.path.join(workspace, 'acd_Conduccion')
-                campos = ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
-                          'DOMCALIDADDATO', 'OBSERVACIONES','DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'LONGITUD_M',
-                          'T_SECCION', 'AREA_TR_M2', 'C_RASANTEI', 'C_RASANTEF', 'C_CLAVEI', 'C_CLAVEF']
-                with arcpy.da.InsertCursor(conduccion, campos) as Incursor:
-                    reg = [line[0], line[2], line[7], line[8], line[6], line[5], line[9], line[11], line[12], line[13],
-                           line[25], line[17], line[18], line[19], line[20], line[21], line[22]]
-                    Incursor.insertRow(reg)
-            elif red == 'redMenor_4':
-                redMenor = os.path.join(workspace, 'acd_RedMenor')
-                campos = ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
-                            'DOMCALIDADDATO', 'OBSERVACIONES','DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'DOMESTADOLEGAL',
-                            'DOMCOSTADO', 'LONGITUD_M', 'PROFUNDIDAD']
-                with arcpy.da.InsertCursor(redMenor, campos) as Incursor:
-                    reg = (line[0], line[2], line[7], line[8], line[6], line[5], line[9], line[11], line[12], line[13],
-                            line[10], line[16], line[25], line[23])
-                    Incursor.insertRow(reg)
-            elif red == 'lineaLat_5':
-                linLat = os.path.join(workspace, 'acd_LineaLateral')
-                campos = ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
-                            'DOMCALIDADDATO', 'OBSERVACIONES','DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'DOMESTADOLEGAL',
-                            'PROFUNDIDAD', 'RUGOSIDAD', 'LONGITUD_M']
-                with arcpy.da.InsertCursor(linLat, campos) as Incursor:
-                    reg = (line[0], line[2], line[7], line[8], line[6], line[5], line[9], line[11], line[12],line[13],
-                            line[10], line[23], line[24], line[25])
-                    Incursor.insertRow(reg)
-
-# Migra la informacion de los PUNTOS ACUEDUCTO
-def migra_p_acu(clase_p_acu, workspace):
-    for tipo_nod in clase_p_acu:
-        for punto in clase_p_acu[tipo_nod]:
-            if tipo_nod == 'VALVULASISTEMA_1':
-                valv_sis = os.path.join(workspace, 'acd_ValvulaSistema')
-                campos = ['Shape@', 'SUBTIPO','DOMESTADOENRED', 'LOCALIZACIONRELATIVA','DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES','CONTRATO_ID','DOMTIPOESPPUBLICO','DOMMATESPPUBLICO',
-                          'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'DOMAUTOMATIZADA', 'DOMSENTIDOOPERACION', 'COTARASANTE',
-                          'PROFUNDIDAD', 'DOMESTADOOPERACION', 'DOMTIPOOPERACION', 'DOMESTADOFISICO', 'DIRECCION',
-                          'DOMTIPO', 'VUELTASCIERRE']
-                with arcpy.da.InsertCursor(valv_sis, campos) as Incursor:
-                    reg = (punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                        punto[18], punto[19], punto[13], punto[21], punto[20], punto[23], punto[11], punto[12], punto[24],
-                        punto[25], punto[26], punto[73], punto[27], punto[28])
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'VALVULACONTROL_2':
-                valv_con = os.path.join(workspace, 'acd_ValvulaControl')
-                campos = ['Shape@', 'SUBTIPO','DOMESTADOENRED', 'LOCALIZACIONRELATIVA','DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES','CONTRATO_ID','DOMTIPOESPPUBLICO','DOMMATESPPUBLICO',
-                          'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'DOMAUTOMATIZADA', 'DOMSENTIDOOPERACION', 'COTARASANTE',
-                          'PROFUNDIDAD', 'DOMESTADOOPERACION', 'DOMTIPOOPERACION', 'DOMESTADOFISICO', 'DIRECCION',
-                          'DOMTIPO', 'VUELTASCIERRE']
-                with arcpy.da.InsertCursor(valv_con, campos) as Incursor:
-                    reg = (punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                        punto[18], punto[19], punto[13], punto[21], punto[20], punto[23], punto[11], punto[12], punto[24],
-                        punto[25], punto[26], punto[73], punto[27], punto[28]) 
-                    Incursor.insertRow(reg)
-            elif tipo_nod in ('ACCESORIO_CODO_3'):
-                if punto[29] in ('1'):
-                    codo = os.path.join(workspace, 'acd_Accesorio')
-                    campos = ['Shape@', 'SUBTIPO','DOMESTADOENRED', 'LOCALIZACIONRELATIVA','DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES','CONTRATO_ID', 'DOMMATERIAL', 'COTARASANTE', 'PROFUNDIDAD',
-                          'DOMDIAMETRONOMINAL', 'DOMDIAMETRONOMINAL2', 'DOMCLASEACCESORIO']
-                    reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                           punto[13], punto[11], punto[12], punto[21], punto[22], punto[29]]
-                else:
-                    codo = os.path.join(workspace, 'acd_CodosPasivos')
-                    campos = ['Shape@','DOMCLASECODO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'COTARASANTE', 'PROFUNDIDAD',
-                              'DOMESTADOENRED','LOCALIZACIONRELATIVA', 'ROTACIONSIMBOLO', 'FECHAINSTALACION', 'CONTRATO_ID',
-                              'DOMCALIDADDATO', 'OBSERVACIONES']
-                    reg = [punto[0], punto[29], punto[21], punto[13], punto[11], punto[12], punto[7], punto[8], punto[10],
-                           punto[6], punto[16], punto[9], punto[15]]
-                with arcpy.da.InsertCursor(codo, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod in ('ACCESORIO_REDUCCION_4', 'ACCESORIO_TAPON_5', 'ACCESORIO_TEE_6', 'ACCESORIO_UNION_7',
-                     'ACCESORIO_OTROS_8'):
-                accesorio = os.path.join(workspace, 'acd_Accesorio')
-                campos = ['Shape@', 'SUBTIPO','DOMESTADOENRED', 'LOCALIZACIONRELATIVA','DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES','CONTRATO_ID', 'DOMMATERIAL', 'COTARASANTE', 'PROFUNDIDAD',
-                          'DOMDIAMETRONOMINAL', 'DOMDIAMETRONOMINAL2', 'DOMCLASEACCESORIO']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                        punto[13], punto[11], punto[12], punto[21], punto[22], punto[29]]
-                with arcpy.da.InsertCursor(accesorio, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'HIDRANTE_9':
-                hidrante = os.path.join(workspace, 'acd_Hidrante')
-                campos = ['Shape@', 'SUBTIPO','DOMESTADOENRED', 'LOCALIZACIONRELATIVA','DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES','CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
-                          'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'MARCA', 'DOMFUNCIONPILAPUBLICA', 'DOMESTADOFISICO',
-                          'COTARASANTE', 'DIRECCION', 'PRESION', 'FECHA_TOMA_P']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[18], punto[19], punto[13], punto[21], punto[31], punto[32], punto[30], punto[11],
-                       punto[73], punto[74], punto[39]]
-                with arcpy.da.InsertCursor(hidrante, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'MACROMEDIDOR_10':
-                macromedidor = os.path.join(workspace, 'acd_MacroMedidor')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
-                          'SECTORHIDENTRADA', 'SECTORHIDSALIDA', 'DIRECCION', 'CAUDAL_PROMEDIO', 'TIPO_M', 'FECHA_TOMA_C',
-                          'NOMBRE']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16], punto[18],
-                       punto[18], punto[34], punto[35], punto[73], punto[37], punto[38], punto[39], punto[72]]
-                with arcpy.da.InsertCursor(macromedidor, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'PUNTO_ACOMETIDA_11':
-                punto_aco = os.path.join(workspace, 'acd_PuntoAcometida')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DIRECCION']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[73]]
-                with arcpy.da.InsertCursor(punto_aco, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'PILA_MUESTREO_12':
-                pila_muest = os.path.join(workspace, 'acd_PilaMuestreo')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
-                          'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'COTARASANTE', 'DIRECCION', 'CENTRO', 'L_ALM', 'AREARESP',
-                          'TIPO', 'FUENTEABAST', 'UBICACION', 'PTOANALISISBLQ', 'LOCPUNTO', 'ESTADO', 'FECHAESTADO',
-                          'CLASEPUNTO', 'NOMBRE', 'LATITUD', 'LONGITUD']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[18], punto[19], punto[13], punto[21], punto[11], punto[73], punto[41], punto[42],
-                       punto[43], punto[44], punto[45], punto[46], punto[47], punto[48], punto[49], punto[50],
-                       punto[51], punto[72], punto[4], punto[5]]
-                with arcpy.da.InsertCursor(pila_muest, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'CAPTACION_13':
-                captacion = os.path.join(workspace, 'acd_Captacion')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[72], punto[73], punto[11]]
-                with arcpy.da.InsertCursor(captacion, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'DESARENADOR_14':
-                desarenador = os.path.join(workspace, 'acd_Desarenador')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[72], punto[73], punto[11]]
-                with arcpy.da.InsertCursor(desarenador, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'PLANTA_TRATAMIENTO_15':
-                plant_trat = os.path.join(workspace, 'acd_PlantaTratamiento')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE','NROFILTROS',
-                          'NROSEDIMENTADORES','NROCOMPARTIMIENTOS','NROMEZCLADORES', 'NROFLOCULADORES', 'CAPACIDADINSTALADA']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[72], punto[73], punto[11], punto[52], punto[53], punto[54], punto[55], punto[56], punto[57]]
-                with arcpy.da.InsertCursor(plant_trat, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'ESTACION_BOMBEO_16':
-                estacion_bom = os.path.join(workspace, 'acd_EstacionBombeo')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE',
-                          'CAPACIDADBOMBEO_M3_S', 'COTABOMBEOSUCCION', 'ALTURADINAMICATOTAL']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16],
-                       punto[72], punto[73], punto[11], punto[59], punto[60], punto[61]]
-                with arcpy.da.InsertCursor(estacion_bom, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'TANQUE_17':
-                tanque = os.path.join(workspace, 'acd_Tanque')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE',
-                          'CAPACIDAD_M3', 'COTAFONDO', 'COTAREBOSE', 'NIVELMAXIMO', 'NIVELMINIMO', 'AREATRANSVERSAL_M2',
-                          'DOMTIENETELEVIGILANCIA']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16], 
-                       punto[72], punto[73], punto[11], punto[64], punto[62], punto[63], punto[65], punto[66], 
-                       punto[67], punto[68]]
-                with arcpy.da.InsertCursor(tanque, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'PORTAL_18':
-                portal = os.path.join(workspace, 'acd_Portal')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16], 
-                       punto[72], punto[73], punto[11]]
-                with arcpy.da.InsertCursor(portal, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'CAMARA_ACCESO_19':
-                cam_acce = os.path.join(workspace, 'acd_CamaraAcceso')
-                campos = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
-                          'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE', 
-                          'DOMTIPOACCESO', 'PROFUNDIDAD', 'DOMDIAMETROACCESO']
-                reg = [punto[0], punto[2], punto[7], punto[8], punto[9], punto[6], punto[10], punto[15], punto[16], 
-                       punto[72], punto[73], punto[11], punto[70], punto[12], punto[71]]
-                with arcpy.da.InsertCursor(cam_acce, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            elif tipo_nod == 'ESTRUCTURA_CONTROL_20':
-                estr_contr =  os.path.join(workspace, 'acd_ValvulaControl')
-                # OJO VERIFICAR OS ATRIBUTOS QUE SE INGRESARIANDEBEN INGRESAR
-                pass
-            elif tipo_nod == 'INSTRUMENTOS_MEDICION_21':
-                inst_med = os.path.join(workspace, 'acd_CamaraAcceso')
-                campos = ['Shape@', 'SUBTIPO', 'DESCRIPCIONLOCALIZACION', 'OBSERVACIONES', 'FECHAINSTALACION', 'COTARASANTE',
-                          'DOMCALIDADDATO', 'MARCA', 'DIAMETRO', 'ESTADOFISICO', 'CAUDAL']
-                reg = [punto[0], punto[2], punto[8], punto[15], punto[6], punto[11], punto[9], punto[31], punto[21],
-                       punto[49], punto[37]]
-
-# Migra la informacion de LINEAS ALCANTARILLADO
-def migra_l_alc(clase_l_alc, workspace):
-    for red in clase_l_alc:
-        for line in clase_l_alc[red]:
-            if red == 'redLocal_1':
-                campos = ['Shape@','DOMDIAMETRONOMINAL','DOMMATERIAL','DOMMATERIALESPPUBLICO','DOMTIPOSISTEMA','COTARASANTEINICIAL',
-                          'COTACLAVEINICIAL','COTABATEAINICIAL','COTARASANTEFINAL','COTACLAVEFINAL','COTABATEAFINAL','FECHAINSTALACION',
-                          'DOMESTADOENRED','DOMCALIDADDATO','DOMESTADOLEGAL','OBSERVACIONES','CONTRATO_ID','LONGITUD_M','DOMMATERIAL2',
-                          'NUMEROCONDUCTOS','DOMTIPOSECCION','DOMCAMARACAIDA','BASE','ALTURA1','DOMMETODOINSTALACION','PROFUNDIDADMEDIA',
-                          'PENDIENTE','SUBTIPO', 'DISENO_ID']
-                reg = [line[0], line[11],line[7],line[36],line[5],line[18],line[20],line[22],line[19],line[21],line[23],line[6],line[10],
-                       line[13],line[14],line[15],line[16],line[34],line[8],line[30],line[12],line[17],line[26],line[28],line[35],line[27],
-                       line[24],line[2],line[9]]
-                
-                capa = 'als_RedLocal' if line[5] in ('0', '2') else 'alp_RedLocal'
-                redLocal = os.path.join(workspace, capa)
-                
-                with arcpy.da.InsertCursor(redLocal, campos) as Incursor:
-                    Incursor.insertRow(reg)
-                    
-            elif red == 'redTroncal_2':
-                campos = ['Shape@', 'DOMDIAMETRONOMINAL','DOMMATERIAL','DOMMATERIALESPPUBLICO','DOMTIPOSISTEMA','COTARASANTEINICIAL',
-                          'COTACLAVEINICIAL','COTABATEAINICIAL','COTARASANTEFINAL','COTACLAVEFINAL','COTABATEAFINAL','FECHAINSTALACION',
-                          'DOMESTADOENRED','DOMCALIDADDATO','DOMESTADOLEGAL','OBSERVACIONES','CONTRATO_ID','LONGITUD_M','DOMMATERIAL2',
-                          'NUMEROCONDUCTOS','DOMTIPOSECCION','DOMCAMARACAIDA','BASE','ALTURA1','DOMMETODOINSTALACION','PROFUNDIDADMEDIA',
-                          'PENDIENTE','ALTURA2','TALUD1','TALUD2','ANCHOBERMA','NOMBRE','SUBTIPO','DISENO_ID']
-                reg = [line[0],line[11],line[7],line[36],line[5],line[18],line[20],line[22],line[19],line[21],line[23],line[6],line[10],line[13],
-                       line[14],line[15],line[16],line[34],line[8],line[30],line[12],line[17],line[26],line[28],line[35],line[27],line[24],
-                       line[29],line[32],line[33],line[31],line[25],line[2], line[9]]
-                
-                capa = 'als_RedTroncal' if line[5] in ('0', '2') else 'alp_RedTroncal'
-                redTroncal = os.path.join(workspace, capa)
-                
-                with arcpy.da.InsertCursor(redTroncal, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            
-            elif red == 'linLat_3':
-                campos = ['Shape@', 'DOMDIAMETRONOMINAL','DOMMATERIAL','DOMMATERIALESPPUBLICO','DOMTIPOSISTEMA','COTARASANTEINICIAL',
-                          'COTACLAVEINICIAL','COTABATEAINICIAL','COTARASANTEFINAL','COTACLAVEFINAL','COTABATEAFINAL','FECHAINSTALACION',
-                          'DOMESTADOENRED','DOMCALIDADDATO','DOMESTADOLEGAL','OBSERVACIONES','CONTRATO_ID','LONGITUD_M','SUBTIPO','DISENO_ID']
-                reg = [line[0],line[11],line[7],line[36],line[5],line[18],line[20],line[22],line[19],line[21],line[23],line[6],line[10],line[13],
-                       line[14],line[15],line[16],line[34],line[2],line[9]]
-
-                capa = 'als_LineaLateral' if line[5] in ('0', '2') else 'alp_LineaLateral'
-                lineaLateral = os.path.join(workspace, capa)
-                
-                with arcpy.da.InsertCursor(lineaLateral, campos) as Incursor:
-                    Incursor.insertRow(reg)
-
-# Migra la informacion de PUNTOS ALCANTARILLADO
-def migra_p_alc(clase_p_alc, workspace):
-    for tipo_nod in clase_p_alc:
-        for punto in clase_p_alc[tipo_nod]:
-            if tipo_nod == 'ESTRUCTURA_RED_1':
-                campos = ['Shape@','DOMTIPOSISTEMA','COTARASANTE','DOMMATERIAL','FECHAINSTALACION','DOMESTADOENRED','DOMCALIDADDATO',
-                          'OBSERVACIONES','CONTRATO_ID','DIRECCION','LOCALIZACIONRELATIVA','ROTACIONSIMBOLO','DOMTIENECABEZAL',
-                          'DOMESTADOFISICO','DOMTIPOVALVULAANTIRREFLUJO','COTAFONDO','COTACRESTA',
-                          'COTATECHOVERTEDERO','LONGVERTEDERO','LARGOESTRUCTURA','ANCHOESTRUCTURA','ALTOESTRUCTURA','CAUDALBOMBEO',
-                          'DOMTIPOBOMBEO','UNIDADESBOMBEO','ALTURABOMBEO','COTABOMBEO','VOLUMENBOMBEO','NOMBRE','SUBTIPO', 'DISENO_ID']
-                reg = [punto[0],punto[16],punto[11],punto[14],punto[6],punto[9],punto[15],punto[18],punto[19],punto[55],punto[10],punto[27],
-                       punto[30],punto[29],punto[8],punto[13],punto[43],punto[44],punto[45],punto[46],punto[47],punto[48],
-                       punto[49],punto[50],punto[51],punto[52],punto[53],punto[54],punto[17],punto[2], punto[20]]
-            
-                capa = 'als_EstructuraRed' if punto[16] in ('0', '2') else 'alp_EstructuraRed'
-                estructRed = os.path.join(workspace, capa)
-                
-                with arcpy.da.InsertCursor(estructRed, campos) as Incursor:
-                    Incursor.insertRow(reg)
-                    
-            if tipo_nod == 'POZO_2':
-                campos = ['Shape@','DOMTIPOSISTEMA','COTARASANTE','FECHAINSTALACION','DOMESTADOENRED','DOMCALIDADDATO','OBSERVACIONES',
-                          'CONTRATO_ID','DIRECCION','DOMESTADOFISICO','COTATERRENO','COTAFONDO','PROFUNDIDAD','DOMINICIALVARIASCUENCAS',
-                          'DOMCAMARASIFON','DOMESTADOPOZO','DOMTIPOALMACENAMIENTO','SUBTIPO', 'DISENO_ID']
-                reg = [punto[0],punto[16],punto[11],punto[6],punto[9],punto[15],punto[18],punto[19],punto[55],punto[29],punto[12],punto[13],
-                       punto[21],punto[26],punto[28],punto[32],punto[42],punto[2], punto[20]]
-                
-                capa = 'als_Pozo' if punto[16] in ('0', '2') else 'alp_Pozo'
-                pozo = os.path.join(workspace, capa)
-                
-                with arcpy.da.InsertCursor(pozo, campos) as Incursor:
-                    Incursor.insertRow(reg)
-
-            if tipo_nod == 'SUMIDERO_3':
-                campos = ['Shape@','DOMTIPOSISTEMA','COTARASANTE','DOMMATERIAL','FECHAINSTALACION','DOMESTADOENRED','DOMCALIDADDATO','OBSERVACIONES',
-                          'CONTRATO_ID','DIRECCION','LOCALIZACIONRELATIVA','ROTACIONSIMBOLO','SUBTIPO', 'DISENO_ID']
-                reg = [punto[0],punto[16],punto[11],punto[14],punto[6],punto[9],punto[15],punto[18],punto[19],punto[55],punto[10],punto[27],punto[2], punto[20]]
-                
-                capa = 'als_Sumidero' if punto[16] in ('0', '2') else 'alp_Sumidero'
-                sumidero = os.path.join(workspace, capa)
-
-                with arcpy.da.InsertCursor(sumidero, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            
-            if tipo_nod == 'CAJA_DOMICILIARIA_4':
-                campos = ['Shape@','DOMTIPOSISTEMA','COTARASANTE','DOMMATERIAL','FECHAINSTALACION','DOMESTADOENRED','DOMCALIDADDATO','OBSERVACIONES',
-                          'CONTRATO_ID','DIRECCION','LOCALIZACIONRELATIVA','ROTACIONSIMBOLO','SUBTIPO', 'DISENO_ID']
-                reg = [punto[0],punto[16],punto[11],punto[14],punto[6],punto[9],punto[15],punto[18],punto[19],punto[55],punto[10],punto[27],punto[2], punto[20]]
-                
-                capa = 'als_CajaDomiciliaria' if punto[16] in ('0', '2') else 'alp_CajaDomiciliaria'
-                cajaDom = os.path.join(workspace, capa)
-                
-                with arcpy.da.InsertCursor(cajaDom, campos) as Incursor:
-                    Incursor.insertRow(reg)
-            
-            if tipo_nod == 'SECCION_TRANSVERSAL_5':
-                campos = ['Shape@','NOMBRE','ABSCISA','DISTANCIADESDEORIGEN','DOMORIGENSECCION']
-                reg = [punto[0],punto[17],punto[61],punto[60],punto[59]]
-                
-                capa = 'als_SeccionTransversal' if punto[16] in ('0', '2') else 'alp_SeccionTransversal'
-                secTrans = os.path.join(workspace, capa)
-
-                with arcpy.da.InsertCursor(secTrans, campos) as Incursor:
-                    Incursor.insertRow(reg)
+# Registro de cursores de insercion: abre un solo InsertCursor por feature class destino (de forma perezosa)
+# y lo reutiliza durante toda la migracion; todos los cursores se cierran una sola vez al final
+class RegistroCursores:
+    def __init__(self, workspace):
+        self.workspace = workspace
+        self.cursores = {}
+        self.campos = {}
+        self.pila = ExitStack()
+
+    def insertar(self, capa, campos, reg):
+        cursor = self.cursores.get(capa)
+        if cursor is None:
+            cursor = self.pila.enter_context(arcpy.da.InsertCursor(os.path.join(self.workspace, capa), campos))
+            self.cursores[capa] = cursor
+            self.campos[capa] = campos
+        elif campos != self.campos[capa]:
+            raise ValueError(f'La capa {capa} se esta cargando con dos listas de campos distintas')
+        cursor.insertRow(reg)
+
+    def cerrar(self):
+        # al salir del contexto de cada cursor arcpy lo cierra y suelta el bloqueo sobre la feature class, aunque
+        # quede alguna referencia al cursor (por ejemplo en la traza de una excepcion)
+        self.pila.close()
+        self.cursores.clear()
+        self.campos.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+# ultima modificacion de los archivos de una capa de entrada: la carpeta .gdb completa (arcpy no cambia la fecha de la
+# carpeta al editar una feature class), el .shp y el .dbf de un shapefile o el archivo .gpkg (None si no esta en disco)
+def modificacion_fuente(fuente):
+    ruta = os.path.normpath(fuente)
+    posicion = ruta.lower().find('.gdb')
+    if posicion >= 0:
+        carpeta = ruta[:posicion + 4]
+        if not os.path.isdir(carpeta):
+            return None
+        return max((os.path.getmtime(os.path.join(carpeta, nombre)) for nombre in os.listdir(carpeta)), default=None)
+    if es_shapefile(fuente):
+        archivos = [ruta, os.path.splitext(ruta)[0] + '.dbf']
+    elif es_geopackage(fuente):
+        archivos = [patron_gpkg.match(fuente).group(1)]
+    else:
+        archivos = [ruta]
+    fechas = [os.path.getmtime(archivo) for archivo in archivos if os.path.exists(archivo)]
+    return max(fechas) if fechas else None
+
+# huella de las capas de entrada: ruta, cantidad de registros y ultima modificacion de cada una
+def huella_fuentes(fuentes):
+    return [[fuente, cuenta_registros(fuente), modificacion_fuente(fuente)] if fuente != '' else [fuente, None, None]
+            for fuente in fuentes]
+
+# Diario de la migracion: base SQLite junto a GDB_Cargue.gdb con la huella de las capas de entrada de la ejecucion,
+# el estado de cada destino de la carga masiva ('cargando' mientras corre su Append, 'cargado' o 'registro' si paso a
+# la migracion registro a registro) y los OIDs de la fuente ya guardados registro a registro (los del bloque que se
+# esta guardando quedan en 'pendientes' hasta que la GDB confirma el guardado). Si la ejecucion se interrumpe, la
+# siguiente con las mismas capas de entrada, sin cambios en sus registros ni en sus archivos, continua desde el diario
+# sobre la misma GDB; al terminar bien, el diario se borra
+class DiarioMigracion:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE IF NOT EXISTS destinos (fuente TEXT, clase TEXT, capa TEXT, estado TEXT,
+                                                 PRIMARY KEY (fuente, clase, capa));
+            CREATE TABLE IF NOT EXISTS registros (fuente TEXT, oid INTEGER, PRIMARY KEY (fuente, oid)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS pendientes (fuente TEXT, oid INTEGER, PRIMARY KEY (fuente, oid)) WITHOUT ROWID;
+        """)
+
+    # una capa corregida en su lugar (misma ruta) cambia su huella, y entonces los OIDs del diario ya no sirven
+    def reanudable(self, fuentes):
+        fila = self.conexion.execute("SELECT valor FROM estado WHERE clave = 'fuentes'").fetchone()
+        return fila is not None and fila[0] == json.dumps(huella_fuentes(fuentes))
+
+    # True si la ejecucion se interrumpio sin saber que quedo en la GDB: un Append que no termino puede haber dejado
+    # parte de sus registros y no se puede repetir ni pasar a registro a registro sin duplicarlos, y un bloque
+    # pendiente pudo quedar guardado o no
+    def incierto(self):
+        if self.conexion.execute("SELECT 1 FROM destinos WHERE estado = 'cargando'").fetchone() is not None:
+            return True
+        return self.conexion.execute("SELECT 1 FROM pendientes").fetchone() is not None
+
+    def inicia(self, fuentes):
+        huella = json.dumps(huella_fuentes(fuentes))
+        with self.conexion:
+            for tabla in ('estado', 'destinos', 'registros', 'pendientes'):
+                self.conexion.execute(f"DELETE FROM {tabla}")
+            self.conexion.execute("INSERT INTO estado VALUES ('fuentes', ?)", (huella,))
+
+    def estado_destino(self, fuente, clase, capa):
+        fila = self.conexion.execute("SELECT estado FROM destinos WHERE fuente = ? AND clase = ? AND capa = ?",
+                                     (fuente, clase, capa)).fetchone()
+        return fila[0] if fila else None
+
+    def marca_destino(self, fuente, clase, capa, estado):
+        with self.conexion:
+            self.conexion.execute("INSERT OR REPLACE INTO destinos VALUES (?, ?, ?, ?)", (fuente, clase, capa, estado))
+
+    def completados(self, fuente):
+        return {oid for oid, in self.conexion.execute("SELECT oid FROM registros WHERE fuente = ?", (fuente,))}
+
+    # OIDs por fuente del bloque que se va a guardar
+    def marca_pendientes(self, lote):
+        with self.conexion:
+            self.conexion.execute("DELETE FROM pendientes")
+            for fuente, oids in lote.items():
+                self.conexion.executemany("INSERT OR IGNORE INTO pendientes VALUES (?, ?)",
+                                          ((fuente, oid) for oid in oids))
+
+    # el bloque pendiente ya esta guardado en la GDB: sus OIDs pasan a los registros completados
+    def confirma_pendientes(self):
+        with self.conexion:
+            self.conexion.execute("INSERT OR IGNORE INTO registros SELECT fuente, oid FROM pendientes")
+            self.conexion.execute("DELETE FROM pendientes")
+
+    # indices retirados de las capas destino por esta ejecucion o por una anterior interrumpida, que ya no los tiene a
+    # la vista en la GDB: capa -> (tenia indice espacial, indices de atributos)
+    def indices_retirados(self):
+        fila = self.conexion.execute("SELECT valor FROM estado WHERE clave = 'indices'").fetchone()
+        if fila is None:
+            return {}
+        return {capa: (espacial, [IndiceAtributos(*indice) for indice in atributos])
+                for capa, (espacial, atributos) in json.loads(fila[0]).items()}
+
+    def marca_indices(self, capa, espacial, atributos):
+        retirados = self.indices_retirados()
+        espacial_antes, atributos_antes = retirados.get(capa, (False, []))
+        nombres = {indice.nombre for indice in atributos_antes}
+        retirados[capa] = (espacial or espacial_antes,
+                           atributos_antes + [indice for indice in atributos if indice.nombre not in nombres])
+        with self.conexion:
+            self.conexion.execute("INSERT OR REPLACE INTO estado VALUES ('indices', ?)", (json.dumps(retirados),))
+
+    def cerrar(self, terminado):
+        self.conexion.close()
+        if terminado:
+            os.remove(self.ruta)
+
+# Sesion de edicion de la migracion registro a registro que guarda cada `bloque` registros: cierra los cursores,
+# anota los OIDs del bloque como pendientes en el diario, termina la sesion guardando los cambios, los confirma y
+# abre una sesion nueva. Asi un fallo solo pierde el ultimo bloque y la operacion de edicion no crece con toda la
+# carga (bloque 0: una sola sesion). Si la ejecucion se corta entre el guardado y la confirmacion, el diario queda
+# con el bloque pendiente y la siguiente ejecucion no lo continua
+class MigracionPorLotes:
+    def __init__(self, workspace, diario=None, bloque=0):
+        self.editor = arcpy.da.Editor(workspace)
+        self.escritor = RegistroCursores(workspace)
+        self.diario = diario
+        self.bloque = bloque
+        self.lote = {}
+        self.cantidad = 0
+        self.total = 0
+
+    def abrir(self):
+        self.editor.startEditing(with_undo=False, multiuser_mode=False)
+        self.editor.startOperation()
+
+    def guardar(self):
+        self.escritor.cerrar()
+        self.editor.stopOperation()
+        if self.diario is not None:
+            self.diario.marca_pendientes(self.lote)
+        self.editor.stopEditing(save_changes=True)
+        if self.diario is not None:
+            self.diario.confirma_pendientes()
+        self.lote = {}
+        self.cantidad = 0
+
+    def registrado(self, fuente, oid):
+        oids = self.lote.get(fuente)
+        if oids is None:
+            oids = self.lote[fuente] = array('q')
+        oids.append(oid)
+        self.cantidad += 1
+        self.total += 1
+        if self.bloque and self.cantidad >= self.bloque:
+            self.guardar()
+            self.abrir()
+
+    def __enter__(self):
+        self.abrir()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.guardar()
+        else:
+            # los registros del bloque en curso no se guardan ni se anotan
+            self.escritor.cerrar()
+            self.editor.stopOperation()
+            self.editor.stopEditing(save_changes=False)
+        return False
+
+# ----------------------------- Mapeo de la migracion -----------------------------
+# Para cada clase, los destinos de sus registros: feature class, campos destino, posicion en la fila origen de cada
+# campo y, cuando la clase se reparte entre dos feature classes, la condicion (posicion, valores, dentro) que elige
+# el destino. El mapeo se usa en la carga masiva y, compilado, en la migracion registro a registro
+Destino = namedtuple('Destino', ['capa', 'campos', 'indices', 'condicion'], defaults=(None,))
+
+# las redes y nodos de alcantarillado van al sanitario (als) si SISTEMA es '0' o '2', si no al pluvial (alp)
+def reparte_sistema(posicion, capa_als, capa_alp, campos, indices):
+    return [Destino(capa_als, campos, indices, (posicion, ('0', '2'), True)),
+            Destino(capa_alp, campos, indices, (posicion, ('0', '2'), False))]
+
+campos_conduccion = ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
+                     'DOMCALIDADDATO', 'OBSERVACIONES', 'DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'LONGITUD_M',
+                     'T_SECCION', 'AREA_TR_M2', 'C_RASANTEI', 'C_RASANTEF', 'C_CLAVEI', 'C_CLAVEF']
+indices_conduccion = (0, 2, 7, 8, 6, 5, 9, 11, 12, 13, 25, 17, 18, 19, 20, 21, 22)
+
+mapeo_l_acu = {
+    'redMatriz_1': [
+        Destino('acd_RedMatriz',
+                ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
+                 'DOMCALIDADDATO', 'OBSERVACIONES', 'DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'LONGITUD_M', 'DOMCOSTADO',
+                 'PROFUNDIDAD'],
+                (0, 2, 7, 8, 6, 5, 9, 11, 12, 13, 25, 16, 23)),
+    ],
+    'aduccion_2': [Destino('acd_Conduccion', campos_conduccion, indices_conduccion)],
+    'conduccion_3': [Destino('acd_Conduccion', campos_conduccion, indices_conduccion)],
+    'redMenor_4': [
+        Destino('acd_RedMenor',
+                ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
+                 'DOMCALIDADDATO', 'OBSERVACIONES', 'DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'DOMESTADOLEGAL',
+                 'DOMCOSTADO', 'LONGITUD_M', 'PROFUNDIDAD'],
+                (0, 2, 7, 8, 6, 5, 9, 11, 12, 13, 10, 16, 25, 23)),
+    ],
+    'lineaLat_5': [
+        Destino('acd_LineaLateral',
+                ['Shape@', 'SUBTIPO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMESTADOENRED', 'FECHAINSTALACION',
+                 'DOMCALIDADDATO', 'OBSERVACIONES', 'DOMSUITIPOINSTALACION', 'CONTRATO_ID', 'DOMESTADOLEGAL',
+                 'PROFUNDIDAD', 'RUGOSIDAD', 'LONGITUD_M'],
+                (0, 2, 7, 8, 6, 5, 9, 11, 12, 13, 10, 23, 24, 25)),
+    ],
+}
+
+campos_valvula = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                  'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
+                  'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'DOMAUTOMATIZADA', 'DOMSENTIDOOPERACION', 'COTARASANTE',
+                  'PROFUNDIDAD', 'DOMESTADOOPERACION', 'DOMTIPOOPERACION', 'DOMESTADOFISICO', 'DIRECCION', 'DOMTIPO',
+                  'VUELTASCIERRE']
+indices_valvula = (0, 2, 7, 8, 9, 6, 10, 15, 16, 18, 19, 13, 21, 20, 23, 11, 12, 24, 25, 26, 73, 27, 28)
+campos_accesorio = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                    'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMMATERIAL', 'COTARASANTE', 'PROFUNDIDAD',
+                    'DOMDIAMETRONOMINAL', 'DOMDIAMETRONOMINAL2', 'DOMCLASEACCESORIO']
+indices_accesorio = (0, 2, 7, 8, 9, 6, 10, 15, 16, 13, 11, 12, 21, 22, 29)
+campos_estructura_acu = ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO',
+                         'FECHAINSTALACION', 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION',
+                         'COTARASANTE']
+indices_estructura_acu = (0, 2, 7, 8, 9, 6, 10, 15, 16, 72, 73, 11)
+
+# el codo se compara con `in ('1')`, que es un texto: '' tambien va a acd_Accesorio
+mapeo_p_acu = {
+    'VALVULASISTEMA_1': [Destino('acd_ValvulaSistema', campos_valvula, indices_valvula)],
+    'VALVULACONTROL_2': [Destino('acd_ValvulaControl', campos_valvula, indices_valvula)],
+    'ACCESORIO_CODO_3': [
+        Destino('acd_Accesorio', campos_accesorio, indices_accesorio, (29, ('', '1'), True)),
+        Destino('acd_CodosPasivos',
+                ['Shape@', 'DOMCLASECODO', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'COTARASANTE', 'PROFUNDIDAD',
+                 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'ROTACIONSIMBOLO', 'FECHAINSTALACION', 'CONTRATO_ID',
+                 'DOMCALIDADDATO', 'OBSERVACIONES'],
+                (0, 29, 21, 13, 11, 12, 7, 8, 10, 6, 16, 9, 15),
+                (29, ('', '1'), False)),
+    ],
+    'ACCESORIO_REDUCCION_4': [Destino('acd_Accesorio', campos_accesorio, indices_accesorio)],
+    'ACCESORIO_TAPON_5': [Destino('acd_Accesorio', campos_accesorio, indices_accesorio)],
+    'ACCESORIO_TEE_6': [Destino('acd_Accesorio', campos_accesorio, indices_accesorio)],
+    'ACCESORIO_UNION_7': [Destino('acd_Accesorio', campos_accesorio, indices_accesorio)],
+    'ACCESORIO_OTROS_8': [Destino('acd_Accesorio', campos_accesorio, indices_accesorio)],
+    'HIDRANTE_9': [
+        Destino('acd_Hidrante',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
+                 'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'MARCA', 'DOMFUNCIONPILAPUBLICA', 'DOMESTADOFISICO',
+                 'COTARASANTE', 'DIRECCION', 'PRESION', 'FECHA_TOMA_P'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 18, 19, 13, 21, 31, 32, 30, 11, 73, 74, 39)),
+    ],
+    'MACROMEDIDOR_10': [
+        Destino('acd_MacroMedidor',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
+                 'SECTORHIDENTRADA', 'SECTORHIDSALIDA', 'DIRECCION', 'CAUDAL_PROMEDIO', 'TIPO_M', 'FECHA_TOMA_C',
+                 'NOMBRE'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 18, 18, 34, 35, 73, 37, 38, 39, 72)),
+    ],
+    'PUNTO_ACOMETIDA_11': [
+        Destino('acd_PuntoAcometida',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DIRECCION'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 73)),
+    ],
+    'PILA_MUESTREO_12': [
+        Destino('acd_PilaMuestreo',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'DOMTIPOESPPUBLICO', 'DOMMATESPPUBLICO',
+                 'DOMMATERIAL', 'DOMDIAMETRONOMINAL', 'COTARASANTE', 'DIRECCION', 'CENTRO', 'L_ALM', 'AREARESP', 'TIPO',
+                 'FUENTEABAST', 'UBICACION', 'PTOANALISISBLQ', 'LOCPUNTO', 'ESTADO', 'FECHAESTADO', 'CLASEPUNTO',
+                 'NOMBRE', 'LATITUD', 'LONGITUD'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 18, 19, 13, 21, 11, 73, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 72,
+                 4, 5)),
+    ],
+    'CAPTACION_13': [Destino('acd_Captacion', campos_estructura_acu, indices_estructura_acu)],
+    'DESARENADOR_14': [Destino('acd_Desarenador', campos_estructura_acu, indices_estructura_acu)],
+    'PLANTA_TRATAMIENTO_15': [
+        Destino('acd_PlantaTratamiento',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE', 'NROFILTROS',
+                 'NROSEDIMENTADORES', 'NROCOMPARTIMIENTOS', 'NROMEZCLADORES', 'NROFLOCULADORES', 'CAPACIDADINSTALADA'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 72, 73, 11, 52, 53, 54, 55, 56, 57)),
+    ],
+    'ESTACION_BOMBEO_16': [
+        Destino('acd_EstacionBombeo',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE',
+                 'CAPACIDADBOMBEO_M3_S', 'COTABOMBEOSUCCION', 'ALTURADINAMICATOTAL'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 72, 73, 11, 59, 60, 61)),
+    ],
+    'TANQUE_17': [
+        Destino('acd_Tanque',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE',
+                 'CAPACIDAD_M3', 'COTAFONDO', 'COTAREBOSE', 'NIVELMAXIMO', 'NIVELMINIMO', 'AREATRANSVERSAL_M2',
+                 'DOMTIENETELEVIGILANCIA'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 72, 73, 11, 64, 62, 63, 65, 66, 67, 68)),
+    ],
+    'PORTAL_18': [Destino('acd_Portal', campos_estructura_acu, indices_estructura_acu)],
+    'CAMARA_ACCESO_19': [
+        Destino('acd_CamaraAcceso',
+                ['Shape@', 'SUBTIPO', 'DOMESTADOENRED', 'LOCALIZACIONRELATIVA', 'DOMCALIDADDATO', 'FECHAINSTALACION',
+                 'ROTACIONSIMBOLO', 'OBSERVACIONES', 'CONTRATO_ID', 'NOMBRE', 'DIRECCION', 'COTARASANTE',
+                 'DOMTIPOACCESO', 'PROFUNDIDAD', 'DOMDIAMETROACCESO'],
+                (0, 2, 7, 8, 9, 6, 10, 15, 16, 72, 73, 11, 70, 12, 71)),
+    ],
+    'ESTRUCTURA_CONTROL_20': [],
+    'INSTRUMENTOS_MEDICION_21': [],
+}
+
+mapeo_l_alc = {
+    'redLocal_1': reparte_sistema(
+        5, 'als_RedLocal', 'alp_RedLocal',
+        ['Shape@', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMMATERIALESPPUBLICO', 'DOMTIPOSISTEMA', 'COTARASANTEINICIAL',
+         'COTACLAVEINICIAL', 'COTABATEAINICIAL', 'COTARASANTEFINAL', 'COTACLAVEFINAL', 'COTABATEAFINAL',
+         'FECHAINSTALACION', 'DOMESTADOENRED', 'DOMCALIDADDATO', 'DOMESTADOLEGAL', 'OBSERVACIONES', 'CONTRATO_ID',
+         'LONGITUD_M', 'DOMMATERIAL2', 'NUMEROCONDUCTOS', 'DOMTIPOSECCION', 'DOMCAMARACAIDA', 'BASE', 'ALTURA1',
+         'DOMMETODOINSTALACION', 'PROFUNDIDADMEDIA', 'PENDIENTE', 'SUBTIPO', 'DISENO_ID'],
+        (0, 11, 7, 36, 5, 18, 20, 22, 19, 21, 23, 6, 10, 13, 14, 15, 16, 34, 8, 30, 12, 17, 26, 28, 35, 27, 24, 2, 9)),
+    'redTroncal_2': reparte_sistema(
+        5, 'als_RedTroncal', 'alp_RedTroncal',
+        ['Shape@', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMMATERIALESPPUBLICO', 'DOMTIPOSISTEMA', 'COTARASANTEINICIAL',
+         'COTACLAVEINICIAL', 'COTABATEAINICIAL', 'COTARASANTEFINAL', 'COTACLAVEFINAL', 'COTABATEAFINAL',
+         'FECHAINSTALACION', 'DOMESTADOENRED', 'DOMCALIDADDATO', 'DOMESTADOLEGAL', 'OBSERVACIONES', 'CONTRATO_ID',
+         'LONGITUD_M', 'DOMMATERIAL2', 'NUMEROCONDUCTOS', 'DOMTIPOSECCION', 'DOMCAMARACAIDA', 'BASE', 'ALTURA1',
+         'DOMMETODOINSTALACION', 'PROFUNDIDADMEDIA', 'PENDIENTE', 'ALTURA2', 'TALUD1', 'TALUD2', 'ANCHOBERMA', 'NOMBRE',
+         'SUBTIPO', 'DISENO_ID'],
+        (0, 11, 7, 36, 5, 18, 20, 22, 19, 21, 23, 6, 10, 13, 14, 15, 16, 34, 8, 30, 12, 17, 26, 28, 35, 27, 24, 29, 32,
+         33, 31, 25, 2, 9)),
+    'linLat_3': reparte_sistema(
+        5, 'als_LineaLateral', 'alp_LineaLateral',
+        ['Shape@', 'DOMDIAMETRONOMINAL', 'DOMMATERIAL', 'DOMMATERIALESPPUBLICO', 'DOMTIPOSISTEMA', 'COTARASANTEINICIAL',
+         'COTACLAVEINICIAL', 'COTABATEAINICIAL', 'COTARASANTEFINAL', 'COTACLAVEFINAL', 'COTABATEAFINAL',
+         'FECHAINSTALACION', 'DOMESTADOENRED', 'DOMCALIDADDATO', 'DOMESTADOLEGAL', 'OBSERVACIONES', 'CONTRATO_ID',
+         'LONGITUD_M', 'SUBTIPO', 'DISENO_ID'],
+        (0, 11, 7, 36, 5, 18, 20, 22, 19, 21, 23, 6, 10, 13, 14, 15, 16, 34, 2, 9)),
+}
+
+mapeo_p_alc = {
+    'ESTRUCTURA_RED_1': reparte_sistema(
+        16, 'als_EstructuraRed', 'alp_EstructuraRed',
+        ['Shape@', 'DOMTIPOSISTEMA', 'COTARASANTE', 'DOMMATERIAL', 'FECHAINSTALACION', 'DOMESTADOENRED',
+         'DOMCALIDADDATO', 'OBSERVACIONES', 'CONTRATO_ID', 'DIRECCION', 'LOCALIZACIONRELATIVA', 'ROTACIONSIMBOLO',
+         'DOMTIENECABEZAL', 'DOMESTADOFISICO', 'DOMTIPOVALVULAANTIRREFLUJO', 'COTAFONDO', 'COTACRESTA',
+         'COTATECHOVERTEDERO', 'LONGVERTEDERO', 'LARGOESTRUCTURA', 'ANCHOESTRUCTURA', 'ALTOESTRUCTURA', 'CAUDALBOMBEO',
+         'DOMTIPOBOMBEO', 'UNIDADESBOMBEO', 'ALTURABOMBEO', 'COTABOMBEO', 'VOLUMENBOMBEO', 'NOMBRE', 'SUBTIPO',
+         'DISENO_ID'],
+        (0, 16, 11, 14, 6, 9, 15, 18, 19, 55, 10, 27, 30, 29, 8, 13, 43, 44, 45, 46, 47, 48, 49, 50, 51, 52, 53, 54, 17,
+         2, 20)),
+    'POZO_2': reparte_sistema(
+        16, 'als_Pozo', 'alp_Pozo',
+        ['Shape@', 'DOMTIPOSISTEMA', 'COTARASANTE', 'FECHAINSTALACION', 'DOMESTADOENRED', 'DOMCALIDADDATO',
+         'OBSERVACIONES', 'CONTRATO_ID', 'DIRECCION', 'DOMESTADOFISICO', 'COTATERRENO', 'COTAFONDO', 'PROFUNDIDAD',
+         'DOMINICIALVARIASCUENCAS', 'DOMCAMARASIFON', 'DOMESTADOPOZO', 'DOMTIPOALMACENAMIENTO', 'SUBTIPO', 'DISENO_ID'],
+        (0, 16, 11, 6, 9, 15, 18, 19, 55, 29, 12, 13, 21, 26, 28, 32, 42, 2, 20)),
+    'SUMIDERO_3': reparte_sistema(
+        16, 'als_Sumidero', 'alp_Sumidero',
+        ['Shape@', 'DOMTIPOSISTEMA', 'COTARASANTE', 'DOMMATERIAL', 'FECHAINSTALACION', 'DOMESTADOENRED',
+         'DOMCALIDADDATO', 'OBSERVACIONES', 'CONTRATO_ID', 'DIRECCION', 'LOCALIZACIONRELATIVA', 'ROTACIONSIMBOLO',
+         'SUBTIPO', 'DISENO_ID'],
+        (0, 16, 11, 14, 6, 9, 15, 18, 19, 55, 10, 27, 2, 20)),
+    'CAJA_DOMICILIARIA_4': reparte_sistema(
+        16, 'als_CajaDomiciliaria', 'alp_CajaDomiciliaria',
+        ['Shape@', 'DOMTIPOSISTEMA', 'COTARASANTE', 'DOMMATERIAL', 'FECHAINSTALACION', 'DOMESTADOENRED',
+         'DOMCALIDADDATO', 'OBSERVACIONES', 'CONTRATO_ID', 'DIRECCION', 'LOCALIZACIONRELATIVA', 'ROTACIONSIMBOLO',
+         'SUBTIPO', 'DISENO_ID'],
+        (0, 16, 11, 14, 6, 9, 15, 18, 19, 55, 10, 27, 2, 20)),
+    'SECCION_TRANSVERSAL_5': reparte_sistema(
+        16, 'als_SeccionTransversal', 'alp_SeccionTransversal',
+        ['Shape@', 'NOMBRE', 'ABSCISA', 'DISTANCIADESDEORIGEN', 'DOMORIGENSECCION'],
+        (0, 17, 61, 60, 59)),
+}
+
+# Posiciones de la fila original que usa la migracion de cada clase (la 0 es la geometria)
+def indices_mapeo(mapeo):
+    indices = {}
+    for nombre, destinos in mapeo.items():
+        if destinos:
+            usados = {indice for destino in destinos for indice in destino.indices}
+            usados.update(destino.condicion[0] for destino in destinos if destino.condicion is not None)
+            indices[nombre] = tuple(sorted(usados))
+    return indices
+
+indices_migra_l_acu = indices_mapeo(mapeo_l_acu)
+indices_migra_p_acu = indices_mapeo(mapeo_p_acu)
+indices_migra_l_alc = indices_mapeo(mapeo_l_alc)
+indices_migra_p_alc = indices_mapeo(mapeo_p_alc)
+
+# Destinos compilados: el itemgetter de cada destino extrae de la fila origen, en una sola llamada, la tupla de
+# valores en el orden de los campos destino
+DestinoCompilado = namedtuple('DestinoCompilado', ['capa', 'campos', 'extrae', 'condicion'])
+
+def compila_mapeo(mapeo):
+    return {nombre: [DestinoCompilado(destino.capa, destino.campos, itemgetter(*destino.indices), destino.condicion)
+                     for destino in destinos]
+            for nombre, destinos in mapeo.items()}
+
+destinos_l_acu = compila_mapeo(mapeo_l_acu)
+destinos_p_acu = compila_mapeo(mapeo_p_acu)
+destinos_l_alc = compila_mapeo(mapeo_l_alc)
+destinos_p_alc = compila_mapeo(mapeo_p_alc)
+
+# Migra registro a registro las filas (OID, nombre de la clase, fila) de la fuente a los destinos de su clase
+def migra_registros(filas, lotes, destinos, fuente):
+    escritor = lotes.escritor
+    siguiente = progreso.siguiente
+    for n, (oid, nombre, fila) in enumerate(filas, start=1):
+        for destino in destinos.get(nombre, ()):
+            if cumple_condicion(fila, destino.condicion):
+                escritor.insertar(destino.capa, destino.campos, destino.extrae(fila))
+        lotes.registrado(fuente, oid)
+        if n >= siguiente:
+            siguiente = progreso.avanza(n)
+
+# Verifica antes de empezar que cada capa de entrada tenga los campos que leen la validacion y la migracion segun su
+# origen (shp o gdb), para no fallar a mitad de la ejecucion por un campo con otro nombre
+def verifica_esquemas(fuentes, lector='arcpy'):
+    capas = [(tipo_l_acu, indices_migra_l_acu), (tipo_p_acu, indices_migra_p_acu), (tipo_l_alc, indices_migra_l_alc),
+             (tipo_p_alc, indices_migra_p_alc), (tipo_l_alc, indices_migra_l_alc), (tipo_p_alc, indices_migra_p_alc)]
+    correcto = True
+    for (tipo, indices_migra), fuente in zip(capas, fuentes):
+        if fuente == '':
+            continue
+        orig = origen_datos(fuente)
+        atrib = tipo['atrib'][orig]
+        indices = set(tipo['indices']).union(*indices_migra.values()) - {0}
+        existentes = {nombre.upper() for nombre in nombres_campos(fuente, lector)}
+        faltantes = [atrib[indice] for indice in sorted(indices) if atrib[indice].upper() not in existentes]
+        if faltantes:
+            arcpy.AddError(f'La capa {fuente} (origen {orig}) no tiene los campos: {", ".join(faltantes)}')
+            correcto = False
+    if not correcto:
+        raise ValueError('El esquema de las capas de entrada no coincide con el esperado')
 
 
 # valida que existan datos a mirar de lo contrario False
@@ -1825,50 +2580,449 @@ def datos(clase):
             n = True
     return n
 
-# Migra la informacion de todas las capas
-def migracion_datos(clase_l, clase_p_acu, clase_l_alc, clase_p_alc, l_alc_pluv_orig, p_alc_pluv_orig, workspace):
-    editor = arcpy.da.Editor(workspace)
-    editor.startEditing(with_undo=False, multiuser_mode=False)
-    editor.startOperation()
-
-    if datos(clase_l):
-        migra_l_acu(clase_l, workspace)
-    if datos(clase_p_acu):
-        migra_p_acu(clase_p_acu, workspace)
-    if datos(clase_l_alc):
-        migra_l_alc(clase_l_alc, workspace)
-    if datos(clase_p_alc):
-        migra_p_alc(clase_p_alc, workspace)
-    if datos(l_alc_pluv_orig):
-        migra_l_alc(l_alc_pluv_orig, workspace)
-    if datos(p_alc_pluv_orig):
-        migra_p_alc(p_alc_pluv_orig, workspace)
-
-    editor.stopOperation()
-    editor.stopEditing(save_changes=True)
-
+# La validacion entrega los OIDs de cada clase. Lee de la fuente, con un segundo cursor, la geometria y solo los
+# campos que usa la migracion de las clases con datos, y entrega cada fila (con su OID y su clase) con el ancho de la
+# fila original (los campos no leidos quedan en None), una a la vez y en el orden de la fuente
+def filas_migracion(clase, fuente, atrib, indices_migra):
+    por_oid = {oid: nombre for nombre, oids in clase.items() for oid in oids}
+    indices = sorted(set().union(*(indices_migra.get(nombre, ()) for nombre, oids in clase.items() if oids)) - {0})
+    campos, expande = lectura_migracion(atrib, indices)
+    with abre_lectura(fuente, campos) as cursor:
+        for fila in cursor:
+            nombre = por_oid.pop(fila[0], None)
+            if nombre is not None:
+                yield fila[0], nombre, expande(tuple(fila) + (None,))
+
+# Igual que filas_migracion, pero con un cursor por clase (CLASE = n) y solo con los campos de esa clase
+def filas_migracion_particiones(clase, fuente, atrib, indices_migra, clases):
+    if es_geopackage(fuente):
+        yield from filas_migracion(clase, fuente, atrib, indices_migra)
+        return
+    for valor, nombre in clases.items():
+        if not clase[nombre] or nombre not in indices_migra:
+            continue
+        campos, expande = lectura_migracion(atrib, sorted(set(indices_migra[nombre]) - {0}))
+        with arcpy.da.SearchCursor(fuente, campos, consulta_clase(fuente, atrib[1], valor)) as cursor:
+            for fila in cursor:
+                yield fila[0], nombre, expande(tuple(fila) + (None,))
+
+# Campos del cursor de migracion (OID, geometria y los indices pedidos) y el itemgetter que arma la fila con el
+# ancho de la fila original: las posiciones no leidas apuntan al None agregado al final de la fila leida
+def lectura_migracion(atrib, indices):
+    campos = ['OID@', 'Shape@'] + [atrib[indice] for indice in indices]
+    ubicacion = {0: 1}
+    ubicacion.update({indice: posicion for posicion, indice in enumerate(indices, start=2)})
+    return campos, itemgetter(*(ubicacion.get(indice, len(campos)) for indice in range(len(atrib))))
+
+# ----------------------------- Migracion masiva -----------------------------
+# Cada destino de una clase se carga con un solo Append: la fuente se filtra con una capa temporal (CLASE = n y la
+# condicion del destino) y los campos se pasan con un FieldMappings armado desde el mapeo. Si Append falla, los
+# registros de ese destino quedan pendientes para la migracion registro a registro
+
+# consulta de la condicion de un destino. Los valores de las condiciones son textos: en un campo que no es de texto
+# el valor nunca esta dentro, igual que en la comparacion de Python
+def consulta_condicion(fuente, campo, tipo_campo, condicion):
+    posicion, valores, dentro = condicion
+    if tipo_campo != 'String':
+        return '1 = 0' if dentro else '1 = 1'
+    delimitado = arcpy.AddFieldDelimiters(fuente, campo)
+    lista = ", ".join(texto_sql(valor) for valor in valores)
+    if dentro:
+        return f'{delimitado} IN ({lista})'
+    return f'{delimitado} IS NULL OR {delimitado} NOT IN ({lista})'
+
+def cumple_condicion(fila, condicion):
+    if condicion is None:
+        return True
+    posicion, valores, dentro = condicion
+    return (fila[posicion] in valores) == dentro
+
+def mapeo_campos(fuente, atrib, destino):
+    mapeos = arcpy.FieldMappings()
+    for campo, indice in zip(destino.campos[1:], destino.indices[1:]):
+        mapa = arcpy.FieldMap()
+        mapa.addInputField(fuente, atrib[indice])
+        salida = mapa.outputField
+        salida.name = campo
+        mapa.outputField = salida
+        mapeos.addFieldMap(mapa)
+    return mapeos
+
+# Carga con Append los destinos de las clases con datos; devuelve por clase los destinos que no se pudieron cargar
+# (los destinos ya cargados segun el diario se saltan y los que ya pasaron a registro a registro siguen alli)
+def carga_masiva(clase, fuente, atrib, mapeo, clases, workspace, diario=None):
+    tipos_campo = {campo.name: campo.type for campo in arcpy.ListFields(fuente)}
+    pendientes = {}
+    for valor, nombre in clases.items():
+        if not clase[nombre]:
+            continue
+        for destino in mapeo.get(nombre, ()):
+            estado = diario.estado_destino(fuente, nombre, destino.capa) if diario is not None else None
+            if estado == 'cargado':
+                continue
+            if estado == 'registro':
+                pendientes.setdefault(nombre, []).append(destino)
+                continue
+            consulta = consulta_clase(fuente, atrib[1], valor)
+            if destino.condicion is not None:
+                campo = atrib[destino.condicion[0]]
+                condicion = consulta_condicion(fuente, campo, tipos_campo.get(campo), destino.condicion)
+                consulta = f'{consulta} AND ({condicion})'
+            seleccion = f'seleccion_{destino.capa}'
+            if diario is not None:
+                diario.marca_destino(fuente, nombre, destino.capa, 'cargando')
+            try:
+                arcpy.management.MakeFeatureLayer(fuente, seleccion, consulta)
+                arcpy.management.Append(seleccion, os.path.join(workspace, destino.capa), 'NO_TEST',
+                                        mapeo_campos(fuente, atrib, destino))
+                estado = 'cargado'
+            except arcpy.ExecuteError:
+                arcpy.AddWarning(f'No se pudo cargar {destino.capa} con Append, se migra registro a registro..')
+                pendientes.setdefault(nombre, []).append(destino)
+                estado = 'registro'
+            finally:
+                if arcpy.Exists(seleccion):
+                    arcpy.management.Delete(seleccion)
+            if diario is not None:
+                diario.marca_destino(fuente, nombre, destino.capa, estado)
+    return pendientes
+
+# ----------------------------- Indices durante la carga -----------------------------
+# En modo de carga sin indices se retira el indice espacial (y con 'todos' tambien los indices de atributos) de cada
+# feature class destino antes de cargar y se reconstruye una sola vez al final, en lugar de actualizarlo con cada
+# registro insertado. 'mantener' (por defecto) carga con los indices activos
+modos_indices = ('mantener', 'espacial', 'todos')
+
+IndiceAtributos = namedtuple('IndiceAtributos', ['nombre', 'campos', 'unico', 'ascendente'])
+
+# feature classes destino de las capas con datos
+def capas_destino(capas):
+    destinos = set()
+    for clase, mapeo in capas:
+        if not datos(clase):
+            continue
+        for nombre, oids in clase.items():
+            if oids:
+                destinos.update(destino.capa for destino in mapeo.get(nombre, ()))
+    return sorted(destinos)
+
+# Retira los indices de las capas destino; devuelve, por capa, si tenia indice espacial y los indices de atributos
+# retirados. No se tocan los indices del OID ni de la geometria, ni los indices unicos. Con diario, cada capa se anota
+# antes de retirar sus indices, para reconstruirlos aunque la ejecucion se interrumpa
+def retira_indices(workspace, capas, modo, diario=None):
+    retirados = {}
+    for capa in capas:
+        ruta = os.path.join(workspace, capa)
+        desc = arcpy.Describe(ruta)
+        espacial = getattr(desc, 'hasSpatialIndex', False)
+        atributos = []
+        if modo == 'todos':
+            propios = {desc.OIDFieldName.upper(), desc.shapeFieldName.upper()}
+            for indice in arcpy.ListIndexes(ruta):
+                campos = [campo.name for campo in indice.fields]
+                if indice.isUnique or propios.intersection(campo.upper() for campo in campos):
+                    continue
+                atributos.append(IndiceAtributos(indice.name, campos, indice.isUnique, indice.isAscending))
+        if diario is not None and (espacial or atributos):
+            diario.marca_indices(capa, espacial, atributos)
+        if espacial:
+            arcpy.management.RemoveSpatialIndex(ruta)
+        if atributos:
+            arcpy.management.RemoveIndex(ruta, [indice.nombre for indice in atributos])
+        retirados[capa] = (espacial, atributos)
+    return retirados
+
+# Reconstruye los indices retirados y reporta el tiempo de la reconstruccion
+def reconstruye_indices(workspace, retirados):
+    inicio = perf_counter()
+    for capa, (espacial, atributos) in retirados.items():
+        ruta = os.path.join(workspace, capa)
+        if espacial:
+            arcpy.management.AddSpatialIndex(ruta)
+        for indice in atributos:
+            arcpy.management.AddIndex(ruta, indice.campos, indice.nombre,
+                                      'UNIQUE' if indice.unico else 'NON_UNIQUE',
+                                      'ASCENDING' if indice.ascendente else 'NON_ASCENDING')
+    arcpy.AddMessage(f"Indices de {len(retirados)} capas reconstruidos en {perf_counter() - inicio:.2f} s..")
+
+# Migra la informacion de todas las capas: primero la carga masiva y despues, registro a registro, lo que no se pudo
+# cargar con Append (o todo, con masiva=False). Con indices 'espacial' o 'todos' la carga se hace sin indices. Con
+# un diario, la migracion registro a registro guarda cada `bloque` registros y continua donde quedo el diario. Con
+# `solo` se migran unicamente los registros que van a esas feature classes destino
+def migracion_datos(clase_l, clase_p_acu, clase_l_alc, clase_p_alc, l_alc_pluv_orig, p_alc_pluv_orig, workspace,
+                    fuentes, particionado=False, masiva=True, indices='mantener', diario=None, bloque=0, solo=None):
+    capas = [(clase_l, tipo_l_acu, mapeo_l_acu, destinos_l_acu, indices_migra_l_acu),
+             (clase_p_acu, tipo_p_acu, mapeo_p_acu, destinos_p_acu, indices_migra_p_acu),
+             (clase_l_alc, tipo_l_alc, mapeo_l_alc, destinos_l_alc, indices_migra_l_alc),
+             (clase_p_alc, tipo_p_alc, mapeo_p_alc, destinos_p_alc, indices_migra_p_alc),
+             (l_alc_pluv_orig, tipo_l_alc, mapeo_l_alc, destinos_l_alc, indices_migra_l_alc),
+             (p_alc_pluv_orig, tipo_p_alc, mapeo_p_alc, destinos_p_alc, indices_migra_p_alc)]
+    if solo is not None:
+        capas = [(filtra_clase(clase, mapeo, solo), tipo, filtra_mapeo(mapeo, solo), filtra_mapeo(destinos, solo),
+                  indices_migra) for clase, tipo, mapeo, destinos, indices_migra in capas]
+    if indices not in modos_indices:
+        raise ValueError(f'Modo de indices no soportado: {indices}')
+    retirados = {}
+    if indices != 'mantener':
+        with perfil.etapa('retiro_indices'):
+            retirados = retira_indices(workspace, capas_destino((capa[0], capa[2]) for capa in capas), indices,
+                                       diario)
+    if diario is not None:
+        # incluye los que retiro una ejecucion interrumpida, aunque esta se haga con indices 'mantener'
+        retirados = diario.indices_retirados()
+    try:
+        migra_capas(capas, workspace, fuentes, particionado, masiva, diario, bloque)
+    finally:
+        if retirados:
+            with perfil.etapa('reconstruccion_indices'):
+                reconstruye_indices(workspace, retirados)
+
+# carga masiva y migracion registro a registro de las capas
+def migra_capas(capas, workspace, fuentes, particionado, masiva, diario, bloque):
+    por_registro = []
+    for (clase, tipo, mapeo, destinos, indices_migra), fuente in zip(capas, fuentes):
+        if datos(clase):
+            atrib = tipo['atrib'][origen_datos(fuente)]
+            pendientes = None
+            # los GeoPackages se migran registro a registro, decodificando la geometria de cada blob
+            if masiva and not es_geopackage(fuente):
+                with perfil.etapa('carga_masiva', os.path.basename(fuente), sum(map(len, clase.values()))):
+                    pendientes = carga_masiva(clase, fuente, atrib, mapeo, tipo['clases'], workspace, diario)
+            if pendientes is None:
+                por_registro.append((clase, tipo, destinos, indices_migra, fuente, atrib))
+            elif pendientes:
+                # solo los destinos que fallaron
+                clase = {nombre: (oids if nombre in pendientes else []) for nombre, oids in clase.items()}
+                destinos = compila_mapeo(pendientes)
+                por_registro.append((clase, tipo, destinos, indices_migra, fuente, atrib))
+    if not por_registro:
+        return
+
+    try:
+        with MigracionPorLotes(workspace, diario, bloque) as lotes:
+            for clase, tipo, destinos, indices_migra, fuente, atrib in por_registro:
+                if particionado:
+                    filas = filas_migracion_particiones(clase, fuente, atrib, indices_migra, tipo['clases'])
+                else:
+                    filas = filas_migracion(clase, fuente, atrib, indices_migra)
+                completados = diario.completados(fuente) if diario is not None else None
+                if completados:
+                    arcpy.AddMessage(f"{len(completados)} registros de {fuente} ya migrados segun el diario..")
+                    filas = (fila for fila in filas if fila[0] not in completados)
+                por_migrar = sum(map(len, clase.values())) - (len(completados) if completados else 0)
+                progreso.inicia(f'Migrando {os.path.basename(fuente)}', por_migrar)
+                with perfil.etapa('migracion', os.path.basename(fuente)) as etapa:
+                    antes = lotes.total
+                    migra_registros(filas, lotes, destinos, fuente)
+                    etapa['registros'] = lotes.total - antes
+    finally:
+        progreso.termina()
+
+
+# ----------------------------- Migracion en paralelo -----------------------------
+# Las feature classes destino se reparten entre procesos. Cada proceso migra sus destinos (carga masiva y registro a
+# registro) en su propia copia de la GDB vacia, en una carpeta temporal, y al final cada feature class se pasa a la GDB
+# de salida con un solo Append. Se reporta el tiempo de los procesos, la suma de sus tiempos (lo que tardaria la
+# migracion en serie) y el tiempo de la fusion
+
+# solo los destinos que estan en `capas`
+def filtra_mapeo(mapeo, capas):
+    return {nombre: [destino for destino in destinos if destino.capa in capas] for nombre, destinos in mapeo.items()}
+
+# solo los OIDs de las clases que tienen algun destino en `capas`
+def filtra_clase(clase, mapeo, capas):
+    if not datos(clase):
+        return clase
+    return {nombre: (oids if any(destino.capa in capas for destino in mapeo.get(nombre, ())) else [])
+            for nombre, oids in clase.items()}
+
+# Reparte los destinos en a lo sumo `procesos` grupos de carga parecida: cada destino pesa los registros de las clases
+# que van a el y se asigna, del mas pesado al mas liviano, al grupo con menos carga
+def grupos_migracion(clases, procesos):
+    mapeos = (mapeo_l_acu, mapeo_p_acu, mapeo_l_alc, mapeo_p_alc, mapeo_l_alc, mapeo_p_alc)
+    pesos = {}
+    for clase, mapeo in zip(clases, mapeos):
+        if not datos(clase):
+            continue
+        for nombre, oids in clase.items():
+            for destino in mapeo.get(nombre, ()):
+                if oids:
+                    pesos[destino.capa] = pesos.get(destino.capa, 0) + len(oids)
+    grupos = [[] for _ in range(min(procesos, len(pesos)))]
+    cargas = [0] * len(grupos)
+    for capa in sorted(pesos, key=lambda capa: (-pesos[capa], capa)):
+        menor = cargas.index(min(cargas))
+        grupos[menor].append(capa)
+        cargas[menor] += pesos[capa]
+    return grupos
+
+def migra_grupo_proceso(clases, fuentes, plantilla, grupo, particionado, indices, bloque):
+    carpeta = tempfile.mkdtemp(prefix='migracion_')
+    salida = os.path.join(carpeta, 'GDB_Cargue.gdb')
+    try:
+        shutil.copytree(plantilla, salida, ignore=shutil.ignore_patterns('*.lock'))
+        inicio = perf_counter()
+        migracion_datos(*clases, salida, fuentes, particionado, indices=indices, bloque=bloque, solo=set(grupo))
+    except BaseException:
+        # si el grupo falla su copia de la GDB no llega al proceso principal, que no podria borrarla
+        shutil.rmtree(carpeta, ignore_errors=True)
+        raise
+    return salida, perf_counter() - inicio
+
+def migracion_paralela(clases, workspace, fuentes, particionado, indices, bloque, procesos):
+    inicio = perf_counter()
+    salida_estr = estruc_vacia_bd(workspace)
+    grupos = grupos_migracion(clases, procesos)
+    if not grupos:
+        return salida_estr
+    parciales = []
+    try:
+        pool = pool_procesos(len(grupos))
+        try:
+            tareas = [pool.apply_async(migra_grupo_proceso, (clases, fuentes, salida_estr, grupo, particionado,
+                                                              'mantener', bloque))
+                      for grupo in grupos]
+            pool.close()
+            # si un grupo falla se esperan los demas, para que sus copias de la GDB queden en parciales y se borren
+            error = None
+            for tarea in tareas:
+                try:
+                    parciales.append(tarea.get())
+                except Exception as falla:
+                    error = error or falla
+            if error is not None:
+                raise error
+        finally:
+            pool.terminate()
+            pool.join()
+        fin_procesos = perf_counter()
+
+        retirados = retira_indices(salida_estr, sorted(capa for grupo in grupos for capa in grupo), indices) \
+            if indices != 'mantener' else {}
+        try:
+            for grupo, (parcial, _) in zip(grupos, parciales):
+                for capa in grupo:
+                    arcpy.management.Append(os.path.join(parcial, capa), os.path.join(salida_estr, capa), 'NO_TEST')
+        finally:
+            if retirados:
+                reconstruye_indices(salida_estr, retirados)
+    finally:
+        for parcial, _ in parciales:
+            shutil.rmtree(os.path.dirname(parcial), ignore_errors=True)
+    fin = perf_counter()
+
+    en_serie = sum(segundos for _, segundos in parciales)
+    arcpy.AddMessage(f"Migracion en paralelo de {sum(map(len, grupos))} capas en {len(grupos)} procesos: "
+                     f"{fin_procesos - inicio:.2f} s (los procesos suman {en_serie:.2f} s), "
+                     f"fusion {fin - fin_procesos:.2f} s, "
+                     f"total {fin - inicio:.2f} s ({en_serie / max(fin - inicio, 1e-9):.1f}x)..")
+    return salida_estr
 
 # ------------------------------------- EJECUCION PRINCIPAL -------------------------------------
+# registros por bloque de la migracion registro a registro
+bloque_migracion = 50000
+
+# Crea la GDB de salida con su diario, o si en el workspace quedo el diario de una ejecucion interrumpida con las
+# mismas capas de entrada, la reutiliza para continuar la migracion (salvo que el diario no sepa que quedo en la GDB)
+def prepara_migracion(workspace, fuentes):
+    diario = DiarioMigracion(os.path.join(workspace, 'GDB_Cargue_diario.sqlite'))
+    salida_estr = os.path.join(workspace, 'GDB_Cargue.gdb')
+    if diario.reanudable(fuentes) and os.path.isdir(salida_estr):
+        if not diario.incierto():
+            arcpy.AddMessage("Continuando la migracion interrumpida segun el diario..")
+            return salida_estr, diario
+        arcpy.AddWarning("La ejecucion interrumpida no alcanzo a anotar en el diario su ultima carga, "
+                         "la migracion empieza de nuevo..")
+    diario.inicia(fuentes)
+    return estruc_vacia_bd(workspace), diario
+
+# con procesos_migracion > 1 la migracion se hace en paralelo (sin diario: una ejecucion interrumpida empieza de nuevo)
+def migra_con_diario(clases, workspace, fuentes, motor, indices, bloque, procesos_migracion=0):
+    if indices not in modos_indices:
+        raise ValueError(f'Modo de indices no soportado: {indices}')
+    if procesos_migracion > 1:
+        # el diario de una ejecucion en serie interrumpida no sirve para la GDB que se rehace aqui: la siguiente
+        # ejecucion en serie continuaria sobre una GDB ya completa y duplicaria los registros
+        diario = os.path.join(workspace, 'GDB_Cargue_diario.sqlite')
+        if os.path.exists(diario):
+            os.remove(diario)
+        with perfil.etapa('migracion_paralela'):
+            migracion_paralela(clases, workspace, fuentes, motor == 'particiones', indices, bloque, procesos_migracion)
+        return
+    inicio = perf_counter()
+    workspace, diario = prepara_migracion(workspace, fuentes)
+    terminado = False
+    try:
+        migracion_datos(*clases, workspace, fuentes, motor == 'particiones', indices=indices, diario=diario,
+                        bloque=bloque)
+        terminado = True
+    finally:
+        diario.cerrar(terminado)
+    arcpy.AddMessage(f"Migracion en serie: {perf_counter() - inicio:.2f} s..")
+
 # funcion que recoje la informacion de validacion y migracion de informacion
-def script_tool(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace, migr_adver):
-    # Validacion de la estructura de la informacion
-    clase_l, er_l_acu, clase_p_acu, er_p_acu, clase_l_alc, er_l_alc, clase_p_alc, er_p_alc,clase_l_alc_pluv, error_clase_l_alc_pluv, clase_p_alc_pluv, error_clase_p_alc_pluv  = validacion_estruct(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace)
-
-    if migr_adver == 'true':
-        # Creando la gdb con la estructura vacia correspondiente
-        workspace = estruc_vacia_bd(workspace)
-        # OJO NO OLVIDAR VALIDAR QUE SI HAY ERRORES NO SE REALICE LA MIRACION DE INFO..
-        migracion_datos(clase_l, clase_p_acu, clase_l_alc, clase_p_alc, clase_l_alc_pluv, clase_p_alc_pluv, workspace)
-    else:
-        if er_l_acu == 0 and er_p_acu == 0 and er_l_alc == 0 and er_p_alc == 0 and error_clase_l_alc_pluv == 0 and error_clase_p_alc_pluv == 0:
-            # Creando la gdb con la estructura vacia correspondiente
-            workspace = estruc_vacia_bd(workspace)
+def script_tool(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace, migr_adver,
+                motor='python', procesos=0, indices='mantener', bloque=bloque_migracion, procesos_migracion=0,
+                lector='arcpy', perfilado=None, salida_errores='csv'):
+    fuentes = (l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig)
+    # el perfil se escribe aunque la ejecucion falle, para ver en que etapa se fue el tiempo
+    perfil.reinicia(perfilado or os.environ.get('CARGUE_PERFILADO') or 'ninguno')
+    try:
+        with perfil.etapa('esquemas'):
+            verifica_esquemas(fuentes, lector)
+
+        # Validacion de la estructura de la informacion
+        clase_l, er_l_acu, clase_p_acu, er_p_acu, clase_l_alc, er_l_alc, clase_p_alc, er_p_alc,clase_l_alc_pluv, error_clase_l_alc_pluv, clase_p_alc_pluv, error_clase_p_alc_pluv  = validacion_estruct(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace, migr_adver, motor, procesos, lector, salida_errores)
+
+        clases = (clase_l, clase_p_acu, clase_l_alc, clase_p_alc, clase_l_alc_pluv, clase_p_alc_pluv)
+        if migr_adver == 'true':
+            # Creando (o retomando) la gdb con la estructura vacia correspondiente y migrando
             # OJO NO OLVIDAR VALIDAR QUE SI HAY ERRORES NO SE REALICE LA MIRACION DE INFO..
-            migracion_datos(clase_l, clase_p_acu, clase_l_alc, clase_p_alc, clase_l_alc_pluv, clase_p_alc_pluv, workspace)
+            migra_con_diario(clases, workspace, fuentes, motor, indices, bloque, procesos_migracion)
         else:
-            arcpy.AddWarning("Revise la ruta de salida para conocer los detalles de las inconsistencias..")
+            if er_l_acu == 0 and er_p_acu == 0 and er_l_alc == 0 and er_p_alc == 0 and error_clase_l_alc_pluv == 0 and error_clase_p_alc_pluv == 0:
+                # Creando (o retomando) la gdb con la estructura vacia correspondiente y migrando
+                # OJO NO OLVIDAR VALIDAR QUE SI HAY ERRORES NO SE REALICE LA MIRACION DE INFO..
+                migra_con_diario(clases, workspace, fuentes, motor, indices, bloque, procesos_migracion)
+            else:
+                arcpy.AddWarning("Revise la ruta de salida para conocer los detalles de las inconsistencias..")
+    finally:
+        perfil.termina(workspace)
+
+# Validacion desde la consola, sin migrar (por ejemplo en Linux sin ArcGIS, con el lector dbf). Devuelve 1 si alguna
+# capa tiene errores
+def valida_consola(argumentos=None):
+    parser = argparse.ArgumentParser(description='Valida la estructura de las capas de una entrega sin migrarlas')
+    parser.add_argument('salida', help='carpeta donde se escriben los archivos Inconsistencias_*.csv (o la base '
+                                           'Inconsistencias.sqlite)')
+    for nombre, capa in (('l_acu', 'lineas de acueducto'), ('p_acu', 'nodos de acueducto'),
+                         ('l_alc', 'lineas de alcantarillado'), ('p_alc', 'nodos de alcantarillado'),
+                         ('l_alc_pluv', 'lineas de alcantarillado pluvial'),
+                         ('p_alc_pluv', 'nodos de alcantarillado pluvial')):
+        parser.add_argument(f'--{nombre}', default='', help=f'capa de {capa}')
+    parser.add_argument('--motor', choices=motores_validacion, default='python')
+    parser.add_argument('--procesos', type=int, default=0)
+    parser.add_argument('--lector', choices=lectores, default=lector_predeterminado)
+    parser.add_argument('--perfilado', choices=modos_perfilado,
+                        default=os.environ.get('CARGUE_PERFILADO') or 'ninguno')
+    parser.add_argument('--salida-errores', choices=salidas_errores, default='csv')
+    args = parser.parse_args(argumentos)
+
+    fuentes = (args.l_acu, args.p_acu, args.l_alc, args.p_alc, args.l_alc_pluv, args.p_alc_pluv)
+    perfil.reinicia(args.perfilado)
+    try:
+        with perfil.etapa('esquemas'):
+            verifica_esquemas(fuentes, args.lector)
+        resultado = validacion_estruct(*fuentes, args.salida, 'false', args.motor, args.procesos, args.lector,
+                                       args.salida_errores)
+    finally:
+        perfil.termina(args.salida)
+    return 1 if any(resultado[1::2]) else 0
 
 if __name__ == "__main__":
+    if not hay_arcpy:
+        # sin ArcGIS el script se usa desde la consola y solo valida
+        sys.exit(valida_consola())
     workspace = arcpy.GetParameterAsText(0)
     l_acu_orig = arcpy.GetParameterAsText(1)
     p_acu_orig = arcpy.GetParameterAsText(2)
@@ -1877,8 +3031,32 @@ if __name__ == "__main__":
     l_alc_pluv_orig = arcpy.GetParameterAsText(5)
     p_alc_pluv_orig = arcpy.GetParameterAsText(6)
     migr_adver = arcpy.GetParameterAsText(7)
+    # parametro opcional: motor de validacion ('python' por defecto, 'numpy', 'particiones' o 'sql')
+    motor = arcpy.GetParameterAsText(8) if arcpy.GetArgumentCount() > 8 else ''
+    # parametro opcional: numero de procesos para validar las capas en paralelo (vacio o 1 valida en secuencia)
+    procesos = arcpy.GetParameterAsText(9) if arcpy.GetArgumentCount() > 9 else ''
+    # parametro opcional: indices durante la carga ('mantener' por defecto, 'espacial' o 'todos' los retira y los
+    # reconstruye al final)
+    indices = arcpy.GetParameterAsText(10) if arcpy.GetArgumentCount() > 10 else ''
+    # parametro opcional: registros por bloque de la migracion registro a registro (0 guarda todo al final)
+    bloque = arcpy.GetParameterAsText(11) if arcpy.GetArgumentCount() > 11 else ''
+    # parametro opcional: numero de procesos para migrar en paralelo por feature class destino (vacio o 1 en serie)
+    procesos_migracion = arcpy.GetParameterAsText(12) if arcpy.GetArgumentCount() > 12 else ''
+    # parametro opcional: lector de los atributos en la validacion ('arcpy' por defecto o 'dbf' para leer los .shp
+    # sin cursores de arcpy, solo con el motor python)
+    lector = arcpy.GetParameterAsText(13) if arcpy.GetArgumentCount() > 13 else ''
+    # parametro opcional: perfilado ('ninguno' por defecto, 'cprofile' escribe Perfil_Cargue.pstats en el workspace,
+    # 'memoria' mide con tracemalloc el pico y los sitios de asignacion por etapa, 'completo' los dos). Vacio usa la
+    # variable de entorno CARGUE_PERFILADO
+    perfilado = arcpy.GetParameterAsText(14) if arcpy.GetArgumentCount() > 14 else ''
+    # parametro opcional: salida de los errores ('csv' por defecto, un Inconsistencias_{capa}.csv por capa, 'sqlite'
+    # una base Inconsistencias.sqlite con indices para filtrar o 'nula' que solo los cuenta)
+    salida_errores = arcpy.GetParameterAsText(15) if arcpy.GetArgumentCount() > 15 else ''
 
     arcpy.AddMessage(f"Ruta de la GDB de salida:\n{workspace}")
 
-    script_tool(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace, migr_adver)
+    script_tool(l_acu_orig, p_acu_orig, l_alc_orig, p_alc_orig, l_alc_pluv_orig, p_alc_pluv_orig, workspace, migr_adver,
+                motor or 'python', int(procesos or 0), indices or 'mantener',
+                int(bloque) if bloque != '' else bloque_migracion, int(procesos_migracion or 0), lector or 'arcpy',
+                perfilado or None, salida_errores or 'csv')
     #arcpy.SetParameterAsText(2, "Result")
\ No newline at end of file
@@ -0,0 +1,457 @@
+"""
+Sustituto en memoria de arcpy para ejecutar Cargue_Acueducto sin ArcGIS (pruebas de rendimiento en Linux)
+
+- Cargue_Acueducto lo usa como acceso a datos con la variable de entorno CARGUE_ACCESO=memoria; tambien se puede
+  llamar a instala(), que registra este modulo como 'arcpy' en sys.modules, antes de importar Cargue_Acueducto
+- Las tablas se guardan por columnas: cada columna es un arreglo de codigos que apuntan a una lista de valores. Se
+  registran con registra_tabla (columnas ya codificadas) o carga_capa (filas)
+- Las inserciones se cuentan por feature class destino en `insertados`; con guarda_filas = True tambien se guardan
+  las filas en `escritas`. Dentro de una sesion de Editor solo se aplican al guardar los cambios
+- Solo implementa las funciones de arcpy que usa Cargue_Acueducto, en un solo proceso (la validacion y la migracion
+  en paralelo necesitan arcpy). Las geometrias son el OID del registro
+"""
+import os, re, shutil, sys, types
+from array import array
+from datetime import datetime
+from itertools import compress
+
+tablas = {}      # ruta -> Tabla
+capas = {}       # nombre de la capa temporal -> (ruta, consulta)
+insertados = {}  # ruta de la feature class destino -> registros insertados
+escritas = {}    # ruta de la feature class destino -> [(campos, fila)], solo con guarda_filas
+mensajes = []    # (tipo, mensaje) con tipo 'M', 'W' o 'E'
+# barra de progreso: tipo, etiqueta, rango, posicion y cantidad de actualizaciones
+progresor = types.SimpleNamespace(tipo=None, etiqueta='', minimo=0, maximo=0, posicion=0, actualizaciones=0)
+guarda_filas = False
+# sesion de edicion abierta y sus inserciones pendientes: filas [(ruta, campos, fila)] con guarda_filas, si no solo
+# la cantidad por ruta
+edicion = types.SimpleNamespace(abierta=False, pendientes=[], cuentas={})
+
+class ExecuteError(Exception):
+    pass
+
+env = types.SimpleNamespace(workspace=None, overwriteOutput=True)
+
+def limpia():
+    tablas.clear()
+    capas.clear()
+    insertados.clear()
+    escritas.clear()
+    mensajes.clear()
+    edicion.abierta = False
+    edicion.pendientes.clear()
+    ResetProgressor()
+    progresor.actualizaciones = 0
+    edicion.cuentas.clear()
+
+# ------------------------------------- TABLAS -------------------------------------
+# campos: nombres de los atributos en orden; tipos: tipo de campo de arcpy de cada atributo; columnas: arreglo de
+# codigos por atributo; valores: lista de valores por atributo (el codigo es la posicion en la lista). El OID va de 1
+# a n y se lee con 'OID@' o con el nombre del campo OID
+class Tabla:
+    def __init__(self, campos, tipos, columnas, valores, campo_oid='OBJECTID'):
+        self.campos = list(campos)
+        self.tipos = dict(tipos)
+        self.columnas = columnas
+        self.valores = valores
+        self.campo_oid = campo_oid
+        self.filas = len(next(iter(columnas.values()))) if columnas else 0
+        self.nombres = {campo.upper(): campo for campo in self.campos}
+
+    def columna(self, campo):
+        nombre = campo.upper()
+        if nombre in ('OID@', self.campo_oid.upper()) or nombre == 'SHAPE@':
+            return range(1, self.filas + 1)
+        real = self.nombres.get(nombre)
+        if real is None:
+            raise RuntimeError(f'Cannot find field {campo}')
+        return map(self.valores[real].__getitem__, self.columnas[real])
+
+    def tipo(self, campo):
+        nombre = campo.upper()
+        if nombre in ('OID@', self.campo_oid.upper()):
+            return 'OID'
+        return self.tipos[self.nombres[nombre]]
+
+def registra_tabla(ruta, campos, tipos, columnas, valores, campo_oid='OBJECTID'):
+    tablas[ruta] = Tabla(campos, tipos, columnas, valores, campo_oid)
+    return tablas[ruta]
+
+# tipo de campo de arcpy para los valores de una columna
+def tipo_valores(valores):
+    presentes = [valor for valor in valores if valor is not None]
+    if presentes and all(isinstance(valor, datetime) for valor in presentes):
+        return 'Date'
+    if presentes and all(isinstance(valor, int) and not isinstance(valor, bool) for valor in presentes):
+        return 'Integer'
+    if presentes and all(isinstance(valor, (int, float)) for valor in presentes):
+        return 'Double'
+    return 'String'
+
+# Registra una tabla a partir de sus filas (tuplas con los valores de `campos`); los tipos que no se indican se
+# deducen de los valores. Las columnas pasan a arreglos de 32 bits cuando tienen mas de 65.536 valores distintos
+def carga_capa(ruta, campos, filas, campo_oid='OBJECTID', tipos=None):
+    columnas = {campo: array('H') for campo in campos}
+    valores = {campo: [None] for campo in campos}
+    codigos = {campo: {(type(None), None): 0} for campo in campos}
+    for fila in filas:
+        for campo, valor in zip(campos, fila):
+            # 0, 0.0 y False son la misma llave de diccionario: se distinguen por el tipo
+            llave = (valor.__class__, valor)
+            codigo = codigos[campo].get(llave)
+            if codigo is None:
+                codigo = codigos[campo][llave] = len(valores[campo])
+                valores[campo].append(valor)
+                if codigo == 0x10000:
+                    columnas[campo] = array('L', columnas[campo])
+            columnas[campo].append(codigo)
+    tipos = dict(tipos or {})
+    for campo in campos:
+        tipos.setdefault(campo, tipo_valores(valores[campo]))
+    return registra_tabla(ruta, campos, tipos, columnas, valores, campo_oid)
+
+def tabla(ruta):
+    if ruta in capas:
+        ruta = capas[ruta][0]
+    if ruta not in tablas:
+        raise ExecuteError(f'ERROR 000732: Dataset {ruta} does not exist or is not supported')
+    return tablas[ruta]
+
+# ------------------------------------- CONSULTAS SQL -------------------------------------
+# Traduce las consultas que arma Cargue_Acueducto (=, <>, IN, NOT IN, IS NULL, AND, OR, NOT y parentesis) a una
+# funcion de Python sobre los valores de los campos que usa. Una comparacion con NULL es falsa
+tokens_sql = re.compile(r"\s*(?:('(?:[^']|'')*')|(-?\d+(?:\.\d+)?)|(<>|!=|<=|>=|=|<|>|\(|\)|,)|(\w+))")
+palabras_sql = {'AND': 'and', 'OR': 'or', 'NOT': 'not'}
+comparaciones = {'=': '__eq__', '<>': '__ne__', '!=': '__ne__', '<': '__lt__', '>': '__gt__', '<=': '__le__',
+                 '>=': '__ge__'}
+cache_consultas = {}
+
+def compara(operador, valor, literal):
+    if valor is None:
+        return False
+    resultado = getattr(valor, comparaciones[operador])(literal)
+    return False if resultado is NotImplemented else resultado
+
+def compila_consulta(consulta, tabla_consulta):
+    clave = (consulta, id(tabla_consulta))
+    if clave in cache_consultas:
+        return cache_consultas[clave]
+    partes = []
+    posicion = 0
+    while posicion < len(consulta.rstrip()):
+        encontrado = tokens_sql.match(consulta, posicion)
+        if encontrado is None:
+            raise ExecuteError(f'An invalid SQL statement was used: {consulta}')
+        partes.append(encontrado.groups())
+        posicion = encontrado.end()
+
+    campos = []
+    salida = []
+    k = 0
+    def literal(parte):
+        texto, numero = parte[0], parte[1]
+        if texto is not None:
+            return repr(texto[1:-1].replace("''", "'"))
+        return numero
+    while k < len(partes):
+        texto, numero, operador, palabra = partes[k]
+        clave_palabra = palabra.upper() if palabra else None
+        if clave_palabra in palabras_sql:
+            salida.append(palabras_sql[clave_palabra])
+            k += 1
+        elif operador in ('(', ')'):
+            salida.append(operador)
+            k += 1
+        elif palabra is not None:
+            if palabra not in campos:
+                campos.append(palabra)
+            valor = f'v[{campos.index(palabra)}]'
+            siguiente = partes[k + 1] if k + 1 < len(partes) else (None, None, None, None)
+            clave_siguiente = (siguiente[3] or '').upper()
+            if clave_siguiente == 'IS':
+                negado = (partes[k + 2][3] or '').upper() == 'NOT'
+                salida.append(f'({valor} is {"not " if negado else ""}None)')
+                k += 4 if negado else 3
+            elif clave_siguiente in ('IN', 'NOT'):
+                negado = clave_siguiente == 'NOT'
+                k += 4 if negado else 3
+                literales = []
+                while partes[k][2] != ')':
+                    if partes[k][2] != ',':
+                        literales.append(literal(partes[k]))
+                    k += 1
+                k += 1
+                lista = f'({", ".join(literales)},)'
+                salida.append(f'({valor} is not None and {valor} {"not in" if negado else "in"} {lista})')
+            else:
+                salida.append(f'compara({siguiente[2]!r}, {valor}, {literal(partes[k + 2])})')
+                k += 3
+        else:
+            # literal a la izquierda: solo '1 = 0' o '1 = 1'
+            salida.append(f'({literal(partes[k])} {"==" if partes[k + 1][2] == "=" else "!="} '
+                          f'{literal(partes[k + 2])})')
+            k += 3
+    funcion = eval(f'lambda v: bool({" ".join(salida)})', {'compara': compara})
+    cache_consultas[clave] = (campos, funcion)
+    return campos, funcion
+
+def filas_tabla(tabla_consulta, campos, consulta=None):
+    filas = zip(*(tabla_consulta.columna(campo) for campo in campos))
+    if not consulta:
+        return filas
+    campos_consulta, funcion = compila_consulta(consulta, tabla_consulta)
+    seleccion = map(funcion, zip(*(tabla_consulta.columna(campo) for campo in campos_consulta)))
+    return compress(filas, seleccion)
+
+# ------------------------------------- CURSORES -------------------------------------
+class SearchCursor:
+    def __init__(self, ruta, campos, where_clause=None, **opciones):
+        consulta = where_clause
+        if ruta in capas and capas[ruta][1]:
+            consulta = f'({capas[ruta][1]}) AND ({where_clause})' if where_clause else capas[ruta][1]
+        self.filas = filas_tabla(tabla(ruta), campos, consulta)
+
+    def __iter__(self):
+        return self.filas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+# aplica inserciones en una feature class destino
+def escribe(ruta, campos, filas):
+    cantidad = 0
+    guardadas = escritas.setdefault(ruta, []) if guarda_filas else None
+    for fila in filas:
+        cantidad += 1
+        if guardadas is not None:
+            guardadas.append((tuple(campos), tuple(fila)))
+    insertados[ruta] = insertados.get(ruta, 0) + cantidad
+
+class InsertCursor:
+    def __init__(self, ruta, campos):
+        self.ruta = ruta
+        self.campos = tuple(campos)
+        insertados.setdefault(ruta, 0)
+
+    def insertRow(self, fila):
+        if len(fila) != len(self.campos):
+            raise RuntimeError('sequence size must match size of the row')
+        if not edicion.abierta:
+            escribe(self.ruta, self.campos, [fila])
+        elif guarda_filas:
+            edicion.pendientes.append((self.ruta, self.campos, fila))
+        else:
+            edicion.cuentas[self.ruta] = edicion.cuentas.get(self.ruta, 0) + 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+class Editor:
+    def __init__(self, workspace):
+        self.workspace = workspace
+
+    def startEditing(self, with_undo=True, multiuser_mode=True):
+        edicion.abierta = True
+        edicion.pendientes.clear()
+        edicion.cuentas.clear()
+
+    def startOperation(self):
+        pass
+
+    def stopOperation(self):
+        pass
+
+    def stopEditing(self, save_changes=True):
+        pendientes, edicion.pendientes = edicion.pendientes, []
+        cuentas, edicion.cuentas = edicion.cuentas, {}
+        edicion.abierta = False
+        if save_changes:
+            for ruta, campos, fila in pendientes:
+                escribe(ruta, campos, [fila])
+            for ruta, cantidad in cuentas.items():
+                insertados[ruta] = insertados.get(ruta, 0) + cantidad
+
+# con los nulos de los campos de texto reemplazados por null_value, como TableToNumPyArray
+def TableToNumPyArray(ruta, campos, where_clause=None, skip_nulls=False, null_value=None):
+    import numpy as np
+
+    tabla_consulta = tabla(ruta)
+    nulos = null_value or {}
+    columnas = []
+    for campo in campos:
+        valores = list(filas_tabla(tabla_consulta, [campo], where_clause))
+        valores = [valor for valor, in valores]
+        if any(valor is None for valor in valores):
+            if campo not in nulos:
+                raise RuntimeError(f'Null value in field {campo}: use null_value')
+            valores = [nulos[campo] if valor is None else valor for valor in valores]
+        tipo = tabla_consulta.tipo(campo)
+        if tipo == 'String':
+            columnas.append((campo, np.array(valores, dtype=str)))
+        elif tipo == 'Date':
+            columnas.append((campo, np.array(valores, dtype='datetime64[us]')))
+        elif tipo in ('OID', 'Integer', 'SmallInteger'):
+            columnas.append((campo, np.array(valores, dtype='i4')))
+        else:
+            columnas.append((campo, np.array(valores, dtype='f8')))
+    arreglo = np.zeros(len(columnas[0][1]) if columnas else 0, dtype=[(campo, c.dtype) for campo, c in columnas])
+    for campo, columna in columnas:
+        arreglo[campo] = columna
+    return arreglo
+
+da = types.SimpleNamespace(SearchCursor=SearchCursor, InsertCursor=InsertCursor, Editor=Editor,
+                           TableToNumPyArray=TableToNumPyArray)
+
+# ------------------------------------- DESCRIPCION -------------------------------------
+class Field:
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+        self.editable = type not in ('OID', 'Geometry')
+
+def ListFields(ruta):
+    tabla_consulta = tabla(ruta)
+    campos = [Field(tabla_consulta.campo_oid, 'OID'), Field('Shape', 'Geometry')]
+    return campos + [Field(campo, tabla_consulta.tipos[campo]) for campo in tabla_consulta.campos]
+
+def ListIndexes(ruta):
+    return []
+
+def Describe(ruta):
+    tabla_consulta = tablas.get(ruta)
+    return types.SimpleNamespace(name=os.path.basename(ruta), catalogPath=ruta, hasSpatialIndex=False,
+                                 OIDFieldName=tabla_consulta.campo_oid if tabla_consulta else 'OBJECTID',
+                                 shapeFieldName='Shape')
+
+def Exists(ruta):
+    return ruta in capas or ruta in tablas or ruta in insertados or os.path.exists(ruta)
+
+def AddFieldDelimiters(datasource, campo):
+    return campo
+
+# ------------------------------------- GEOPROCESOS -------------------------------------
+class FieldMap:
+    def __init__(self):
+        self.entradas = []
+        self.outputField = None
+
+    def addInputField(self, tabla_entrada, campo):
+        self.entradas.append((tabla_entrada, campo))
+        if self.outputField is None:
+            self.outputField = Field(campo, 'String')
+
+class FieldMappings:
+    def __init__(self):
+        self.fieldMappings = []
+
+    def addFieldMap(self, mapa):
+        self.fieldMappings.append(mapa)
+
+def crea_gdb(carpeta, nombre, version=None):
+    os.makedirs(os.path.join(carpeta, nombre), exist_ok=True)
+
+def importa_xml(gdb, xml, modo='SCHEMA_ONLY'):
+    pass
+
+def crea_capa(ruta, nombre, consulta=None):
+    tabla(ruta)
+    capas[nombre] = (ruta, consulta)
+
+# Append desde una capa temporal con un FieldMappings (como lo usa la carga masiva)
+def agrega(entrada, destino, schema_type='TEST', field_mapping=None, *otros):
+    if entrada in capas:
+        ruta, consulta = capas[entrada]
+        mapas = field_mapping.fieldMappings if field_mapping is not None else []
+        campos = ('Shape@',) + tuple(mapa.outputField.name for mapa in mapas)
+        lectura = ['Shape@'] + [mapa.entradas[0][1] for mapa in mapas]
+        escribe(destino, campos, filas_tabla(tablas[ruta], lectura, consulta))
+    elif entrada in insertados:
+        escribe(destino, (), ())
+        insertados[destino] += insertados[entrada]
+        if guarda_filas:
+            escritas.setdefault(destino, []).extend(escritas.get(entrada, ()))
+    else:
+        raise ExecuteError(f'ERROR 000732: Input Datasets: Dataset {entrada} does not exist or is not supported')
+
+# como el Result de GetCount: el primer elemento es la cantidad como texto
+def cuenta(ruta):
+    if ruta in insertados and ruta not in tablas and ruta not in capas:
+        return [str(insertados[ruta])]
+    consulta = capas[ruta][1] if ruta in capas else None
+    return [str(sum(1 for _ in filas_tabla(tabla(ruta), ['OID@'], consulta)))]
+
+# borra una capa temporal o una GDB en disco (con las feature classes insertadas en ella)
+def borra(nombre, *otros):
+    capas.pop(nombre, None)
+    if os.path.isdir(nombre):
+        shutil.rmtree(nombre)
+        for ruta in [ruta for ruta in insertados if ruta.startswith(nombre + os.sep)]:
+            del insertados[ruta]
+            escritas.pop(ruta, None)
+
+def sin_efecto(*argumentos, **opciones):
+    pass
+
+management = types.SimpleNamespace(CreateFileGDB=crea_gdb, ImportXMLWorkspaceDocument=importa_xml,
+                                   MakeFeatureLayer=crea_capa, Append=agrega, Delete=borra, GetCount=cuenta,
+                                   RemoveSpatialIndex=sin_efecto, AddSpatialIndex=sin_efecto,
+                                   RemoveIndex=sin_efecto, AddIndex=sin_efecto)
+
+def FromWKB(wkb, spatial_reference=None):
+    return bytes(wkb)
+
+def SpatialReference(codigo):
+    return codigo
+
+# ------------------------------------- MENSAJES Y PARAMETROS -------------------------------------
+def AddMessage(mensaje):
+    mensajes.append(('M', mensaje))
+
+def AddWarning(mensaje):
+    mensajes.append(('W', mensaje))
+
+def AddError(mensaje):
+    mensajes.append(('E', mensaje))
+
+def SetProgressor(tipo, mensaje='', minimo=0, maximo=100, paso=1):
+    progresor.tipo, progresor.etiqueta, progresor.minimo, progresor.maximo = tipo, mensaje, minimo, maximo
+    progresor.posicion = minimo
+
+def SetProgressorLabel(etiqueta):
+    progresor.etiqueta = etiqueta
+
+def SetProgressorPosition(posicion=None):
+    progresor.posicion = progresor.posicion + 1 if posicion is None else posicion
+    progresor.actualizaciones += 1
+
+def ResetProgressor():
+    progresor.tipo, progresor.etiqueta, progresor.posicion = None, '', 0
+
+def GetArgumentCount():
+    return 0
+
+def GetParameterAsText(indice):
+    return ''
+
+def GetParameter(indice):
+    return None
+
+def SetParameterAsText(indice, valor):
+    pass
+
+def SetParameter(indice, valor):
+    pass
+
+# Registra el sustituto como 'arcpy' (tambien arcpy.da y arcpy.management)
+def instala():
+    modulo = sys.modules[__name__]
+    sys.modules['arcpy'] = modulo
+    sys.modules['arcpy.da'] = da
+    sys.modules['arcpy.management'] = management
+    return modulo
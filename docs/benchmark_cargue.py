@@ -0,0 +1,272 @@
+"""
+Pruebas de rendimiento de Cargue_Acueducto sin ArcGIS
+
+- Genera entregas sinteticas (las cuatro capas) de 10.000, 100.000 y 1.000.000 de registros con los campos, clases y
+  dominios de las reglas del cargue y una proporcion de errores inyectados
+- Mide las etapas clasificar, validar, reportar y migrar, y la herramienta completa (script_tool con carga masiva),
+  con el acceso a datos en memoria de arcpy_memoria. Los errores se reportan en la salida de --salida-errores ('csv'
+  por defecto, 'sqlite' o 'nula' para medir sin la escritura)
+- Escribe un JSON con los tiempos y los conteos (errores y registros migrados) que se puede comparar con el de una
+  ejecucion anterior: con --comparar el proceso termina con 1 si alguna etapa es mas lenta que el umbral o si los
+  conteos cambian
+
+Uso: python benchmark_cargue.py --tamanos 10000 100000 --salida base.json
+     python benchmark_cargue.py --tamanos 10000 100000 --comparar base.json
+"""
+import argparse, os, sys, json, platform, random, shutil, tempfile
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from time import perf_counter
+
+import arcpy_memoria
+
+etapas = ('clasificar', 'validar', 'reportar', 'migrar', 'completo')
+tamanos_predeterminados = (10000, 100000, 1000000)
+capas_entrega = ('l_acu', 'p_acu', 'l_alc', 'p_alc')
+
+# valores validos genericos por tipo de campo (para los campos sin dominio que no deben estar vacios)
+genericos = {'String': ['A', 'B12', 'KR 7 # 32-16', '0'], 'Integer': [1, 2, 10, 250],
+             'Double': [0.5, 1.25, 10.0, 100.75], 'Date': [datetime(2020, 1, 1), datetime(2023, 6, 15)]}
+# valor fuera de dominio por tipo de campo
+fuera_dominio = {'String': 'ZZ', 'Integer': 999, 'Double': 999.5, 'Date': datetime(1900, 1, 1)}
+
+# ------------------------------------- ENTREGA SINTETICA -------------------------------------
+# tipo de cada campo segun sus reglas: entero si sus dominios son enteros, real si se prueba como numero, fecha si es
+# un campo de fecha y texto en los demas casos
+def tipos_campos(tipo, atrib):
+    tipos = {}
+    for regla in tipo['reglas']:
+        campo = atrib[regla.indice]
+        if regla.dominio is not None:
+            dominios = regla.dominio.values() if isinstance(regla.dominio, dict) else [regla.dominio]
+            if all(isinstance(valor, int) for dominio in dominios for valor in dominio):
+                tipos.setdefault(campo, 'Integer')
+            else:
+                tipos[campo] = 'String'
+        elif regla.prueba == 'numero':
+            tipos.setdefault(campo, 'Double')
+        elif campo.upper().startswith('FECHA'):
+            tipos.setdefault(campo, 'Date')
+    return tipos
+
+# restricciones de cada campo por clase: dominios que debe cumplir, si debe estar vacio y si no debe estar vacio. Las
+# condiciones de las reglas no se tienen en cuenta y algunas clases tienen reglas que se contradicen (vacio y dentro
+# de un dominio), asi que la entrega tiene errores propios ademas de los inyectados; son los mismos en cada ejecucion
+def restricciones(tipo, atrib):
+    por_clase = {nombre: {} for nombre in tipo['clases'].values()}
+    for regla in tipo['reglas']:
+        for nombre in regla.clases or por_clase:
+            if nombre not in por_clase:
+                continue
+            campo = por_clase[nombre].setdefault(atrib[regla.indice], {'dominios': [], 'vacio': False, 'lleno': False})
+            if regla.error == 'dom':
+                campo['dominios'].append(regla.dominio[nombre] if isinstance(regla.dominio, dict) else regla.dominio)
+            elif regla.error == 'noBlan':
+                campo['vacio'] = True
+            else:
+                campo['lleno'] = True
+    return por_clase
+
+# valores validos de un campo en una clase y el valor que rompe su regla
+def valores_campo(tipo_campo, restriccion):
+    convierte = str if tipo_campo == 'String' else (lambda valor: valor)
+    if restriccion is None:
+        return genericos[tipo_campo] + [None], None
+    if restriccion['dominios']:
+        comunes = set(map(convierte, restriccion['dominios'][0]))
+        for dominio in restriccion['dominios'][1:]:
+            comunes &= set(map(convierte, dominio))
+        validos = sorted(comunes, key=str) or [convierte(valor) for valor in restriccion['dominios'][0]]
+        return validos, fuera_dominio[tipo_campo]
+    if restriccion['vacio'] and not restriccion['lleno']:
+        return [None], genericos[tipo_campo][0]
+    return genericos[tipo_campo], None
+
+# Registra en el sustituto de arcpy una capa de n registros. Los registros quedan agrupados por clase; cada columna
+# es un arreglo de codigos sobre una lista de valores. Una proporcion tasa_error de registros recibe un error (en
+# CLASE o en un campo con regla de su clase)
+def genera_capa(cargue, clave, n, tasa_error, rnd, orig, ruta):
+    tipo = cargue.tipos_capa[clave]
+    atrib = tipo['atrib'][orig]
+    campos = [campo for indice, campo in enumerate(atrib) if indice not in (0, tipo['oid'])]
+    tipos = tipos_campos(tipo, atrib)
+    tipos = {campo: tipos.get(campo, 'String') for campo in campos}
+    tipos[atrib[1]] = 'Integer'
+    por_clase = restricciones(tipo, atrib)
+
+    valores = {campo: [None] for campo in campos}
+    codigos = {campo: {None: 0} for campo in campos}
+    def codigo(campo, valor):
+        if valor not in codigos[campo]:
+            codigos[campo][valor] = len(valores[campo])
+            valores[campo].append(valor)
+        return codigos[campo][valor]
+
+    # cantidad de registros por clase y columnas por bloques de clase
+    cuentas = Counter(rnd.choices(list(tipo['clases']), k=n))
+    columnas = {campo: array('H') for campo in campos}
+    inicios, nombres, errores_clase = [], [], {}
+    for valor_clase, nombre in tipo['clases'].items():
+        cuenta = cuentas[valor_clase]
+        if not cuenta:
+            continue
+        inicios.append(len(columnas[atrib[1]]))
+        nombres.append(nombre)
+        errores_clase[nombre] = []
+        columnas[atrib[1]].extend([codigo(atrib[1], valor_clase)] * cuenta)
+        for campo in campos[1:]:
+            validos, invalido = valores_campo(tipos[campo], por_clase[nombre].get(campo))
+            columnas[campo].extend(rnd.choices([codigo(campo, valor) for valor in validos], k=cuenta))
+            if invalido is not None:
+                errores_clase[nombre].append((campo, codigo(campo, invalido)))
+
+    # errores inyectados: uno de cada veinte en CLASE, los demas en un campo con regla de la clase del registro
+    for posicion in rnd.sample(range(n), int(n * tasa_error)):
+        nombre = nombres[bisect_right(inicios, posicion) - 1]
+        if rnd.random() < 0.05 or not errores_clase[nombre]:
+            columnas[atrib[1]][posicion] = 0
+        else:
+            campo, codigo_error = rnd.choice(errores_clase[nombre])
+            columnas[campo][posicion] = codigo_error
+
+    arcpy_memoria.registra_tabla(ruta, campos, tipos, columnas, valores, campo_oid=atrib[tipo['oid']])
+
+# las cuatro capas de una entrega (las capas pluviales quedan vacias)
+def genera_entrega(cargue, n, tasa_error=0.01, semilla=1, orig='gdb'):
+    rnd = random.Random(semilla)
+    carpeta = 'entrega.gdb' if orig == 'gdb' else 'entrega'
+    extension = '' if orig == 'gdb' else '.shp'
+    fuentes = []
+    for clave in capas_entrega:
+        ruta = os.path.join(carpeta, f'{clave}{extension}')
+        genera_capa(cargue, clave, n, tasa_error, rnd, orig, ruta)
+        fuentes.append(ruta)
+    return tuple(fuentes) + ('', '')
+
+# ------------------------------------- ETAPAS -------------------------------------
+def mide(tiempos, etapa, funcion, *argumentos):
+    inicio = perf_counter()
+    resultado = funcion(*argumentos)
+    tiempos[etapa] = round(perf_counter() - inicio, 4)
+    return resultado
+
+def clasifica(cargue, fuentes, orig):
+    return [cargue.clasifica_capa(fuente, cargue.tipos_capa[clave], orig)
+            for clave, fuente in zip(capas_entrega, fuentes)]
+
+def valida(cargue, fuentes, orig, motor):
+    return [cargue.valida_capa_proceso(fuente, clave, orig, motor)[0] for clave, fuente in zip(capas_entrega, fuentes)]
+
+def reporta(cargue, errores, carpeta, salida):
+    with cargue.abre_salida(salida, carpeta) as salida_errores:
+        for clave, errores_capa in zip(capas_entrega, errores):
+            if cargue.msg_error_estrc(errores_capa, clave):
+                errores_capa.vacia(salida_errores, clave)
+
+def migra(cargue, clases, fuentes, carpeta):
+    cargue.migracion_datos(*clases, '', '', carpeta, fuentes, masiva=False, bloque=cargue.bloque_migracion)
+
+# la herramienta de principio a fin, como la ejecuta ArcGIS (migracion forzada)
+def completo(cargue, fuentes, motor, carpeta, salida):
+    cargue.script_tool(*fuentes, carpeta, 'true', motor, salida_errores=salida)
+
+# Genera la entrega de n registros y mide cada etapa `repeticiones` veces; de cada etapa se guarda el menor tiempo,
+# que es el menos afectado por el resto de la maquina. Devuelve los tiempos en segundos y los conteos
+def ejecuta(cargue, n, tasa_error, semilla, motor, orig, repeticiones=1, salida='csv'):
+    arcpy_memoria.limpia()
+    tiempos = {}
+    fuentes = mide(tiempos, 'generar', genera_entrega, cargue, n, tasa_error, semilla, orig)
+    mejores = {}
+    for _ in range(repeticiones):
+        arcpy_memoria.insertados.clear()
+        carpeta = tempfile.mkdtemp(prefix='benchmark_cargue_')
+        try:
+            clases = mide(tiempos, 'clasificar', clasifica, cargue, fuentes, orig)
+            errores = mide(tiempos, 'validar', valida, cargue, fuentes, orig, motor)
+            mide(tiempos, 'reportar', reporta, cargue, errores, carpeta, salida)
+            mide(tiempos, 'migrar', migra, cargue, clases, fuentes, carpeta)
+            migrados = sum(arcpy_memoria.insertados.values())
+            mide(tiempos, 'completo', completo, cargue, fuentes, motor, carpeta, salida)
+        finally:
+            shutil.rmtree(carpeta, ignore_errors=True)
+        mejores = {etapa: min(tiempos[etapa], mejores.get(etapa, tiempos[etapa])) for etapa in etapas}
+    tiempos.update(mejores)
+    tiempos['errores'] = sum(errores_capa.total() for errores_capa in errores)
+    tiempos['migrados'] = migrados
+    return tiempos
+
+# ------------------------------------- COMPARACION -------------------------------------
+# Compara dos resultados tamano a tamano: una etapa es una regresion si tarda mas de `umbral` veces lo que tardaba
+# (las etapas de menos de minimo segundos no se comparan, su tiempo es ruido). Devuelve la lista de diferencias
+def compara(anterior, actual, umbral, minimo=0.05):
+    diferencias = []
+    for tamano, tiempos in actual['resultados'].items():
+        base = anterior['resultados'].get(tamano)
+        if base is None:
+            continue
+        for conteo in ('errores', 'migrados'):
+            if base[conteo] != tiempos[conteo]:
+                diferencias.append(f'{tamano} registros: {conteo} {base[conteo]} -> {tiempos[conteo]}')
+        for etapa in etapas:
+            if etapa not in base:
+                continue
+            if base[etapa] < minimo and tiempos[etapa] < minimo:
+                continue
+            razon = tiempos[etapa] / max(base[etapa], 1e-9)
+            print(f'{tamano:>9} {etapa:<11} {base[etapa]:>9.3f} s -> {tiempos[etapa]:>9.3f} s  x{razon:.2f}')
+            if razon > umbral:
+                diferencias.append(f'{tamano} registros: {etapa} x{razon:.2f} (umbral x{umbral})')
+    return diferencias
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description='Mide las etapas del cargue sobre entregas sinteticas')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=list(tamanos_predeterminados),
+                        help='registros por capa de cada entrega')
+    parser.add_argument('--tasa-error', type=float, default=0.01, help='proporcion de registros con error')
+    parser.add_argument('--semilla', type=int, default=1)
+    parser.add_argument('--motor', default='python', help='motor de validacion')
+    parser.add_argument('--repeticiones', type=int, default=3, help='veces que se mide cada etapa (se toma la menor)')
+    parser.add_argument('--origen', choices=('gdb', 'shp'), default='gdb', help='nombres de campo de la entrega')
+    parser.add_argument('--salida-errores', default='csv',
+                        help="salida de los errores al reportar: 'csv', 'sqlite' o 'nula' (sin escritura)")
+    parser.add_argument('--salida', help='archivo JSON donde se guardan los resultados')
+    parser.add_argument('--comparar', help='JSON de una ejecucion anterior con el que se comparan los resultados')
+    parser.add_argument('--umbral', type=float, default=1.25, help='razon de tiempo que se considera regresion')
+    args = parser.parse_args(argumentos)
+
+    os.environ['CARGUE_ACCESO'] = 'memoria'
+    # la plantilla de la GDB no se usa, pero el cache no debe quedar en el directorio del usuario
+    os.environ.setdefault('CARGUE_CACHE', tempfile.mkdtemp(prefix='benchmark_cache_'))
+    import Cargue_Acueducto as cargue
+    if args.motor not in cargue.motores_validacion:
+        parser.error(f'motor no soportado: {args.motor}')
+    if args.salida_errores not in cargue.salidas_errores:
+        parser.error(f'salida de errores no soportada: {args.salida_errores}')
+
+    resultado = {'version': 1, 'fecha': datetime.now().isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'plataforma': platform.platform(), 'motor': args.motor,
+                 'origen': args.origen, 'repeticiones': args.repeticiones, 'tasa_error': args.tasa_error,
+                 'semilla': args.semilla, 'salida_errores': args.salida_errores, 'resultados': {}}
+    for n in args.tamanos:
+        tiempos = ejecuta(cargue, n, args.tasa_error, args.semilla, args.motor, args.origen,
+                          args.repeticiones, args.salida_errores)
+        resultado['resultados'][str(n)] = tiempos
+        print(f'{n:>9} registros: ' + ', '.join(f'{etapa} {tiempos[etapa]:.3f} s' for etapa in etapas)
+              + f' ({tiempos["errores"]} errores, {tiempos["migrados"]} migrados)')
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultado, archivo, indent=2)
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+        diferencias = compara(anterior, resultado, args.umbral)
+        for diferencia in diferencias:
+            print(f'REGRESION: {diferencia}')
+        return 1 if diferencias else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Pruebas de equivalencia de Cargue_Acueducto sin ArcGIS
+
+- Valida la entrega de entrega_base.json con los motores python, numpy, particiones y sql sobre el acceso a datos en
+  memoria de arcpy_memoria y compara, regla por regla (CLASE y cada error y atributo), los OIDs con error con los de
+  los validadores de la version original del script guardados en el mismo archivo
+- Valida las entregas sinteticas de benchmark_cargue con los cuatro motores y compara sus OIDs regla por regla
+- Escribe una entrega como .dbf y compara los OIDs del lector DBF con los del lector arcpy sobre la misma tabla
+- Escribe una entrega como GeoPackage y compara los OIDs de la validacion en SQLite con los del motor python
+- Interrumpe la migracion registro a registro y verifica que la ejecucion siguiente continua desde el diario y deja
+  en la GDB los mismos registros que una migracion sin interrupciones
+
+Uso: python -m unittest test_equivalencia (desde esta carpeta; tambien la recoge pytest)
+"""
+import importlib.util, json, os, shutil, sqlite3, struct, tempfile, unittest
+from collections import Counter
+from contextlib import closing
+from datetime import datetime
+from itertools import count
+from unittest import mock
+
+os.environ['CARGUE_ACCESO'] = 'memoria'
+# la plantilla de la GDB no debe quedar en el directorio del usuario
+os.environ.setdefault('CARGUE_CACHE', tempfile.mkdtemp(prefix='prueba_cache_'))
+
+import arcpy_memoria
+import Cargue_Acueducto as cargue
+from benchmark_cargue import capas_entrega, genera_entrega
+
+registros_prueba = 3000
+tasa_error_prueba = 0.05
+
+# OIDs con error de cada regla: ('clase', 'CLASE') y (error, atributo) de cada regla de la capa
+def oids_por_regla(errores):
+    oids = {('clase', 'CLASE'): set(errores.clase)}
+    for error in cargue.tipos_error:
+        for atributo in errores[error]:
+            oids[(error, atributo)] = set(errores.ids(error, atributo))
+    return oids
+
+# Escribe una tabla de arcpy_memoria como .dbf (dBase III). El primer registro se marca como borrado: el lector DBF
+# lo salta y los demas quedan con FID 1..n, los mismos OIDs de la tabla en memoria. Si el OID de la capa no es el FID
+# (OBJECTID en los nodos de alcantarillado) se escribe como una columna mas
+def escribe_dbf(ruta, tabla):
+    formatos = {'String': (b'C', 0), 'Integer': (b'N', 0), 'Double': (b'N', 6), 'Date': (b'D', 0)}
+    campos = tabla.campos + ([tabla.campo_oid] if tabla.campo_oid.upper() != 'FID' else [])
+    tipos = dict(tabla.tipos, **{tabla.campo_oid: 'Integer'})
+    columnas = {campo: list(tabla.columna(campo)) for campo in campos}
+    descriptores = []
+    for campo in campos:
+        tipo, decimales = formatos[tipos[campo]]
+        if tipo == b'C':
+            largo = max([len(valor) for valor in columnas[campo] if valor is not None], default=1) or 1
+        else:
+            largo = {b'N': 9 if decimales == 0 else 19, b'D': 8}[tipo]
+        descriptores.append((campo, tipo, largo, decimales))
+    largo_registro = 1 + sum(largo for _, _, largo, _ in descriptores)
+    with open(ruta, 'wb') as archivo:
+        archivo.write(struct.pack('<BBBBIHH20x', 3, 124, 1, 1, tabla.filas + 1, 32 + 32 * len(descriptores) + 1,
+                                  largo_registro))
+        for campo, tipo, largo, decimales in descriptores:
+            archivo.write(struct.pack('<11sc4xBB14x', campo.encode('ascii'), tipo, largo, decimales))
+        archivo.write(b'\r')
+        archivo.write(b'*' + b' ' * (largo_registro - 1))
+        for fila in zip(*(columnas[campo] for campo in campos)):
+            archivo.write(b' ')
+            for valor, (_, tipo, largo, decimales) in zip(fila, descriptores):
+                if valor is None:
+                    texto = ''
+                elif tipo == b'D':
+                    texto = valor.strftime('%Y%m%d')
+                elif tipo == b'N':
+                    texto = f'{valor:{largo}.{decimales}f}'
+                else:
+                    texto = valor
+                archivo.write(texto.encode('latin-1').rjust(largo) if tipo == b'N' else
+                              texto.encode('latin-1').ljust(largo))
+        archivo.write(b'\x1a')
+
+# Vista de la tabla como la entrega el lector DBF: los textos nulos son cadenas vacias
+def vista_dbf(ruta, tabla):
+    filas = zip(*(['' if valor is None and tabla.tipos[campo] == 'String' else valor
+                   for valor in tabla.columna(campo)] for campo in tabla.campos))
+    return arcpy_memoria.carga_capa(ruta, tabla.campos, filas, campo_oid=tabla.campo_oid, tipos=tabla.tipos)
+
+# Escribe las tablas de arcpy_memoria como capas de un GeoPackage, con el OID como llave primaria y sin geometrias
+def escribe_gpkg(ruta, tablas):
+    declarados = {'String': 'TEXT', 'Integer': 'INTEGER', 'Double': 'REAL', 'Date': 'DATETIME'}
+    with closing(sqlite3.connect(ruta)) as conexion, conexion:
+        conexion.executescript("""
+            CREATE TABLE gpkg_contents (table_name TEXT PRIMARY KEY, data_type TEXT);
+            CREATE TABLE gpkg_geometry_columns (table_name TEXT, column_name TEXT);
+        """)
+        for nombre, tabla in tablas.items():
+            columnas = ', '.join(f'"{campo}" {declarados[tabla.tipos[campo]]}' for campo in tabla.campos)
+            conexion.execute(f'CREATE TABLE "{nombre}" (fid INTEGER PRIMARY KEY, geom BLOB, {columnas})')
+            conexion.execute("INSERT INTO gpkg_contents VALUES (?, 'features')", (nombre,))
+            conexion.execute("INSERT INTO gpkg_geometry_columns VALUES (?, 'geom')", (nombre,))
+            filas = zip(range(1, tabla.filas + 1), *(tabla.columna(campo) for campo in tabla.campos))
+            conexion.executemany(f'INSERT INTO "{nombre}" VALUES (?, NULL, {", ".join("?" * len(tabla.campos))})',
+                                 ([valor.isoformat() if isinstance(valor, datetime) else valor for valor in fila]
+                                  for fila in filas))
+
+# motores de validacion que se pueden probar aqui (numpy solo si esta instalado)
+motores_prueba = ('python', 'particiones', 'sql') + (('numpy',) if importlib.util.find_spec('numpy') else ())
+
+def valida_motor(motor, fuente, tipo, orig):
+    if motor == 'numpy':
+        return cargue.valida_capa_numpy(fuente, tipo, orig)
+    if motor == 'particiones':
+        return cargue.valida_capa_particiones(fuente, tipo, orig, False, False)
+    if motor == 'sql':
+        return cargue.valida_capa_sql(fuente, tipo, orig)
+    return cargue.valida_capa(fuente, tipo, orig, False, False)
+
+# Entrega de entrega_base.json: por capa las filas, los OIDs con error de cada regla segun los validadores originales
+# ('base') y las diferencias buscadas desde que los dominios y las guardas comparan valores normalizados ('cambios')
+ruta_entrega_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'entrega_base.json')
+
+class EntregaBase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(ruta_entrega_base, encoding='utf-8') as archivo:
+            cls.entrega = json.load(archivo)
+        arcpy_memoria.limpia()
+        cls.fuentes = {}
+        for nombre, capa in cls.entrega['capas'].items():
+            ruta = f'entrega_base/{nombre}.shp' if capa['orig'] == 'shp' else f'entrega_base.gdb/{nombre}'
+            arcpy_memoria.carga_capa(ruta, capa['campos'], map(tuple, capa['filas']), campo_oid=capa['campo_oid'],
+                                     tipos=capa['tipos'])
+            cls.fuentes[nombre] = ruta
+
+    # OIDs de la version original con los cambios buscados aplicados, sin las reglas que quedan sin errores
+    def esperados(self, nombre):
+        oids = {regla: set(lista) for regla, lista in self.entrega['base'][nombre].items()}
+        for regla, cambio in self.entrega['cambios'].get(nombre, {}).items():
+            oids[regla] = oids.get(regla, set()) - set(cambio['retirados']) | set(cambio['agregados'])
+        return {regla: lista for regla, lista in oids.items() if lista}
+
+    def test_motores(self):
+        for nombre, capa in self.entrega['capas'].items():
+            tipo = cargue.tipos_capa[capa['tipo']]
+            esperados = self.esperados(nombre)
+            for motor in motores_prueba:
+                with self.subTest(capa=nombre, motor=motor):
+                    _, errores = valida_motor(motor, self.fuentes[nombre], tipo, capa['orig'])
+                    oids = {f'{error} {atributo}': lista
+                            for (error, atributo), lista in oids_por_regla(errores).items() if lista}
+                    self.assertEqual(oids, esperados)
+
+    # la entrega cubre las guardas de la red troncal (SUBTIPO 24 y 27) con SUBTIPO entero y de texto
+    def test_guardas_red_troncal(self):
+        for nombre, tipo_subtipo in (('l_alc', 'Integer'), ('l_alc_pluv', 'String')):
+            with self.subTest(capa=nombre):
+                capa = self.entrega['capas'][nombre]
+                self.assertEqual(capa['tipos']['SUBTIPO'], tipo_subtipo)
+                posicion = capa['campos'].index('SUBTIPO')
+                subtipos = {cargue.catalogo_dominios.normaliza(fila[posicion]) for fila in capa['filas']}
+                self.assertLessEqual({'24', '27'}, subtipos)
+                motivos = [cambio['motivo'] for cambio in self.entrega['cambios'][nombre].values()]
+                self.assertTrue(any('guarda' in motivo for motivo in motivos))
+
+class EquivalenciaMotores(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        arcpy_memoria.limpia()
+        cls.fuentes = genera_entrega(cargue, registros_prueba, tasa_error_prueba, semilla=7, orig='gdb')
+
+    def test_motores(self):
+        for clave, fuente in zip(capas_entrega, self.fuentes):
+            tipo = cargue.tipos_capa[clave]
+            _, errores = valida_motor('python', fuente, tipo, 'gdb')
+            esperados = oids_por_regla(errores)
+            # la entrega debe tener errores de CLASE y de reglas, si no la comparacion no prueba nada
+            self.assertTrue(esperados[('clase', 'CLASE')])
+            self.assertGreater(errores.total(), len(esperados[('clase', 'CLASE')]))
+            for motor in motores_prueba[1:]:
+                with self.subTest(capa=clave, motor=motor):
+                    _, errores_motor = valida_motor(motor, fuente, tipo, 'gdb')
+                    self.assertEqual(oids_por_regla(errores_motor), esperados)
+
+    # los errores compactados (mapas de bits), como vuelven de los procesos, son los mismos OIDs
+    def test_compactados(self):
+        for clave, fuente in zip(capas_entrega, self.fuentes):
+            with self.subTest(capa=clave):
+                tipo = cargue.tipos_capa[clave]
+                _, errores = valida_motor('python', fuente, tipo, 'gdb')
+                esperados = oids_por_regla(errores)
+                self.assertEqual(oids_por_regla(errores.compacta()), esperados)
+
+class EquivalenciaLectores(unittest.TestCase):
+    def setUp(self):
+        arcpy_memoria.limpia()
+        self.carpeta = tempfile.mkdtemp(prefix='prueba_lectores_')
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+        arcpy_memoria.limpia()
+
+    def test_lector_dbf(self):
+        fuentes = genera_entrega(cargue, registros_prueba, tasa_error_prueba, semilla=11, orig='shp')
+        for clave, fuente in zip(capas_entrega, fuentes):
+            with self.subTest(capa=clave):
+                tipo = cargue.tipos_capa[clave]
+                ruta = os.path.join(self.carpeta, f'{clave}.shp')
+                escribe_dbf(os.path.splitext(ruta)[0] + '.dbf', arcpy_memoria.tablas[fuente])
+                vista_dbf(ruta, arcpy_memoria.tablas[fuente])
+                _, esperados = cargue.valida_capa(ruta, tipo, 'shp', False, False, 'arcpy')
+                _, errores = cargue.valida_capa(ruta, tipo, 'shp', False, False, 'dbf')
+                self.assertEqual(oids_por_regla(errores), oids_por_regla(esperados))
+
+    def test_geopackage(self):
+        fuentes = genera_entrega(cargue, registros_prueba, tasa_error_prueba, semilla=13, orig='gdb')
+        archivo = os.path.join(self.carpeta, 'entrega.gpkg')
+        escribe_gpkg(archivo, {clave: arcpy_memoria.tablas[fuente] for clave, fuente in zip(capas_entrega, fuentes)})
+        for clave, fuente in zip(capas_entrega, fuentes):
+            with self.subTest(capa=clave):
+                tipo = cargue.tipos_capa[clave]
+                _, esperados = cargue.valida_capa(fuente, tipo, 'gdb', False, False)
+                _, errores = cargue.valida_capa_gpkg(f'{archivo}/{clave}', tipo)
+                self.assertEqual(oids_por_regla(errores), oids_por_regla(esperados))
+
+    # una fecha mal formada en el .dbf se lee como nula en vez de detener la validacion
+    def test_fecha_dbf_mal_formada(self):
+        ruta = os.path.join(self.carpeta, 'fechas.shp')
+        fechas = [datetime(2020, 1, 15), datetime(2020, 2, 15), datetime(2020, 3, 15)]
+        tabla = arcpy_memoria.carga_capa(ruta, ['FECHAINST'], [(fecha,) for fecha in fechas], campo_oid='FID',
+                                         tipos={'FECHAINST': 'Date'})
+        archivo = os.path.splitext(ruta)[0] + '.dbf'
+        escribe_dbf(archivo, tabla)
+        with open(archivo, 'rb') as entrada:
+            datos = entrada.read()
+        with open(archivo, 'wb') as salida:
+            salida.write(datos.replace(b'20200215', b'20201340').replace(b'20200315', b'2020  01'))
+        filas = list(cargue.LectorDBF(ruta).filas(['OID@', 'FECHAINST']))
+        self.assertEqual(filas, [(1, fechas[0]), (2, None), (3, None)])
+
+# Interrumpe la insercion numero `limite` de la migracion registro a registro (las anteriores que no se guardaron
+# se pierden con la sesion de edicion)
+def caida_en(limite):
+    inserta = arcpy_memoria.InsertCursor.insertRow
+    inserciones = count()
+    def insertRow(cursor, fila):
+        if next(inserciones) == limite:
+            raise RuntimeError('caida simulada')
+        return inserta(cursor, fila)
+    return mock.patch.object(arcpy_memoria.InsertCursor, 'insertRow', insertRow)
+
+class ReanudacionDiario(unittest.TestCase):
+    bloque = 500
+
+    def setUp(self):
+        arcpy_memoria.limpia()
+        self.fuentes = genera_entrega(cargue, registros_prueba, tasa_error_prueba, semilla=17, orig='gdb')
+        self.carpetas = []
+
+    def tearDown(self):
+        for carpeta in self.carpetas:
+            shutil.rmtree(carpeta, ignore_errors=True)
+        arcpy_memoria.limpia()
+
+    def workspace(self):
+        self.carpetas.append(tempfile.mkdtemp(prefix='prueba_diario_'))
+        return self.carpetas[-1]
+
+    # registros insertados por feature class de la GDB de salida del workspace
+    def migrados(self, workspace):
+        return Counter({os.path.basename(ruta): cantidad for ruta, cantidad in arcpy_memoria.insertados.items()
+                        if ruta.startswith(workspace + os.sep) and cantidad})
+
+    # migracion forzada y registro a registro: Append falla y la carga masiva pasa a registro a registro
+    def ejecuta(self, workspace, indices='mantener'):
+        with mock.patch.object(arcpy_memoria.management, 'Append',
+                               side_effect=arcpy_memoria.ExecuteError('Append no disponible')):
+            cargue.script_tool(*self.fuentes, workspace, 'true', 'python', indices=indices, bloque=self.bloque)
+
+    def test_continua_desde_el_diario(self):
+        completo = self.workspace()
+        self.ejecuta(completo)
+        esperados = self.migrados(completo)
+        self.assertGreater(sum(esperados.values()), 2 * self.bloque)
+
+        workspace = self.workspace()
+        diario = os.path.join(workspace, 'GDB_Cargue_diario.sqlite')
+        with caida_en(sum(esperados.values()) // 2), self.assertRaises(RuntimeError):
+            self.ejecuta(workspace)
+        self.assertTrue(os.path.exists(diario))
+        parciales = self.migrados(workspace)
+        self.assertLess(sum(parciales.values()), sum(esperados.values()))
+
+        self.ejecuta(workspace)
+        self.assertEqual(self.migrados(workspace), esperados)
+        self.assertFalse(os.path.exists(diario))
+        self.assertIn(('M', 'Continuando la migracion interrumpida segun el diario..'), arcpy_memoria.mensajes)
+
+    # si una capa de entrada cambia despues de la caida, la migracion empieza de nuevo
+    def test_fuente_modificada(self):
+        workspace = self.workspace()
+        with caida_en(self.bloque * 3), self.assertRaises(RuntimeError):
+            self.ejecuta(workspace)
+        self.fuentes = genera_entrega(cargue, registros_prueba - 1, tasa_error_prueba, semilla=17, orig='gdb')
+        arcpy_memoria.mensajes.clear()
+        self.ejecuta(workspace)
+        self.assertNotIn(('M', 'Continuando la migracion interrumpida segun el diario..'), arcpy_memoria.mensajes)
+
+        completo = self.workspace()
+        self.ejecuta(completo)
+        self.assertEqual(self.migrados(workspace), self.migrados(completo))
+
+    # un Append interrumpido pudo dejar sus registros en la GDB: la ejecucion siguiente empieza de nuevo
+    def test_append_interrumpido(self):
+        completo = self.workspace()
+        cargue.script_tool(*self.fuentes, completo, 'true', 'python')
+        agrega = arcpy_memoria.management.Append
+        def append(*argumentos, **opciones):
+            agrega(*argumentos, **opciones)
+            raise RuntimeError('caida simulada')
+
+        workspace = self.workspace()
+        with mock.patch.object(arcpy_memoria.management, 'Append', append), self.assertRaises(RuntimeError):
+            cargue.script_tool(*self.fuentes, workspace, 'true', 'python')
+        arcpy_memoria.mensajes.clear()
+        cargue.script_tool(*self.fuentes, workspace, 'true', 'python')
+        self.assertNotIn(('M', 'Continuando la migracion interrumpida segun el diario..'), arcpy_memoria.mensajes)
+        self.assertEqual(self.migrados(workspace), self.migrados(completo))
+
+    # un bloque guardado en la GDB pero no confirmado en el diario no se puede continuar sin duplicarlo
+    def test_bloque_pendiente(self):
+        completo = self.workspace()
+        self.ejecuta(completo)
+        confirma = cargue.DiarioMigracion.confirma_pendientes
+        confirmaciones = count()
+        def confirma_pendientes(diario):
+            if next(confirmaciones) == 2:
+                raise RuntimeError('caida simulada')
+            return confirma(diario)
+
+        workspace = self.workspace()
+        with mock.patch.object(cargue.DiarioMigracion, 'confirma_pendientes', confirma_pendientes), \
+                self.assertRaises(RuntimeError):
+            self.ejecuta(workspace)
+        arcpy_memoria.mensajes.clear()
+        self.ejecuta(workspace)
+        self.assertNotIn(('M', 'Continuando la migracion interrumpida segun el diario..'), arcpy_memoria.mensajes)
+        self.assertEqual(self.migrados(workspace), self.migrados(completo))
+
+    # los indices espaciales que retiro una ejecucion cortada antes de reconstruirlos (en la GDB ya no se ven) se
+    # reconstruyen al continuar desde el diario
+    def test_indices_retirados(self):
+        sin_indice = set()
+        describe = arcpy_memoria.Describe
+        def Describe(ruta):
+            desc = describe(ruta)
+            desc.hasSpatialIndex = ruta not in sin_indice
+            return desc
+
+        workspace = self.workspace()
+        with mock.patch.object(arcpy_memoria, 'Describe', Describe), \
+                mock.patch.object(arcpy_memoria.management, 'RemoveSpatialIndex', sin_indice.add):
+            # sin AddSpatialIndex la caida deja las capas sin indice, como si el proceso terminara de golpe
+            with caida_en(self.bloque * 3), self.assertRaises(RuntimeError):
+                self.ejecuta(workspace, 'espacial')
+            self.assertTrue(sin_indice)
+            with mock.patch.object(arcpy_memoria.management, 'AddSpatialIndex', sin_indice.discard):
+                self.ejecuta(workspace, 'espacial')
+        self.assertIn(('M', 'Continuando la migracion interrumpida segun el diario..'), arcpy_memoria.mensajes)
+        self.assertFalse(sin_indice)
+
+if __name__ == '__main__':
+    unittest.main()